@@ -0,0 +1,40 @@
+const path = require('path');
+const { getOrderManifestPath, sortByOrderManifest } = require('../core/file-manager');
+
+describe('File Manager Functions', () => {
+  describe('getOrderManifestPath', () => {
+    test('should place the manifest next to the sns directory', () => {
+      const manifestPath = getOrderManifestPath(path.join('project', 'sns'));
+      expect(manifestPath).toBe(path.resolve('project', 'sns.order.json'));
+    });
+
+    test('should ignore a trailing separator', () => {
+      const manifestPath = getOrderManifestPath(path.join('project', 'sns') + path.sep);
+      expect(manifestPath).toBe(path.resolve('project', 'sns.order.json'));
+    });
+  });
+
+  describe('sortByOrderManifest', () => {
+    const files = ['a.txt', 'b.txt', 'c.txt', 'd.txt'].map(name => ({ name }));
+
+    test('should follow the manifest order', () => {
+      const result = sortByOrderManifest(files, ['c.txt', 'a.txt', 'd.txt', 'b.txt']);
+      expect(result.map(file => file.name)).toEqual(['c.txt', 'a.txt', 'd.txt', 'b.txt']);
+    });
+
+    test('should append unlisted files in filename order', () => {
+      const result = sortByOrderManifest(files, ['d.txt', 'b.txt']);
+      expect(result.map(file => file.name)).toEqual(['d.txt', 'b.txt', 'a.txt', 'c.txt']);
+    });
+
+    test('should ignore missing and duplicate entries', () => {
+      const result = sortByOrderManifest(files, ['x.txt', 'c.txt', 'a.txt', 'c.txt']);
+      expect(result.map(file => file.name)).toEqual(['c.txt', 'a.txt', 'b.txt', 'd.txt']);
+    });
+
+    test('should not modify the input list', () => {
+      sortByOrderManifest(files, ['d.txt']);
+      expect(files.map(file => file.name)).toEqual(['a.txt', 'b.txt', 'c.txt', 'd.txt']);
+    });
+  });
+});
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+gui/dedup.py のテスト（python -m pytest __tests__）
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gui.dedup import find_near_duplicates
+from gui.queue_index import is_posted_file, is_queue_file
+
+
+POSTED_NAME = '20250928001_2025-08-10-meeting-activation-questions-sns_posted_2025-09-28_09-00-12.txt'
+
+BODY = (
+    '初対面の商談で最初に聞くべき質問を3つ紹介します。\n'
+    '相手の課題を引き出す質問は、準備の段階で決まります。\n'
+    'https://example.com/blog/meeting-activation-questions\n'
+)
+
+
+class TestFindNearDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.draft = self.root / 'sns' / 'draft'
+        self.posted = self.root / 'sns' / 'posted'
+        self.draft.mkdir(parents=True)
+        self.posted.mkdir(parents=True)
+        self.db_path = self.root / '.cache' / 'queue_index.sqlite3'
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_matchers(self):
+        self.assertFalse(is_queue_file(POSTED_NAME))
+        self.assertTrue(is_posted_file(POSTED_NAME))
+        self.assertTrue(is_posted_file('a_failed_2025-09-28_09-00-12.txt'))
+        self.assertFalse(is_posted_file('README.txt'))
+
+    def test_finds_copy_of_posted_file(self):
+        (self.posted / POSTED_NAME).write_text(BODY, encoding='utf-8')
+        (self.posted / 'README.txt').write_text(BODY, encoding='utf-8')
+        (self.draft / 'repost.txt').write_text(BODY, encoding='utf-8')
+
+        report = find_near_duplicates(
+            self.draft, corpus_folders=[(self.posted, is_posted_file)], db_path=self.db_path
+        )
+
+        self.assertEqual(list(report), ['repost.txt'])
+        matches = report['repost.txt']
+        self.assertEqual([(m.folder, m.name) for m in matches], [(self.posted, POSTED_NAME)])
+        self.assertEqual(matches[0].similarity, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
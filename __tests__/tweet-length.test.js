@@ -0,0 +1,66 @@
+const { weightedLength, overflowOffset, truncateToWeightedLength } = require('../core/tweet-length');
+
+describe('Tweet Length Functions', () => {
+  describe('weightedLength', () => {
+    test('should count ASCII characters as 1', () => {
+      expect(weightedLength('hello world')).toBe(11);
+    });
+
+    test('should count CJK characters as 2', () => {
+      expect(weightedLength('こんにちは')).toBe(10);
+    });
+
+    test('should count URLs as 23', () => {
+      expect(weightedLength('hello https://example.com/path?x=1.')).toBe(30);
+      expect(weightedLength('詳細はhttps://t.co/abcで')).toBe(31);
+      expect(weightedLength('see example.com.')).toBe(28);
+    });
+
+    test('should not treat file names and versions as URLs', () => {
+      expect(weightedLength('file.txt')).toBe(8);
+      expect(weightedLength('v1.2.3')).toBe(6);
+      expect(weightedLength('user@example.com')).toBe(16);
+    });
+
+    test('should count emoji sequences as 2', () => {
+      expect(weightedLength('👨‍👩‍👧‍👦')).toBe(2);
+      expect(weightedLength('🇯🇵')).toBe(2);
+      expect(weightedLength('1️⃣')).toBe(2);
+      expect(weightedLength('👍🏽')).toBe(2);
+    });
+
+    test('should count newlines as 1', () => {
+      expect(weightedLength('a\nb')).toBe(3);
+    });
+  });
+
+  describe('overflowOffset', () => {
+    test('should return null within the limit', () => {
+      expect(overflowOffset('あ'.repeat(140))).toBeNull();
+    });
+
+    test('should point at the first character over the limit', () => {
+      expect(overflowOffset('あ'.repeat(141))).toBe(140);
+      expect(overflowOffset('a'.repeat(281))).toBe(280);
+    });
+  });
+
+  describe('truncateToWeightedLength', () => {
+    test('should keep short text unchanged', () => {
+      expect(truncateToWeightedLength('短い投稿')).toBe('短い投稿');
+    });
+
+    test('should fit truncated text within the limit', () => {
+      const result = truncateToWeightedLength('あ'.repeat(200));
+      expect(result.endsWith('...')).toBe(true);
+      expect(weightedLength(result)).toBeLessThanOrEqual(280);
+    });
+
+    test('should stay within the limit when the cut turns text into a URL', () => {
+      // example.comcom はURLではないが、example.com で切って ... を付けるとURL（23）になる
+      const result = truncateToWeightedLength('あ'.repeat(133) + 'example.comcom' + 'あ'.repeat(10));
+      expect(result.endsWith('...')).toBe(true);
+      expect(weightedLength(result)).toBeLessThanOrEqual(280);
+    });
+  });
+});
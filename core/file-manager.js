@@ -1,6 +1,52 @@
 const fs = require('fs').promises;
 const path = require('path');
 const { log, getJSTDateTime } = require('./logger');
+const { weightedLength, MAX_WEIGHTED_LENGTH } = require('./tweet-length');
+
+/**
+ * 順序マニフェストのパスを取得（sns/ → sns.order.json）
+ */
+function getOrderManifestPath(snsDir) {
+  const resolved = path.resolve(snsDir);
+  return path.join(path.dirname(resolved), `${path.basename(resolved)}.order.json`);
+}
+
+/**
+ * 順序マニフェストを読み込み（存在しない・壊れている場合はnull）
+ */
+async function readOrderManifest(snsDir) {
+  const manifestPath = getOrderManifestPath(snsDir);
+  try {
+    const data = JSON.parse(await fs.readFile(manifestPath, 'utf8'));
+    return Array.isArray(data.order) ? data.order.filter(name => typeof name === 'string') : null;
+  } catch (error) {
+    if (error.code !== 'ENOENT') {
+      log(`順序マニフェスト読み込みエラー: ${error.message}`, 'WARN');
+    }
+    return null;
+  }
+}
+
+/**
+ * マニフェストの記載順に並べ替え（記載のないファイルはファイル名順で後ろに続ける）
+ */
+function sortByOrderManifest(fileList, order) {
+  const positions = new Map();
+  order.forEach((name, index) => {
+    if (!positions.has(name)) {
+      positions.set(name, index);
+    }
+  });
+
+  return [...fileList].sort((a, b) => {
+    const posA = positions.has(a.name) ? positions.get(a.name) : Infinity;
+    const posB = positions.has(b.name) ? positions.get(b.name) : Infinity;
+    if (posA !== posB) {
+      return posA < posB ? -1 : 1;
+    }
+    return a.name.localeCompare(b.name);
+  });
+}
 
 /**
  * SNSディレクトリから投稿ファイルを取得
@@ -44,9 +90,13 @@ async function getSnsFiles(snsDir = null) {
 
     // ファイル名でソート（安定した順序のため）
     fileList.sort((a, b) => a.name.localeCompare(b.name));
+
+    // 順序マニフェストがある場合はその順序を優先
+    const order = await readOrderManifest(snsDir);
+    const sortedList = order ? sortByOrderManifest(fileList, order) : fileList;
     
-    log(`${fileList.length}件の投稿ファイルを検出`);
-    return fileList;
+    log(`${sortedList.length}件の投稿ファイルを検出`);
+    return sortedList;
   } catch (error) {
     log(`ファイル取得エラー: ${error.message}`, 'ERROR');
     throw error;
@@ -64,10 +114,10 @@ function validateFileContent(content, filename) {
     return errors;
   }
 
-  // UTF-8文字数カウント（コードポイントベース）
-  const codePoints = [...content];
-  if (codePoints.length > 280) {
-    log(`文字数超過: ${filename} (${codePoints.length}文字)`, 'WARN');
+  // X の重み付き文字数（日本語は2、URLは23）
+  const length = weightedLength(content);
+  if (length > MAX_WEIGHTED_LENGTH) {
+    log(`文字数超過: ${filename} (${length}/${MAX_WEIGHTED_LENGTH})`, 'WARN');
   }
 
   // 制御文字チェック
@@ -181,6 +231,8 @@ async function createBackup(filePath) {
 
 module.exports = {
   getSnsFiles,
+  getOrderManifestPath,
+  sortByOrderManifest,
   validateFileContent,
   lintFiles,
   moveToPosted,
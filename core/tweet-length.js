@@ -0,0 +1,212 @@
+/**
+ * X (Twitter) の重み付き文字数（twitter-text v3 設定と同じ規則）
+ *
+ * - ラテン文字・一般的な記号（U+0000-U+10FF など）は1、それ以外（日本語など）は2
+ * - URLは長さに関係なく23
+ * - 絵文字は結合シーケンス（肌の色・ZWJ・国旗・キーキャップ）全体で2
+ * - 改行は1
+ *
+ * gui/tweet_length.py も同じ規則で数える（変更時は両方を合わせる）。
+ */
+
+const MAX_WEIGHTED_LENGTH = 280;
+const URL_WEIGHT = 23;
+
+// 重み1の範囲（コードポイントの両端を含む）
+const LIGHT_RANGES = [
+  [0x0000, 0x10ff],
+  [0x2000, 0x200d],
+  [0x2010, 0x201f],
+  [0x2032, 0x2037]
+];
+
+// スキームなしのドメインをURLとみなすTLD
+const BARE_URL_TLDS = new Set([
+  'com', 'net', 'org', 'info', 'biz', 'edu', 'gov', 'mil', 'int', 'name', 'pro',
+  'xyz', 'top', 'site', 'online', 'shop', 'blog', 'news', 'app', 'dev', 'page',
+  'io', 'ai', 'me', 'tv', 'co', 'ly', 'gl', 'to', 'fm', 'gg', 'so', 'sh',
+  'jp', 'us', 'uk', 'de', 'fr', 'cn', 'kr', 'tw', 'hk', 'eu', 'ca', 'au', 'in',
+  'ru', 'br', 'es', 'it', 'nl', 'se', 'ch', 'at', 'be', 'pl', 'nz', 'sg', 'tokyo'
+]);
+
+// URL候補（前後の区切りと末尾の句読点は findUrls で判定）
+const URL_PATTERN = new RegExp(
+  '(?<![A-Za-z0-9@$#_.\\-/])' +
+  '(?<scheme>https?://)?' +
+  '(?<host>(?:[A-Za-z0-9](?:[A-Za-z0-9\\-]*[A-Za-z0-9])?\\.)+(?<tld>[A-Za-z]{2,}))' +
+  '(?::\\d{1,5})?' +
+  '(?:[/?#][!-~\\u00c0-\\u024f]*)?' +
+  '(?![A-Za-z0-9@])',
+  'g'
+);
+
+const URL_TRAILING_PUNCTUATION = '.,;:!?\'"';
+
+const VS16 = 0xfe0f;
+const VS15 = 0xfe0e;
+const KEYCAP = 0x20e3;
+const ZWJ = 0x200d;
+
+function charWeight(cp) {
+  return LIGHT_RANGES.some(([low, high]) => low <= cp && cp <= high) ? 1 : 2;
+}
+
+function isRegionalIndicator(cp) {
+  return cp >= 0x1f1e6 && cp <= 0x1f1ff;
+}
+
+function isEmojiModifier(cp) {
+  return cp === VS16 || cp === KEYCAP || (cp >= 0x1f3fb && cp <= 0x1f3ff) || (cp >= 0xe0020 && cp <= 0xe007f);
+}
+
+function countChar(text, char, start, end) {
+  let count = 0;
+  for (let i = start; i < end; i++) {
+    if (text[i] === char) count++;
+  }
+  return count;
+}
+
+/**
+ * 行内のURLの位置を取得（UTF-16 の位置）
+ */
+function findUrls(line) {
+  const spans = [];
+  for (const match of line.matchAll(URL_PATTERN)) {
+    const { scheme, host, tld } = match.groups;
+    if (!scheme && !BARE_URL_TLDS.has(tld.toLowerCase())) {
+      continue;
+    }
+    const start = match.index;
+    const hostEnd = start + (scheme ? scheme.length : 0) + host.length;
+    let end = start + match[0].length;
+    // 末尾の句読点と対応しない閉じ括弧はURLに含めない
+    while (end > hostEnd) {
+      const last = line[end - 1];
+      if (URL_TRAILING_PUNCTUATION.includes(last)) {
+        end--;
+      } else if (last === ')' && countChar(line, '(', start, end) < countChar(line, ')', start, end)) {
+        end--;
+      } else {
+        break;
+      }
+    }
+    spans.push([start, end]);
+  }
+  return spans;
+}
+
+/**
+ * 行を数える単位（URL・絵文字シーケンス・1文字）に分割
+ *
+ * @returns {Array<[number, number, number]>} [開始位置, 終了位置, 重み]（UTF-16 の位置）
+ */
+function segments(line) {
+  const urls = line.includes('.') ? findUrls(line) : [];
+  const result = [];
+  let urlIndex = 0;
+  let i = 0;
+  while (i < line.length) {
+    if (urlIndex < urls.length && urls[urlIndex][0] === i) {
+      const end = urls[urlIndex][1];
+      urlIndex++;
+      result.push([i, end, URL_WEIGHT]);
+      i = end;
+      continue;
+    }
+
+    const cp = line.codePointAt(i);
+    let j = i + (cp > 0xffff ? 2 : 1);
+    let emoji = cp >= 0x1f000 && cp <= 0x1faff;
+    let weight = charWeight(cp);
+    if (isRegionalIndicator(cp) && j < line.length && isRegionalIndicator(line.codePointAt(j))) {
+      j += 2;
+    }
+
+    // 修飾と ZWJ でつながった文字をまとめる
+    while (j < line.length) {
+      const next = line.codePointAt(j);
+      const size = next > 0xffff ? 2 : 1;
+      if (isEmojiModifier(next)) {
+        emoji = true;
+        j += size;
+      } else if (next === VS15) {
+        weight += charWeight(next);
+        j += size;
+      } else if (next === ZWJ && emoji && j + 1 < line.length) {
+        j += 1 + (line.codePointAt(j + 1) > 0xffff ? 2 : 1);
+      } else {
+        break;
+      }
+    }
+
+    result.push([i, j, emoji ? 2 : weight]);
+    i = j;
+  }
+  return result;
+}
+
+function lineWeight(line) {
+  return segments(line.normalize('NFC')).reduce((sum, [, , weight]) => sum + weight, 0);
+}
+
+/**
+ * 重み付き文字数を計算
+ */
+function weightedLength(text) {
+  if (/^[\x00-\x7f]*$/.test(text) && !text.includes('.')) {
+    return text.length;
+  }
+  const lines = text.split('\n');
+  return lines.reduce((sum, line) => sum + lineWeight(line), 0) + lines.length - 1;
+}
+
+/**
+ * 上限を超える最初の単位の位置を取得（上限以内の場合null、UTF-16 の位置）
+ */
+function overflowOffset(text, limit = MAX_WEIGHTED_LENGTH) {
+  let offset = 0;
+  let used = 0;
+  for (const line of text.split('\n')) {
+    for (const [start, , weight] of segments(line)) {
+      used += weight;
+      if (used > limit) {
+        return offset + start;
+      }
+    }
+    offset += line.length + 1;
+    used += 1;
+    if (used > limit && offset <= text.length) {
+      // 行末の改行で超える
+      return offset - 1;
+    }
+  }
+  return null;
+}
+
+/**
+ * 上限に収まるように切り詰め（切り詰めた場合は末尾に suffix を付ける）
+ */
+function truncateToWeightedLength(text, limit = MAX_WEIGHTED_LENGTH, suffix = '...') {
+  if (weightedLength(text) <= limit) {
+    return text;
+  }
+  let cut = overflowOffset(text, limit - weightedLength(suffix));
+  let result = text.slice(0, cut) + suffix;
+  // suffix を付けると切った位置の前後がURLとして数え直されることがあるため、収まるまで1単位ずつ戻す
+  while (cut > 0 && weightedLength(result) > limit) {
+    const line = text.slice(text.lastIndexOf('\n', cut - 1) + 1, cut);
+    const units = segments(line);
+    cut -= units.length > 0 ? line.length - units[units.length - 1][0] : 1;
+    result = text.slice(0, cut) + suffix;
+  }
+  return result;
+}
+
+module.exports = {
+  MAX_WEIGHTED_LENGTH,
+  URL_WEIGHT,
+  weightedLength,
+  overflowOffset,
+  truncateToWeightedLength
+};
@@ -1,6 +1,7 @@
 const https = require('https');
 const { generateOAuthHeader } = require('./oauth');
 const { log } = require('./logger');
+const { truncateToWeightedLength, weightedLength } = require('./tweet-length');
 
 /**
  * 指数バックオフでリトライ
@@ -81,11 +82,10 @@ async function postTweet(text, apiConfig, isSimulation = false) {
 
   const { apiKey, apiKeySecret, accessToken, accessTokenSecret } = apiConfig;
   
-  // 280文字制限（コードポイントベース）
-  let tweetText = text;
-  if ([...tweetText].length > 280) {
-    tweetText = [...tweetText].slice(0, 277).join('') + '...';
-    log(`文字数制限により切り詰めました: ${[...text].length} -> 280文字`);
+  // 280文字制限（X の重み付き文字数）
+  const tweetText = truncateToWeightedLength(text);
+  if (tweetText !== text) {
+    log(`文字数制限により切り詰めました: ${weightedLength(text)} -> ${weightedLength(tweetText)}`);
   }
 
   const tweetData = JSON.stringify({ text: tweetText });
@@ -5,12 +5,14 @@ auto_X GUI - X (Twitter) 自動投稿システムのGUIツール
 
 起動方法:
     python gui.py
+    python gui.py --fast-start   # 先にウィンドウを表示し、読み込みと同期は後から行う
 
 要件:
     - Python 3.6+
     - tkinter (標準ライブラリ)
 """
 
+import argparse
 import sys
 import os
 from pathlib import Path
@@ -31,6 +33,14 @@ except ImportError as e:
 
 def main():
     """GUIアプリケーションのエントリーポイント"""
+    parser = argparse.ArgumentParser(description='auto_X GUI')
+    parser.add_argument(
+        '--fast-start',
+        action='store_true',
+        help='先にウィンドウを表示し、タブは初回選択時に作成、起動時の同期はバックグラウンドで実行'
+    )
+    args = parser.parse_args()
+
     try:
         # プロジェクトルートの確認
         if not (project_root / 'configs').exists():
@@ -42,7 +52,7 @@ def main():
             return
 
         # メインウィンドウを作成・実行
-        app = MainWindow()
+        app = MainWindow(fast_start=args.fast_start)
         app.run()
         
     except Exception as e:
@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+"""
+GitHub Actions の実行コストと投稿遅延のシミュレーション
+
+投稿時刻・cron式・週末スキップ・スケジュール実行の遅延モデルから、月あたりの実行回数・
+課金対象の分数・予定時刻から実際の投稿までのずれの分布を求める。
+投稿処理（core/index.js の runPosting）は期日を確認せず、実行のたびにキューの先頭の1件を投稿する。
+そのため実行1回につき1件投稿されるとみなし（キューは空にならないものとする）、投稿の件数と時刻が
+投稿枠からどれだけずれるかを求める。遅延は試行ごとに乱数で与える。試行・実行の全体を NumPy の配列で
+まとめて計算するため、入力のたびに数十の候補を比べても待たされない。
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .workflow_optimizer import (
+    DEFAULT_CRON, HOUR_RANGE, JST_OFFSET_HOURS, MINUTE_RANGE, compile_cron, parse_cron_field
+)
+
+
+# シミュレーションする日数（曜日の偏りが出ないよう週単位）
+SIMULATION_DAYS = 28
+
+# 遅延の乱数の試行回数
+SAMPLES = 100
+
+# 1回の実行の所要時間（分、課金はジョブごとに分単位で切り上げ）
+JOB_MINUTES = 2
+
+# 1か月の平均日数
+MONTH_DAYS = 365.25 / 12
+
+# ずれの分布の区切り（分、最初の区間は区切りの最小値より前＝予定より早い投稿）
+DELAY_BINS = (0, 5, 10, 15, 30, 60)
+
+# 予定時刻より前に実行する候補のずらし幅（分）
+EARLY_OFFSETS = tuple(range(2, 31, 2))
+
+# 投稿時刻と関係なく一定間隔で実行する候補（表示名, cron式）
+INTERVAL_CANDIDATES = (
+    ('30分ごと', '*/30 * * * *'),
+    ('2時間ごと', '0 */2 * * *'),
+    ('3時間ごと', '0 */3 * * *'),
+)
+
+_JST_OFFSET_MINUTES = JST_OFFSET_HOURS * 60
+
+
+class DelayModel:
+    """スケジュール実行の遅延モデル（対数正規分布＋実行の取りこぼし）"""
+
+    def __init__(
+        self,
+        median_minutes: float = 8.0,
+        sigma: float = 0.6,
+        top_of_hour_factor: float = 1.5,
+        drop_probability: float = 0.005
+    ):
+        """
+        遅延モデルを作成
+
+        GitHub のスケジュール実行は負荷により数分〜十数分遅れ、毎時0分は特に混み合う。
+        負荷が高い場合は実行されないこともある。
+
+        Args:
+            median_minutes: 遅延の中央値（分）
+            sigma: 対数正規分布の形状（大きいほど遅延のばらつきが大きい）
+            top_of_hour_factor: 毎時0分の実行の遅延の倍率
+            drop_probability: 実行が取りこぼされる確率
+        """
+        self.median_minutes = median_minutes
+        self.sigma = sigma
+        self.top_of_hour_factor = top_of_hour_factor
+        self.drop_probability = drop_probability
+
+    def __repr__(self):
+        return (
+            f"DelayModel({self.median_minutes}, {self.sigma}, "
+            f"{self.top_of_hour_factor}, {self.drop_probability})"
+        )
+
+
+class SimulationResult:
+    """候補1件のシミュレーション結果"""
+
+    def __init__(
+        self,
+        label: str,
+        cron_lines: List[str],
+        executions_per_month: float,
+        billable_minutes_per_month: float,
+        slots_per_month: float,
+        extra_percent: float,
+        missed_percent: float,
+        delay_percentiles: Dict[int, float],
+        delay_histogram: List[float]
+    ):
+        """
+        シミュレーション結果を作成
+
+        Args:
+            label: 候補の表示名
+            cron_lines: UTC基準のcron式のリスト
+            executions_per_month: 1か月あたりの実行回数（実行1回につき1件投稿されるため投稿件数と同じ）
+            billable_minutes_per_month: 1か月あたりの課金対象の分数
+            slots_per_month: 1か月あたりの投稿枠の数（予定の投稿件数）
+            extra_percent: どの投稿枠の投稿にもならなかった予定外の投稿の割合（%）
+            missed_percent: 投稿されなかった投稿枠の割合（%）
+            delay_percentiles: {50: 中央値, 90: ..., 95: ..., 99: ...} の投稿枠から投稿までのずれ
+                （分、予定より早い場合は負、投稿がない場合は空）
+            delay_histogram: 区間ごとの投稿枠の割合（最初は DELAY_BINS の最小値未満、最後は最大の区切り以上）
+        """
+        self.label = label
+        self.cron_lines = cron_lines
+        self.executions_per_month = executions_per_month
+        self.billable_minutes_per_month = billable_minutes_per_month
+        self.slots_per_month = slots_per_month
+        self.extra_percent = extra_percent
+        self.missed_percent = missed_percent
+        self.delay_percentiles = delay_percentiles
+        self.delay_histogram = delay_histogram
+
+    def __repr__(self):
+        return (
+            f"SimulationResult({self.label!r}, {self.executions_per_month:.0f}回/月, "
+            f"{self.billable_minutes_per_month:.0f}分/月, p50={self.delay_percentiles.get(50)})"
+        )
+
+
+def _parse_cron(expression: str) -> Tuple[List[int], List[int], List[int]]:
+    """cron式を (分, 時, 曜日（月曜=0）) の値に展開（日・月の指定には対応しない）"""
+    parts = expression.split()
+    if len(parts) != 5:
+        raise ValueError(f"cron式が不正です: {expression}")
+    minute, hour, day, month, weekday = parts
+    if day != '*' or month != '*':
+        raise ValueError(f"日・月を指定したcron式はシミュレーションできません: {expression}")
+
+    # cron の曜日は日曜=0（7も日曜）、ここでは datetime と同じ月曜=0 に揃える
+    weekdays = sorted({(value + 6) % 7 for value in parse_cron_field(weekday, 0, 7)})
+    return (
+        parse_cron_field(minute, *MINUTE_RANGE),
+        parse_cron_field(hour, *HOUR_RANGE),
+        weekdays
+    )
+
+
+def _run_minutes(cron_lines: Sequence[str], start: int, end: int):
+    """
+    cron の実行予定時刻（月曜0時UTCからの分）を取得
+
+    Returns:
+        start 以上 end 未満の実行予定時刻の配列（重複なし・昇順）
+    """
+    runs = []
+    first_day, last_day = start // 1440, -(-end // 1440)
+    days = np.arange(first_day, last_day, dtype=np.int64)
+    for expression in cron_lines:
+        minutes, hours, weekdays = _parse_cron(expression)
+        run_days = days[np.isin(days % 7, weekdays)]
+        minute_of_day = (np.array(hours, dtype=np.int64)[:, None] * 60 + minutes).ravel()
+        runs.append(np.add.outer(run_days * 1440, minute_of_day).ravel())
+    runs = np.unique(np.concatenate(runs)) if runs else np.empty(0, dtype=np.int64)
+    return runs[(runs >= start) & (runs < end)]
+
+
+def _slot_minutes(times: Sequence[str], skip_weekends: bool, days: int):
+    """投稿枠の時刻（月曜0時UTCからの分、JSTの月曜0時から days 日分、昇順）"""
+    minute_of_day = []
+    for time_str in times:
+        try:
+            hour_str, minute_str = time_str.strip().split(':')
+            hour, minute = int(hour_str), int(minute_str)
+        except (ValueError, AttributeError):
+            continue
+        if 0 <= hour <= 23 and 0 <= minute <= 59:
+            minute_of_day.append(hour * 60 + minute)
+
+    jst_days = np.arange(days, dtype=np.int64)
+    if skip_weekends:
+        jst_days = jst_days[jst_days % 7 < 5]
+    slots = np.add.outer(jst_days * 1440, np.unique(np.array(minute_of_day, dtype=np.int64)))
+    return slots.ravel() - _JST_OFFSET_MINUTES
+
+
+def simulate_schedule(
+    times: Sequence[str],
+    cron_lines: Optional[Sequence[str]] = None,
+    skip_weekends: bool = False,
+    delay_model: Optional[DelayModel] = None,
+    label: str = '',
+    job_minutes: float = JOB_MINUTES,
+    days: int = SIMULATION_DAYS,
+    samples: int = SAMPLES,
+    seed: int = 0
+) -> SimulationResult:
+    """
+    投稿時刻と cron 式の組み合わせをシミュレーション（NumPy が必要）
+
+    取りこぼされなかった実行はそれぞれ1件投稿する（runPosting は期日を確認しないため）。
+    実行は予定時刻が最も近い投稿枠のためのものとみなし、枠ごとにずれの最も小さい投稿をその枠の投稿とする。
+    どの枠の投稿にもならない投稿は予定外、投稿のない枠は未投稿として数える。
+    同じ seed なら結果は毎回同じになる。
+
+    Args:
+        times: JST投稿時刻のリスト ["09:00", "12:30"]
+        cron_lines: UTC基準のcron式のリスト（Noneの場合は compile_cron の結果）
+        skip_weekends: 土日（JST）の投稿枠をなくす場合True（cron が土日に実行すると予定外の投稿になる）
+        delay_model: 遅延モデル（Noneの場合は既定値）
+        label: 結果に付ける表示名
+        job_minutes: 1回の実行の所要時間（分）
+        days: シミュレーションする日数
+        samples: 遅延の乱数の試行回数
+        seed: 乱数の種
+
+    Returns:
+        SimulationResultインスタンス
+
+    Raises:
+        ImportError: NumPy がインストールされていない場合
+        ValueError: シミュレーションできないcron式の場合
+    """
+    if np is None:
+        raise ImportError("simulate_schedule には NumPy が必要です (pip install numpy)")
+
+    cron_lines = list(compile_cron(list(times)) if cron_lines is None else cron_lines)
+    delay_model = delay_model or DelayModel()
+
+    # 時刻は月曜0時UTCからの分で扱う（期間はJSTの月曜0時から）
+    start = -_JST_OFFSET_MINUTES
+    end = start + days * 1440
+    slots = _slot_minutes(times, skip_weekends, days)
+    scheduled = _run_minutes(cron_lines, start, end)
+
+    rng = np.random.default_rng(seed)
+    shape = (samples, len(scheduled))
+    delays = rng.lognormal(math.log(delay_model.median_minutes), delay_model.sigma, shape)
+    delays[:, scheduled % 60 == 0] *= delay_model.top_of_hour_factor
+    executed = rng.random(shape) >= delay_model.drop_probability
+    runs = executed.sum(axis=1)
+
+    # 実行ごとに予定時刻が最も近い投稿枠を求め（遅れで隣の枠に移らないよう予定時刻で比べ、等距離なら後の枠）、
+    # 枠ごとにずれの最も小さい投稿をその枠の投稿とする
+    served = np.zeros((samples, len(slots)), dtype=bool)
+    drift = np.zeros(0)
+    if len(slots) and len(scheduled):
+        right = np.minimum(np.searchsorted(slots, scheduled), len(slots) - 1)
+        left = np.maximum(right - 1, 0)
+        nearest_slot = np.where(
+            np.abs(scheduled - slots[left]) < np.abs(scheduled - slots[right]), left, right
+        )
+
+        sample_index, run_index = np.nonzero(executed)
+        nearest = nearest_slot[run_index]
+        offset = scheduled[run_index] + delays[sample_index, run_index] - slots[nearest]
+
+        # (試行, 枠) ごとにずれの絶対値の小さい順に並べ、各組の先頭を取る（1つの浮動小数の並べ替えで済ませる）
+        key = sample_index * len(slots) + nearest
+        distance = np.abs(offset)
+        order = np.argsort(key * (float(distance.max()) + 1) + distance)
+        sorted_key = key[order]
+        first = order[np.concatenate(([True], sorted_key[1:] != sorted_key[:-1]))]
+        served.flat[key[first]] = True
+        drift = offset[first]
+
+    scale = MONTH_DAYS / days
+    if drift.size:
+        percentiles = dict(zip(
+            (50, 90, 95, 99),
+            (round(float(value), 1) for value in np.percentile(drift, (50, 90, 95, 99)))
+        ))
+        counts = np.histogram(drift, bins=[-np.inf] + list(DELAY_BINS) + [np.inf])[0]
+        histogram = (counts / drift.size).tolist()
+    else:
+        percentiles = {}
+        histogram = [0.0] * (len(DELAY_BINS) + 1)
+
+    total_runs = int(runs.sum())
+    return SimulationResult(
+        label=label,
+        cron_lines=cron_lines,
+        executions_per_month=float(runs.mean()) * scale,
+        billable_minutes_per_month=float(runs.mean()) * math.ceil(job_minutes) * scale,
+        slots_per_month=len(slots) * scale,
+        extra_percent=round(100 * (1 - drift.size / total_runs), 1) if total_runs else 0.0,
+        missed_percent=round(100 * (1 - float(served.mean())), 1) if len(slots) else 0.0,
+        delay_percentiles=percentiles,
+        delay_histogram=histogram
+    )
+
+
+def _shift_times(times: Sequence[str], minutes: int) -> List[str]:
+    """JSTの "HH:MM" のリストを minutes 分ずらす（不正な時刻はそのまま）"""
+    shifted = []
+    for time_str in times:
+        try:
+            hour_str, minute_str = time_str.strip().split(':')
+            total = (int(hour_str) * 60 + int(minute_str) + minutes) % 1440
+        except (ValueError, AttributeError):
+            shifted.append(time_str)
+            continue
+        shifted.append(f'{total // 60:02d}:{total % 60:02d}')
+    return shifted
+
+
+def default_candidates(times: Sequence[str]) -> List[Tuple[str, List[str]]]:
+    """
+    比較する既定の候補
+
+    投稿時刻ちょうどに実行する cron、スケジュール実行の遅れを見込んで EARLY_OFFSETS 分前に実行する cron、
+    毎時実行と一定間隔の実行を比べる。
+
+    Args:
+        times: JST投稿時刻のリスト
+
+    Returns:
+        [(表示名, cron式のリスト), ...]（cron式が同じ候補は最初の1件のみ）
+    """
+    candidates = [('最適化', compile_cron(list(times)))]
+    candidates.extend(
+        (f'{offset}分前', compile_cron(_shift_times(times, -offset))) for offset in EARLY_OFFSETS
+    )
+    candidates.append(('毎時実行', [DEFAULT_CRON]))
+    candidates.extend((label, [expression]) for label, expression in INTERVAL_CANDIDATES)
+
+    unique, seen = [], set()
+    for label, cron_lines in candidates:
+        if tuple(cron_lines) not in seen:
+            seen.add(tuple(cron_lines))
+            unique.append((label, cron_lines))
+    return unique
+
+
+def rank_key(result: SimulationResult) -> Tuple[float, float, float]:
+    """
+    候補を良い順に並べるためのキー
+
+    投稿の件数のずれ（予定外・未投稿の割合、取りこぼしによる差が順位を左右しないよう5%単位）が小さいものを優先し、
+    次に中央値・95%点のずれの大きい方、課金対象の分数で比べる。
+
+    Args:
+        result: SimulationResultインスタンス
+
+    Returns:
+        小さいほど良い候補になるタプル
+    """
+    if result.delay_percentiles:
+        drift = max(abs(result.delay_percentiles[50]), abs(result.delay_percentiles[95]))
+    else:
+        drift = math.inf
+    return (
+        round((result.extra_percent + result.missed_percent) / 5),
+        drift,
+        result.billable_minutes_per_month
+    )
+
+
+def compare_schedules(
+    times: Sequence[str],
+    candidates: Sequence[Tuple[str, Sequence[str]]],
+    skip_weekends: bool = False,
+    delay_model: Optional[DelayModel] = None,
+    **options
+) -> List[SimulationResult]:
+    """
+    同じ投稿時刻・遅延モデルで複数の cron 式の候補を比較
+
+    候補ごとに同じ乱数の種を使うため、結果の差は cron 式の差だけによる。
+
+    Args:
+        times: JST投稿時刻のリスト
+        candidates: [(表示名, cron式のリスト), ...]（default_candidates の形式）
+        skip_weekends: 土日（JST）の投稿枠をなくす場合True
+        delay_model: 遅延モデル（Noneの場合は既定値）
+        **options: simulate_schedule に渡すその他の引数（job_minutes・days・samples・seed）
+
+    Returns:
+        候補の順の SimulationResult のリスト（シミュレーションできない候補は除く）
+
+    Raises:
+        ImportError: NumPy がインストールされていない場合
+    """
+    results = []
+    for label, cron_lines in candidates:
+        try:
+            results.append(simulate_schedule(
+                times, cron_lines, skip_weekends, delay_model, label, **options
+            ))
+        except ValueError as e:
+            print(f"シミュレーションをスキップ ({label}): {e}")
+    return results
+
+
+def format_result(result: SimulationResult) -> str:
+    """
+    結果を1行の表示用文字列にする
+
+    Args:
+        result: SimulationResultインスタンス
+
+    Returns:
+        「最適化: 月248回・496分 / 投稿 月248件（予定248件） / ずれ 中央値9分・95%点21分」のような文字列
+    """
+    text = (
+        f"{result.label}: 月{result.executions_per_month:.0f}回・"
+        f"{result.billable_minutes_per_month:.0f}分"
+        f" / 投稿 月{result.executions_per_month:.0f}件（予定{result.slots_per_month:.0f}件）"
+    )
+    if result.delay_percentiles:
+        text += (
+            f" / ずれ 中央値{result.delay_percentiles[50]:.0f}分・"
+            f"95%点{result.delay_percentiles[95]:.0f}分"
+        )
+    if result.extra_percent:
+        text += f" / 予定外{result.extra_percent}%"
+    if result.missed_percent:
+        text += f" / 未投稿{result.missed_percent}%"
+    return text
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+ファイル一括移動（ジャーナル付き）
+
+移動予定を先にジャーナルへ書き出してから、各ファイルを1回のリネームで移動する。
+別のドライブ（ファイルシステム）への移動は、コピーして fsync してから移動元を削除する。
+途中で失敗・中断した場合は、次回起動時にジャーナルから元に戻す（または完了させる）。
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import filecmp
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+# ジャーナルの既定の保存先（プロジェクトルートからの相対パス）
+DEFAULT_JOURNAL_PATH = Path('.cache') / 'move_journal.json'
+
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+
+
+def _load_renameat2():
+    """renameat2 を読み込み（使えない場合None）"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        return libc.renameat2
+    except (OSError, AttributeError):
+        return None
+
+
+_renameat2 = _load_renameat2()
+
+
+def rename_noreplace(src, dst):
+    """
+    移動先が存在する場合は失敗するリネーム
+
+    Args:
+        src: 移動元パス
+        dst: 移動先パス
+
+    Raises:
+        FileExistsError: 移動先が既に存在する場合
+        OSError: リネームに失敗した場合
+    """
+    src, dst = os.fspath(src), os.fspath(dst)
+
+    if _renameat2 is not None:
+        result = _renameat2(_AT_FDCWD, os.fsencode(src), _AT_FDCWD, os.fsencode(dst), _RENAME_NOREPLACE)
+        if result == 0:
+            return
+        err = ctypes.get_errno()
+        # ファイルシステムが未対応の場合は通常のリネームにフォールバック
+        if err not in (errno.EINVAL, errno.ENOSYS):
+            raise OSError(err, os.strerror(err), src, None, dst)
+
+    if os.name == 'nt':
+        # Windows の os.rename は移動先が存在すると失敗する
+        os.rename(src, dst)
+        return
+
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+    os.rename(src, dst)
+
+
+def _copy_temp_path(dst: Path) -> Path:
+    """別のドライブへのコピー中の一時ファイル名"""
+    return dst.with_name('.' + dst.name + '.moving')
+
+
+def move_noreplace(src, dst):
+    """
+    移動先が存在する場合は失敗する移動（別のドライブへの移動にも対応）
+
+    同じドライブ内は rename_noreplace で移動する。別のドライブの場合は移動先の一時ファイルに
+    コピーして fsync し、移動先の名前に付け替えてから移動元を削除する。途中で中断しても
+    移動元は残る（移動先と同じ内容のファイルが両方にある状態は recover が片付ける）。
+
+    Args:
+        src: 移動元パス
+        dst: 移動先パス
+
+    Raises:
+        FileExistsError: 移動先が既に存在する場合
+        OSError: 移動に失敗した場合
+    """
+    try:
+        rename_noreplace(src, dst)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    src, dst = Path(src), Path(dst)
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), str(dst))
+
+    temp_path = _copy_temp_path(dst)
+    try:
+        shutil.copy2(src, temp_path)
+        with open(temp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        rename_noreplace(temp_path, dst)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+    fsync_directory(dst.parent)
+    src.unlink()
+
+
+def _is_copy(src: Path, dst: Path) -> bool:
+    """移動元と移動先が両方あり同じ内容か（別のドライブへのコピー後、移動元の削除前に中断した状態）"""
+    try:
+        return src.is_file() and dst.is_file() and filecmp.cmp(src, dst, shallow=False)
+    except OSError:
+        return False
+
+
+def fsync_directory(directory):
+    """
+    ディレクトリエントリの変更をディスクに反映（Windows では何もしない）
+
+    Args:
+        directory: ディレクトリパス
+    """
+    if os.name == 'nt':
+        return
+    fd = os.open(os.fspath(directory), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class BatchMover:
+    """ジャーナル付き一括移動クラス"""
+
+    def __init__(self, journal_path=None):
+        """
+        一括移動を初期化
+
+        Args:
+            journal_path: ジャーナルファイルのパス（Noneの場合はデフォルト）
+        """
+        self.journal_path = Path(journal_path) if journal_path else Path.cwd() / DEFAULT_JOURNAL_PATH
+
+    def _write_journal(self, moves: List[Tuple[Path, Path]]):
+        """移動予定をジャーナルに書き出し（fsync まで行う）"""
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'moves': [[str(src), str(dst)] for src, dst in moves]}
+
+        temp_path = self.journal_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_path)
+        fsync_directory(self.journal_path.parent)
+
+    def _read_journal(self) -> Optional[List[Tuple[Path, Path]]]:
+        """ジャーナルを読み込み（存在しない場合None）"""
+        if not self.journal_path.exists():
+            return None
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [(Path(src), Path(dst)) for src, dst in data.get('moves', [])]
+
+    def _clear_journal(self):
+        """ジャーナルを削除"""
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _sync_directories(self, moves: List[Tuple[Path, Path]]):
+        """移動元・移動先ディレクトリを1回ずつfsync"""
+        directories = {src.parent for src, _ in moves} | {dst.parent for _, dst in moves}
+        for directory in directories:
+            fsync_directory(directory)
+
+    def execute(self, moves: List[Tuple[Path, Path]]) -> int:
+        """
+        ファイルを一括移動（失敗時は移動済みのファイルを元に戻す）
+
+        Args:
+            moves: (移動元, 移動先) のリスト
+
+        Returns:
+            移動したファイル数
+
+        Raises:
+            FileExistsError: 移動先が既に存在する場合
+            OSError: 移動に失敗した場合
+        """
+        moves = [(Path(src), Path(dst)) for src, dst in moves]
+        if not moves:
+            return 0
+
+        self._write_journal(moves)
+
+        done = []
+        try:
+            for src, dst in moves:
+                move_noreplace(src, dst)
+                done.append((src, dst))
+        except OSError:
+            # 移動済みのファイルを逆順に戻す
+            try:
+                for src, dst in reversed(done):
+                    move_noreplace(dst, src)
+                self._sync_directories(moves)
+                self._clear_journal()
+            except OSError:
+                pass  # ジャーナルを残し、次回起動時の recover に任せる
+            raise
+
+        self._sync_directories(moves)
+        self._clear_journal()
+        return len(done)
+
+    def recover(self, replay: bool = False) -> Optional[str]:
+        """
+        前回中断した一括移動を復旧
+
+        Args:
+            replay: Trueの場合は残りの移動を完了させる（Falseの場合は元に戻す）
+
+        Returns:
+            'completed'・'replayed'・'rolled_back' のいずれか（ジャーナルがない場合None）
+
+        Raises:
+            OSError: 復旧に失敗した場合（ジャーナルは残る）
+        """
+        try:
+            moves = self._read_journal()
+        except (OSError, ValueError):
+            # 書き込み途中のジャーナル（移動は未実行）
+            self._clear_journal()
+            return None
+
+        if moves is None:
+            return None
+
+        # 別のドライブへのコピー途中の一時ファイルは不要
+        for path in {path for move in moves for path in move}:
+            try:
+                _copy_temp_path(path).unlink()
+            except FileNotFoundError:
+                pass
+
+        pending = [(src, dst) for src, dst in moves if src.exists() and not dst.exists()]
+        copied = [(src, dst) for src, dst in moves if _is_copy(src, dst)]
+        if not pending and not copied:
+            status = 'completed'
+        elif replay:
+            for src, dst in pending:
+                move_noreplace(src, dst)
+            for src, _ in copied:
+                src.unlink()
+            status = 'replayed'
+        else:
+            for src, dst in reversed(moves):
+                if (src, dst) in copied:
+                    dst.unlink()
+                elif dst.exists() and not src.exists():
+                    move_noreplace(dst, src)
+            status = 'rolled_back'
+
+        self._sync_directories(moves)
+        self._clear_journal()
+        return status
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+投稿ファイルの分類
+
+ファイル名・内容のルールで投稿をカテゴリに分類する。内容はメモリマップ上で
+バイト列検索し、最初に一致した時点で打ち切る。内容ルールの判定結果は内容ハッシュ
+単位でキャッシュし、新規・変更ファイルだけをプロセスプールで判定する。
+"""
+
+import hashlib
+import mmap
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .queue_index import DEFAULT_DB_PATH, QueueIndex
+
+
+# ブログ紹介投稿の判定に使うURL
+BLOG_URL = b'www.coommu.com'
+
+# この件数未満はプロセスプールを使わずに判定
+_PARALLEL_THRESHOLD = 64
+
+
+class ClassificationRule:
+    """分類ルール（指定した条件をすべて満たす場合に一致）"""
+
+    def __init__(
+        self,
+        category: str,
+        content: Sequence[bytes] = (),
+        name_suffixes: Sequence[str] = (),
+        name_pattern: Optional[str] = None
+    ):
+        """
+        分類ルールを作成
+
+        Args:
+            category: 一致時のカテゴリ名
+            content: 内容に含まれるバイト列（いずれか1つを含めば一致）
+            name_suffixes: ファイル名の末尾（いずれか1つで終われば一致）
+            name_pattern: ファイル名の正規表現
+        """
+        self.category = category
+        self.content = tuple(content)
+        self.name_suffixes = tuple(name_suffixes)
+        self.name_pattern = name_pattern
+
+    def matches_name(self, name: str) -> bool:
+        """ファイル名の条件を判定（条件がない場合True）"""
+        if self.name_suffixes and not name.endswith(self.name_suffixes):
+            return False
+        if self.name_pattern and not re.search(self.name_pattern, name):
+            return False
+        return True
+
+    def __repr__(self):
+        return (f"ClassificationRule({self.category!r}, content={self.content!r}, "
+                f"name_suffixes={self.name_suffixes!r}, name_pattern={self.name_pattern!r})")
+
+
+def rules_fingerprint(rules: Sequence[ClassificationRule]) -> str:
+    """
+    内容ルールの識別子を計算（内容ルール変更時はキャッシュを使わない）
+
+    Args:
+        rules: 分類ルールのリスト
+
+    Returns:
+        識別子文字列
+    """
+    content_rules = [(i, rule.content) for i, rule in enumerate(rules) if rule.content]
+    return hashlib.blake2b(repr(content_rules).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _content_contains(file_path: str, patterns: Sequence[bytes]) -> bool:
+    """メモリマップ上でバイト列を検索（最初の一致で終了）"""
+    with open(file_path, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return any(mapped.find(pattern) != -1 for pattern in patterns)
+        except ValueError:
+            # 空ファイルはメモリマップできない
+            return False
+
+
+def classify_file(file_path, rules: Sequence[ClassificationRule], default: str) -> str:
+    """
+    1ファイルを分類（ルールは先頭から順に評価し、最初に一致したものを採用）
+
+    Args:
+        file_path: ファイルパス
+        rules: 分類ルールのリスト
+        default: どのルールにも一致しない場合のカテゴリ
+
+    Returns:
+        カテゴリ名（読み込みエラー時は default）
+    """
+    file_path = str(file_path)
+    name = Path(file_path).name
+    try:
+        for rule in rules:
+            if not rule.matches_name(name):
+                continue
+            if rule.content and not _content_contains(file_path, rule.content):
+                continue
+            return rule.category
+    except OSError as e:
+        print(f"ファイル読み込みエラー: {name} - {e}")
+    return default
+
+
+def content_signature(file_path, rules: Sequence[ClassificationRule]) -> Optional[int]:
+    """
+    内容ルールの一致状況を計算（ファイル名に依存しないためハッシュ単位でキャッシュできる）
+
+    Args:
+        file_path: ファイルパス
+        rules: 分類ルールのリスト
+
+    Returns:
+        内容条件を満たすルールの番号をビットで表した整数（読み込みエラー時はNone）
+    """
+    signature = 0
+    try:
+        for i, rule in enumerate(rules):
+            if rule.content and _content_contains(str(file_path), rule.content):
+                signature |= 1 << i
+    except OSError as e:
+        print(f"ファイル読み込みエラー: {Path(file_path).name} - {e}")
+        return None
+    return signature
+
+
+def resolve_category(name: str, rules: Sequence[ClassificationRule], default: str, signature: int) -> str:
+    """
+    ファイル名と内容ルールの一致状況からカテゴリを決定
+
+    Args:
+        name: ファイル名
+        rules: 分類ルールのリスト
+        default: どのルールにも一致しない場合のカテゴリ
+        signature: content_signature の結果
+
+    Returns:
+        カテゴリ名
+    """
+    for i, rule in enumerate(rules):
+        if not rule.matches_name(name):
+            continue
+        if rule.content and not signature & (1 << i):
+            continue
+        return rule.category
+    return default
+
+
+def _signature_worker(args) -> Optional[int]:
+    """プロセスプール用のラッパー"""
+    return content_signature(*args)
+
+
+class SignatureCache:
+    """内容ルールの判定結果のキャッシュ（内容ハッシュ単位）"""
+
+    def __init__(self, db_path=None):
+        """
+        キャッシュを初期化
+
+        Args:
+            db_path: キャッシュDBのパス（Noneの場合はキューインデックスと同じDB）
+        """
+        db_path = Path(db_path) if db_path else Path.cwd() / DEFAULT_DB_PATH
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path))
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS content_signatures ('
+            'rules TEXT NOT NULL, hash TEXT NOT NULL, signature INTEGER NOT NULL, '
+            'PRIMARY KEY (rules, hash)) WITHOUT ROWID'
+        )
+        self._conn.commit()
+
+    def lookup(self, rules_key: str, hashes: Sequence[str]) -> Dict[str, int]:
+        """
+        キャッシュ済みの判定結果を取得
+
+        Args:
+            rules_key: ルールセットの識別子
+            hashes: 内容ハッシュのリスト
+
+        Returns:
+            {ハッシュ: 内容ルールの一致状況} の辞書（キャッシュにあるもののみ）
+        """
+        found = {}
+        unique = list(set(hashes))
+        # SQLiteのパラメータ数上限を考慮して分割
+        for i in range(0, len(unique), 500):
+            chunk = unique[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(self._conn.execute(
+                f'SELECT hash, signature FROM content_signatures WHERE rules = ? AND hash IN ({placeholders})',
+                [rules_key] + chunk
+            ))
+        return found
+
+    def store(self, rules_key: str, signatures: Dict[str, int]):
+        """
+        判定結果を保存
+
+        Args:
+            rules_key: ルールセットの識別子
+            signatures: {ハッシュ: 内容ルールの一致状況} の辞書
+        """
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO content_signatures (rules, hash, signature) VALUES (?, ?, ?)',
+                [(rules_key, digest, signature) for digest, signature in signatures.items()]
+            )
+
+    def close(self):
+        """DB接続を閉じる"""
+        self._conn.close()
+
+
+def classify_folder(
+    folder,
+    rules: Sequence[ClassificationRule],
+    default: str,
+    names: Optional[List[str]] = None,
+    db_path=None,
+    max_workers: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    フォルダ内のファイルを分類（新規・変更ファイルのみ判定）
+
+    Args:
+        folder: 対象フォルダ
+        rules: 分類ルールのリスト
+        default: どのルールにも一致しない場合のカテゴリ
+        names: 対象ファイル名（Noneの場合はフォルダ内の全投稿ファイル）
+        db_path: インデックス・キャッシュDBのパス（Noneの場合はデフォルト）
+        max_workers: プロセス数（Noneの場合はCPU数）
+
+    Returns:
+        {ファイル名: カテゴリ} の辞書
+    """
+    folder = Path(folder)
+    rules_key = rules_fingerprint(rules)
+
+    # 変更のあったファイルだけハッシュを再計算
+    index = QueueIndex(folder, db_path)
+    cache = SignatureCache(db_path)
+    try:
+        index.sync()
+        hashes = index.hashes()
+        if names is not None:
+            hashes = {name: hashes[name] for name in names if name in hashes}
+
+        cached = cache.lookup(rules_key, list(hashes.values()))
+        # 同じ内容のファイルは1回だけ判定
+        digests = sorted({digest for digest in hashes.values() if digest not in cached})
+        first_names = {}
+        for name, digest in hashes.items():
+            first_names.setdefault(digest, name)
+        tasks = [(str(folder / first_names[digest]), rules) for digest in digests]
+
+        if len(tasks) >= _PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_signature_worker, tasks, chunksize=32))
+        else:
+            results = [_signature_worker(task) for task in tasks]
+
+        # 読み込みに失敗した内容はキャッシュせず、今回だけ内容ルールに一致しないものとして扱う
+        new_signatures = {
+            digest: signature for digest, signature in zip(digests, results) if signature is not None
+        }
+        if new_signatures:
+            cache.store(rules_key, new_signatures)
+        cached.update(new_signatures)
+
+        verdicts = {
+            name: resolve_category(name, rules, default, cached.get(digest, 0))
+            for name, digest in hashes.items()
+        }
+
+        # インデックスに載らなかったファイル（読み込みエラー等）は個別に判定
+        for name in names or []:
+            if name not in verdicts:
+                verdicts[name] = classify_file(folder / name, rules, default)
+        return verdicts
+    finally:
+        cache.close()
+        index.close()
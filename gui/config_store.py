@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+設定ファイル（configs/sns.json）のキャッシュと保存
+
+読み込んだ設定は更新時刻・サイズをキーにキャッシュし、変更のない間はファイルを読み直さない。
+呼び出し側には読み取り専用のスナップショット（dict は MappingProxyType、list は tuple）を渡す。
+保存は一時ファイルに書いてから os.replace で置き換えるため、書き込み途中の壊れたファイルを
+Node.js 側が読むことはない。短時間に続いた保存は最後の内容だけを1回書き込む。
+保存や外部での変更（git pull など）を検出したときは登録された監視関数に通知する。
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+
+# 保存をまとめる待ち時間（秒、この間に続いた保存は最後の内容だけを書き込む）
+SAVE_DEBOUNCE_SECONDS = 0.3
+
+
+def freeze(value: Any) -> Any:
+    """
+    JSONの値を読み取り専用に変換
+
+    Args:
+        value: json.load の結果
+
+    Returns:
+        dict は MappingProxyType、list は tuple に再帰的に変換した値
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    読み取り専用の値を編集できる dict・list に戻す
+
+    Args:
+        value: スナップショットまたはその一部
+
+    Returns:
+        dict・list に再帰的に変換した値（元のスナップショットとは共有しない）
+    """
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+class ConfigStore:
+    """設定ファイルのキャッシュ・保存・変更通知（スレッドセーフ）"""
+
+    def __init__(self, path, debounce: float = SAVE_DEBOUNCE_SECONDS):
+        """
+        ストアを初期化（ファイルは最初の snapshot で読み込む）
+
+        Args:
+            path: 設定ファイルのパス
+            debounce: 保存をまとめる待ち時間（秒）
+        """
+        self.path = Path(path)
+        self.debounce = debounce
+
+        self._lock = threading.RLock()
+        # 読み込み済みの設定と、そのときのファイルの (更新時刻, サイズ)
+        self._snapshot: Optional[Mapping[str, Any]] = None
+        self._stat: Optional[Tuple[int, int]] = None
+        # 書き込み待ちの設定（なければNone）
+        self._pending: Optional[Mapping[str, Any]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._observers: List[Callable[[Mapping[str, Any]], None]] = []
+
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        """設定ファイルの (更新時刻, サイズ)（存在しない場合None）"""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """
+        設定の読み取り専用スナップショットを取得
+
+        書き込み待ちの保存がある場合はその内容を返す。ファイルの更新時刻・サイズが
+        前回の読み込みから変わっていなければファイルを読み直さない。
+
+        Returns:
+            設定（MappingProxyType）
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合
+            json.JSONDecodeError: JSONの解析に失敗した場合
+        """
+        changed = None
+        with self._lock:
+            if self._pending is not None:
+                return self._pending
+
+            stat = self._file_stat()
+            if stat is None:
+                raise FileNotFoundError(f"設定ファイルが見つかりません: {self.path}")
+            if stat != self._stat or self._snapshot is None:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    snapshot = freeze(json.load(f))
+                # 初回の読み込みは変更として通知しない
+                if self._snapshot is not None:
+                    changed = snapshot
+                self._snapshot = snapshot
+                self._stat = stat
+            result = self._snapshot
+
+        if changed is not None:
+            # 外部（git pull・手動編集など）で変わった
+            self._notify(changed)
+        return result
+
+    def refresh(self) -> bool:
+        """
+        ファイルの変更を確認し、変わっていれば読み直して通知
+
+        Returns:
+            読み直した場合True（読み込めない場合はFalse）
+        """
+        with self._lock:
+            before = self._snapshot
+        try:
+            return self.snapshot() is not before
+        except (OSError, ValueError):
+            return False
+
+    def save(self, config: Mapping[str, Any]):
+        """
+        設定を保存（待ち時間の間に続いた保存は最後の内容だけを書き込む）
+
+        保存した内容は書き込み前でも snapshot で読める。すぐに書き込む必要がある場合は flush を呼ぶ。
+
+        Args:
+            config: 保存する設定（dict でもスナップショットでもよい）
+        """
+        snapshot = freeze(thaw(config))
+        with self._lock:
+            self._pending = snapshot
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._flush_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+        self._notify(snapshot)
+
+    def flush(self):
+        """
+        書き込み待ちの設定をすぐに書き込む（なければ何もしない）
+
+        Raises:
+            OSError: ファイル書き込みに失敗した場合（書き込み待ちの内容は保持される）
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending = self._pending
+            if pending is None:
+                return
+            self._write(pending)
+            self._pending = None
+            self._snapshot = pending
+            self._stat = self._file_stat()
+
+    def _flush_in_background(self):
+        """待ち時間の経過後に書き込む（タイマースレッドから呼ばれる）"""
+        try:
+            self.flush()
+        except OSError as e:
+            print(f"設定ファイル保存エラー: {e}")
+
+    def _write(self, config: Mapping[str, Any]):
+        """一時ファイルに書いてから置き換える（ロック内で呼ぶ）"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        # UTF-8で整形して保存
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(thaw(config), f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def subscribe(self, observer: Callable[[Mapping[str, Any]], None]):
+        """
+        設定の変更を通知する関数を登録
+
+        Args:
+            observer: 変更後のスナップショットを受け取る関数（保存したスレッド・タイマースレッドから呼ばれる）
+        """
+        with self._lock:
+            if observer not in self._observers:
+                self._observers.append(observer)
+
+    def unsubscribe(self, observer: Callable[[Mapping[str, Any]], None]):
+        """
+        登録した関数を解除
+
+        Args:
+            observer: subscribe で登録した関数
+        """
+        with self._lock:
+            if observer in self._observers:
+                self._observers.remove(observer)
+
+    def _notify(self, snapshot: Mapping[str, Any]):
+        """監視関数に通知（ロックの外で呼ぶ、1つの失敗で他を止めない）"""
+        with self._lock:
+            observers = list(self._observers)
+        for observer in observers:
+            try:
+                observer(snapshot)
+            except Exception as e:
+                print(f"設定変更の通知エラー: {e}")
+
+
+_stores: Dict[str, ConfigStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_config_store(config_path=None) -> ConfigStore:
+    """
+    設定ファイルごとに共有されるストアを取得
+
+    Args:
+        config_path: 設定ファイルのパス（Noneの場合は configs/sns.json）
+
+    Returns:
+        ConfigStoreインスタンス
+    """
+    path = Path(config_path) if config_path else Path.cwd() / 'configs' / 'sns.json'
+    key = str(path.resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ConfigStore(path)
+            _stores[key] = store
+        return store
@@ -7,7 +7,7 @@ configs/sns.json の設定を GUI で編集
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from .utils import (
     load_config, save_config, parse_post_time, parse_fixed_times,
@@ -17,30 +17,66 @@ from .workflow_optimizer import (
     optimize_cron_for_times, update_workflow_cron, get_execution_frequency_info
 )
 from .git_manager import GitManager
+from .git_remote import DEFAULT_POLL_INTERVAL
+from .config_store import get_config_store, thaw
+from .actions_simulator import JOB_MINUTES, compare_schedules, default_candidates, format_result, rank_key
+
+
+# 投稿時刻の入力が止まってからシミュレーションするまでの待ち時間（ミリ秒）
+SIMULATION_DELAY_MS = 300
+
+# 試算で表示する候補の数（良い順）
+SIMULATION_TOP_RESULTS = 5
 
 
 class ConfigTab:
     """設定タブクラス"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, git_manager: Optional[GitManager] = None):
         """
         設定タブを初期化
         
         Args:
             parent: 親ウィジェット（通常はNotebook）
+            git_manager: Git管理オブジェクト（Noneの場合は新規作成、ジョブキューを共有する場合に渡す）
         """
         self.parent = parent
         self.frame = ttk.Frame(parent)
         
-        # 設定データ
+        # 設定データ（読み取り専用のスナップショット、保存時に dict に戻して編集する）
         self.config = {}
+
+        # 予約中のシミュレーション（after のID）
+        self._simulation_after = None
+
+        # 動作中のリモート確認の間隔（秒、停止中はNone）
+        self._poll_interval = None
         
         # Git管理オブジェクト
-        self.git_manager = GitManager()
+        self.git_manager = git_manager or GitManager()
         
         self._create_widgets()
         self._setup_layout()
         self._bind_events()
+
+        # 保存・外部での変更（git pull など）を通知で受け取る
+        get_config_store().subscribe(self._on_config_changed)
+
+    def _on_config_changed(self, snapshot):
+        """設定の変更通知（保存したスレッド・タイマースレッドから呼ばれる）"""
+        self.frame.after(0, lambda: self._apply_config_change(snapshot))
+
+    def _apply_config_change(self, snapshot):
+        """他で変わった設定をGUIに反映（自分で保存した内容の場合は何もしない）"""
+        if snapshot is not self.config:
+            self.load_config()
+
+    def close(self):
+        """設定の変更通知と予約中のシミュレーションを解除"""
+        get_config_store().unsubscribe(self._on_config_changed)
+        if self._simulation_after is not None:
+            self.frame.after_cancel(self._simulation_after)
+            self._simulation_after = None
         
     def _create_widgets(self):
         """ウィジェットを作成"""
@@ -139,6 +175,14 @@ class ConfigTab:
             font=("Arial", 9),
             foreground="blue"
         )
+        # 候補ごとの実行回数・課金分数・投稿遅延（NumPy がない場合は表示しない）
+        self.simulation_label = ttk.Label(
+            self.frequency_frame,
+            text="",
+            font=("Arial", 8),
+            foreground="gray",
+            justify='left'
+        )
         
         # === ステータスセクション ===
         self.status_frame = ttk.Frame(self.main_frame)
@@ -147,6 +191,11 @@ class ConfigTab:
             text="設定ファイル: 未読み込み",
             font=("Arial", 9)
         )
+        self.remote_label = ttk.Label(
+            self.status_frame,
+            text="",
+            font=("Arial", 9)
+        )
         
     def _setup_layout(self):
         """レイアウトを設定"""
@@ -166,11 +215,13 @@ class ConfigTab:
         
         # 実行頻度表示
         self.frequency_frame.pack(fill='x', pady=(0, 10))
-        self.frequency_label.pack(side='left')
+        self.frequency_label.pack(anchor='w')
+        self.simulation_label.pack(anchor='w')
         
         # ステータス
         self.status_frame.pack(fill='x')
         self.status_label.pack(side='left')
+        self.remote_label.pack(side='right')
         
     def _bind_events(self):
         """イベントをバインド"""
@@ -201,11 +252,51 @@ class ConfigTab:
             
             # 実行頻度表示を更新
             self.update_frequency_display()
+
+            # リモート変更の定期確認（間隔が変わった場合だけ再開）
+            self.start_remote_polling()
             
         except Exception as e:
             messagebox.showerror("エラー", f"設定ファイルの読み込みに失敗しました:\n{str(e)}")
             self.status_label.config(text=f"エラー: {str(e)}", foreground="red")
     
+    def start_remote_polling(self):
+        """
+        リモート変更の定期確認を開始
+
+        間隔は設定ファイルの gui.remotePollInterval（秒）。0 の場合は確認しない。
+        既に同じ間隔で動いている場合は何もしない（設定の保存・pull のたびに ls-remote しない）。
+        """
+        interval = self.config.get('gui', {}).get('remotePollInterval', DEFAULT_POLL_INTERVAL)
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            interval = None
+        if interval == self._poll_interval:
+            return
+        self._poll_interval = interval
+
+        if interval is None:
+            self.git_manager.stop_remote_polling()
+            self.remote_label.config(text="")
+            return
+
+        def on_result(result):
+            # 確認スレッドから呼ばれるためメインスレッドで表示を更新
+            self.frame.after(0, lambda: self._update_remote_label(result))
+
+        self.git_manager.start_remote_polling(on_result, interval)
+
+    def _update_remote_label(self, result: dict):
+        """リモート変更の確認結果を表示"""
+        if 'error' in result:
+            self.remote_label.config(text="リモート確認: 失敗（後で再試行します）", foreground="gray")
+        elif result.get('has_changes'):
+            self.remote_label.config(
+                text=f"リモートに {result['behind_count']} 件の新しいコミットがあります",
+                foreground="orange"
+            )
+        else:
+            self.remote_label.config(text="リモート: 最新", foreground="gray")
+
     def save_config(self):
         """GUI設定を設定ファイルに保存"""
         try:
@@ -213,10 +304,11 @@ class ConfigTab:
             if not self._validate_inputs():
                 return
             
-            # 設定を構築
-            if not self.config:
+            # 設定を構築（スナップショットは読み取り専用のため dict に戻して編集）
+            config = thaw(self.config)
+            if not config:
                 # 基本構造を作成
-                self.config = {
+                config = {
                     "folders": {},
                     "twitterApi": {
                         "apiKey": "",
@@ -227,13 +319,14 @@ class ConfigTab:
                 }
 
             # フォルダ設定を保存
-            if 'folders' not in self.config:
-                self.config['folders'] = {}
-            self.config['folders']['input'] = self.input_folder_var.get()
-            self.config['folders']['posted'] = self.posted_folder_var.get()
+            if 'folders' not in config:
+                config['folders'] = {}
+            config['folders']['input'] = self.input_folder_var.get()
+            config['folders']['posted'] = self.posted_folder_var.get()
             
-            # 設定ファイルに保存
-            save_config(self.config)
+            # 設定ファイルに保存（一時ファイル経由で置き換え、続けて保存した場合はまとめて書き込む）
+            save_config(config)
+            self.config = load_config()
             
             # ステータス更新
             self.status_label.config(text="設定ファイル: 保存完了", foreground="blue")
@@ -309,8 +402,9 @@ class ConfigTab:
                 )
                 return
 
-            # まず設定保存
+            # まず設定保存（コミット前に書き込みを済ませる）
             self.save_config()
+            get_config_store().flush()
 
             # GitHub Actions最適化
             times_list = parse_fixed_times(self.times_var.get())
@@ -430,6 +524,38 @@ class ConfigTab:
         except Exception:
             self.frequency_label.config(text="GitHub Actions実行頻度: エラー", foreground="red")
 
+        self._schedule_simulation()
+
+    def _schedule_simulation(self):
+        """シミュレーションを予約（入力中の連続した変更は1回にまとめる）"""
+        if self._simulation_after is not None:
+            self.frame.after_cancel(self._simulation_after)
+        self._simulation_after = self.frame.after(SIMULATION_DELAY_MS, self.update_simulation_display)
+
+    def update_simulation_display(self):
+        """cron の候補のコスト・投稿のずれを比較し、良い順に表示"""
+        self._simulation_after = None
+        times_list = parse_fixed_times(self.times_var.get().strip())
+        if not times_list:
+            self.simulation_label.config(text="")
+            return
+
+        skip_weekends = bool(self.config.get('posting', {}).get('skipWeekends', False))
+        try:
+            results = compare_schedules(times_list, default_candidates(times_list), skip_weekends)
+        except ImportError:
+            # NumPy がない環境では実行頻度の表示だけにする
+            self.simulation_label.config(text="")
+            return
+
+        results.sort(key=rank_key)
+        lines = [
+            f"試算（{len(results)}候補・1か月・1回{JOB_MINUTES}分・実行ごとに1件投稿"
+            f"{'・土日投稿なし' if skip_weekends else ''}）:"
+        ]
+        lines.extend(f"  {format_result(result)}" for result in results[:SIMULATION_TOP_RESULTS])
+        self.simulation_label.config(text="\n".join(lines))
+
     def select_input_folder(self):
         """投稿ファイルフォルダを選択"""
         from tkinter import filedialog
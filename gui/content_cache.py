@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+投稿ファイル内容の遅延読み込み
+
+一覧表示用には先頭数百バイトだけを読み、本文は必要になった時点で読み込む。
+読み込んだ本文は (パス, 更新時刻) をキーとしたサイズ上限付きLRUキャッシュに保持する。
+"""
+
+import codecs
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+# 本文キャッシュの既定の上限（文字数の合計）
+DEFAULT_CACHE_CHARS = 2 * 1024 * 1024
+
+
+def read_head(file_path, max_bytes: int) -> Tuple[str, bool]:
+    """
+    ファイルの先頭部分だけを読み込み
+
+    Args:
+        file_path: ファイルパス
+        max_bytes: 読み込む最大バイト数
+
+    Returns:
+        (先頭テキスト, ファイル全体を読み切った場合True)
+
+    Raises:
+        OSError: ファイル読み込みに失敗した場合
+        UnicodeDecodeError: UTF-8として解釈できない場合
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read(max_bytes + 1)
+
+    complete = len(data) <= max_bytes
+    # 途中で切れたマルチバイト文字は捨てる
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    text = decoder.decode(data[:max_bytes], final=complete)
+    return text, complete
+
+
+class ContentCache:
+    """本文のLRUキャッシュ（(パス, 更新時刻)をキーとする）"""
+
+    def __init__(self, max_chars: int = DEFAULT_CACHE_CHARS):
+        """
+        キャッシュを初期化
+
+        Args:
+            max_chars: 保持する本文の合計文字数の上限
+        """
+        self.max_chars = max_chars
+        self._entries = OrderedDict()
+        self._total_chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, file_path) -> str:
+        """
+        本文を取得（キャッシュにない場合は読み込み）
+
+        Args:
+            file_path: ファイルパス
+
+        Returns:
+            ファイル内容（前後の空白を除去）
+
+        Raises:
+            OSError: ファイル読み込みに失敗した場合
+        """
+        path = str(file_path)
+        key = (path, os.stat(path).st_mtime_ns)
+
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+                return content
+
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = content
+                self._total_chars += len(content)
+                self._evict()
+        return content
+
+    def invalidate(self, file_path):
+        """
+        指定ファイルのキャッシュを破棄
+
+        Args:
+            file_path: ファイルパス
+        """
+        path = str(file_path)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == path]:
+                self._total_chars -= len(self._entries.pop(key))
+
+    def clear(self):
+        """キャッシュを全て破棄"""
+        with self._lock:
+            self._entries.clear()
+            self._total_chars = 0
+
+    def _evict(self):
+        """上限を超えた分を古い順に破棄"""
+        while self._total_chars > self.max_chars and len(self._entries) > 1:
+            _key, content = self._entries.popitem(last=False)
+            self._total_chars -= len(content)
+
+
+_content_cache = ContentCache()
+
+
+def get_content_cache() -> ContentCache:
+    """
+    共有の本文キャッシュを取得
+
+    Returns:
+        ContentCacheインスタンス
+    """
+    return _content_cache
+
+
+class FileRecord:
+    """一覧表示用のファイルレコード（本文は遅延読み込み）"""
+
+    ERROR_PREFIX = '[読み込みエラー:'
+
+    def __init__(self, file_path, preview_length: int = 80):
+        """
+        先頭部分だけを読み込んでレコードを作成
+
+        Args:
+            file_path: ファイルパス
+            preview_length: プレビュー表示文字数
+        """
+        self.path = Path(file_path)
+        self.name = self.path.name
+
+        # UTF-8は1文字最大4バイト（先頭の空白分も考慮して余裕を持たせる）
+        try:
+            head, complete = read_head(self.path, preview_length * 4 + 64)
+            head = head.strip() if complete else head.lstrip()
+            self.error: Optional[str] = None
+            self.preview = head[:preview_length]
+            self.truncated = not complete or len(head) > preview_length
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error processing {self.path}: {e}")
+            self.error = f"{self.ERROR_PREFIX} {str(e)}]"
+            self.preview = self.error
+            self.truncated = False
+
+    @property
+    def content(self) -> str:
+        """本文（必要になった時点でキャッシュ経由で読み込み）"""
+        try:
+            return get_content_cache().get(self.path)
+        except (OSError, UnicodeDecodeError) as e:
+            return f"{self.ERROR_PREFIX} {str(e)}]"
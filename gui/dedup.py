@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+投稿の類似検出（MinHash + LSH）
+
+本文を文字 n-gram（シングル）に分けて MinHash の署名を作る。単語分割が要らないため日本語でもそのまま使える。
+署名は内容ハッシュ単位でキャッシュし、帯（band）ごとの値を LSH のバケットとしてSQLiteに保存する。
+検索はバケットが一致した候補だけ署名を比べるため、履歴の件数が増えても比較の件数はほとんど増えない。
+"""
+
+import hashlib
+import re
+import sqlite3
+import unicodedata
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .queue_index import DEFAULT_DB_PATH, QueueIndex, is_queue_file
+from .tweet_length import extract_urls
+
+
+# 署名の形式のバージョン（正規化・シングル・ハッシュを変えたら上げてキャッシュを無効化）
+DEDUP_VERSION = 1
+
+# シングルの文字数
+SHINGLE_SIZE = 3
+
+# 署名の長さ（ハッシュ関数の数）
+NUM_PERM = 64
+
+# LSH の帯の数（1帯あたり NUM_PERM // BANDS 個。類似度が約 0.5 以上でバケットが一致しやすい）
+BANDS = 16
+
+# 類似とみなす推定Jaccard係数の既定値
+DEFAULT_THRESHOLD = 0.7
+
+# この件数未満はプロセスプールを使わずに署名を計算
+_PARALLEL_THRESHOLD = 64
+
+_ROW_BYTES = NUM_PERM // BANDS * 4
+
+# 正規化で取り除く空白
+_WHITESPACE = re.compile(r'\s+')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_signatures (
+    version   INTEGER NOT NULL,
+    hash      TEXT    NOT NULL,
+    signature BLOB,
+    PRIMARY KEY (version, hash)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS dedup_buckets (
+    version INTEGER NOT NULL,
+    band    INTEGER NOT NULL,
+    bucket  BLOB    NOT NULL,
+    hash    TEXT    NOT NULL,
+    PRIMARY KEY (version, band, bucket, hash)
+) WITHOUT ROWID;
+"""
+
+
+def normalize(text: str) -> str:
+    """
+    比較用に本文を正規化
+
+    全角・半角を揃え（NFKC）、小文字にし、URLと空白を除く。
+    URLは共通のブログURLが多く、本文が違っても類似度を押し上げるため比較に含めない。
+
+    Args:
+        text: 投稿本文
+
+    Returns:
+        正規化した本文
+    """
+    for url in extract_urls(text):
+        text = text.replace(url, ' ')
+    return _WHITESPACE.sub('', unicodedata.normalize('NFKC', text).lower())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """
+    正規化した本文を文字 n-gram に分割
+
+    Args:
+        text: 投稿本文
+        size: n-gram の文字数
+
+    Returns:
+        シングルの集合（size 文字以下の本文は本文全体の1個、空の場合は空集合）
+    """
+    text = normalize(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash(text: str) -> Optional[bytes]:
+    """
+    本文の MinHash 署名を計算
+
+    シングルごとに SHAKE128 で NUM_PERM 個の32ビット値を出し、位置ごとの最小値を署名とする。
+
+    Args:
+        text: 投稿本文
+
+    Returns:
+        署名（32ビット値 NUM_PERM 個のバイト列、比較できる文字がない場合None）
+    """
+    grams = shingles(text)
+    if not grams:
+        return None
+    values = array('I', b''.join(
+        hashlib.shake_128(gram.encode('utf-8')).digest(NUM_PERM * 4) for gram in grams
+    ))
+    return array('I', [min(values[i::NUM_PERM]) for i in range(NUM_PERM)]).tobytes()
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """
+    2つの署名から Jaccard 係数を推定
+
+    Args:
+        a: 署名
+        b: 署名
+
+    Returns:
+        一致した位置の割合（0.0〜1.0）
+    """
+    return sum(x == y for x, y in zip(array('I', a), array('I', b))) / NUM_PERM
+
+
+def _buckets(signature: bytes) -> List[bytes]:
+    """署名を帯ごとのバケットキーに分割"""
+    return [signature[i * _ROW_BYTES:(i + 1) * _ROW_BYTES] for i in range(BANDS)]
+
+
+def _signature_worker(file_path: str) -> Optional[bytes]:
+    """プロセスプール用のラッパー（読めないファイルはNone）"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return minhash(f.read())
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+class NearDuplicate:
+    """類似した投稿1件"""
+
+    def __init__(self, folder: Path, name: str, similarity: float):
+        """
+        類似した投稿を作成
+
+        Args:
+            folder: 類似した投稿のフォルダ
+            name: 類似した投稿のファイル名
+            similarity: 推定Jaccard係数
+        """
+        self.folder = folder
+        self.name = name
+        self.similarity = similarity
+
+    def __repr__(self):
+        return f"NearDuplicate({str(self.folder)!r}, {self.name!r}, {self.similarity:.2f})"
+
+
+class DedupIndex:
+    """MinHash 署名と LSH バケットのSQLiteインデックス（内容ハッシュ単位）"""
+
+    def __init__(self, db_path=None):
+        """
+        インデックスを初期化
+
+        Args:
+            db_path: インデックスDBのパス（Noneの場合はキューインデックスと同じDB）
+        """
+        self.db_path = Path(db_path) if db_path else Path.cwd() / DEFAULT_DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def missing(self, hashes: Iterable[str]) -> List[str]:
+        """
+        署名が未登録の内容ハッシュを取得
+
+        Args:
+            hashes: 内容ハッシュ
+
+        Returns:
+            未登録の内容ハッシュのリスト（重複なし・昇順）
+        """
+        known = {row[0] for row in self._conn.execute(
+            'SELECT hash FROM dedup_signatures WHERE version = ?', (DEDUP_VERSION,)
+        )}
+        return sorted(set(hashes) - known)
+
+    def add(self, signatures: Dict[str, Optional[bytes]]):
+        """
+        署名とバケットを登録
+
+        Args:
+            signatures: {内容ハッシュ: 署名} の辞書（署名がNoneの内容は比較対象外として記録）
+        """
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO dedup_signatures (version, hash, signature) VALUES (?, ?, ?)',
+                [(DEDUP_VERSION, digest, signature) for digest, signature in signatures.items()]
+            )
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO dedup_buckets (version, band, bucket, hash) VALUES (?, ?, ?, ?)',
+                [
+                    (DEDUP_VERSION, band, bucket, digest)
+                    for digest, signature in signatures.items() if signature
+                    for band, bucket in enumerate(_buckets(signature))
+                ]
+            )
+
+    def signatures(self, hashes: Sequence[str]) -> Dict[str, bytes]:
+        """
+        登録済みの署名を取得
+
+        Args:
+            hashes: 内容ハッシュのリスト
+
+        Returns:
+            {内容ハッシュ: 署名} の辞書（署名がないものは含まない）
+        """
+        found = {}
+        unique = list(set(hashes))
+        # SQLiteのパラメータ数上限を考慮して分割
+        for i in range(0, len(unique), 500):
+            chunk = unique[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for digest, signature in self._conn.execute(
+                f'SELECT hash, signature FROM dedup_signatures '
+                f'WHERE version = ? AND hash IN ({placeholders}) AND signature IS NOT NULL',
+                [DEDUP_VERSION] + chunk
+            ):
+                found[digest] = signature
+        return found
+
+    def candidates(self, signature: bytes) -> Set[str]:
+        """
+        バケットが1つ以上一致する内容ハッシュを取得
+
+        Args:
+            signature: 署名
+
+        Returns:
+            候補の内容ハッシュの集合（削除済みファイルの内容を含みうる）
+        """
+        found = set()
+        for band, bucket in enumerate(_buckets(signature)):
+            found.update(row[0] for row in self._conn.execute(
+                'SELECT hash FROM dedup_buckets WHERE version = ? AND band = ? AND bucket = ?',
+                (DEDUP_VERSION, band, bucket)
+            ))
+        return found
+
+    def close(self):
+        """DB接続を閉じる"""
+        self._conn.close()
+
+
+def find_near_duplicates(
+    folder,
+    names: Optional[List[str]] = None,
+    corpus_folders: Sequence[Tuple[Path, Callable[[str], bool]]] = (),
+    db_path=None,
+    threshold: float = DEFAULT_THRESHOLD,
+    max_workers: Optional[int] = None
+) -> Dict[str, List[NearDuplicate]]:
+    """
+    フォルダ内の投稿ファイルに類似する投稿を検索
+
+    対象フォルダ自身と corpus_folders（sns/・sns/posted/ など）の全ファイルを比較対象とする。
+    投稿済みのファイルは名前に "posted" を含むため、sns/posted/ には is_posted_file を指定する。
+    署名は新規・変更ファイルの分だけ計算し直す。
+
+    Args:
+        folder: 対象フォルダ（sns/draft/ など）
+        names: 対象ファイル名（Noneの場合はフォルダ内の全投稿ファイル）
+        corpus_folders: 比較対象の [(フォルダ, ファイル名の判定), ...]
+        db_path: インデックスDBのパス（Noneの場合はデフォルト）
+        threshold: 類似とみなす推定Jaccard係数
+        max_workers: プロセス数（Noneの場合はCPU数）
+
+    Returns:
+        {ファイル名: 類似度の高い順の NearDuplicate のリスト} の辞書（類似する投稿があるファイルのみ）
+    """
+    folder = Path(folder)
+    sources = [(folder, is_queue_file)] + [
+        (Path(f), match) for f, match in corpus_folders if Path(f).resolve() != folder.resolve()
+    ]
+    folders = [target for target, _match in sources]
+
+    # 変更のあったファイルだけハッシュを再計算
+    hashes_by_folder = []
+    for target, match in sources:
+        index = QueueIndex(target, db_path, match)
+        try:
+            index.sync()
+            hashes_by_folder.append(index.hashes())
+        finally:
+            index.close()
+
+    locations = {}
+    for target, hashes in zip(folders, hashes_by_folder):
+        for name, digest in hashes.items():
+            locations.setdefault(digest, []).append((target, name))
+
+    targets = hashes_by_folder[0]
+    if names is not None:
+        targets = {name: targets[name] for name in names if name in targets}
+
+    dedup = DedupIndex(db_path)
+    try:
+        # 同じ内容のファイルは1回だけ計算
+        digests = dedup.missing(locations)
+        tasks = [str(locations[digest][0][0] / locations[digest][0][1]) for digest in digests]
+        if len(tasks) >= _PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_signature_worker, tasks, chunksize=64))
+        else:
+            results = [_signature_worker(task) for task in tasks]
+        if digests:
+            dedup.add(dict(zip(digests, results)))
+
+        signatures = dedup.signatures(list(targets.values()))
+        report = {}
+        for name, digest in targets.items():
+            signature = signatures.get(digest)
+            if signature is None:
+                continue
+
+            candidates = dedup.candidates(signature)
+            candidate_signatures = dedup.signatures([c for c in candidates if c in locations])
+            matches = []
+            for candidate, other in candidate_signatures.items():
+                score = 1.0 if candidate == digest else similarity(signature, other)
+                if score < threshold:
+                    continue
+                matches.extend(
+                    NearDuplicate(match_folder, match_name, score)
+                    for match_folder, match_name in locations[candidate]
+                    if (match_folder, match_name) != (folder, name)
+                )
+            if matches:
+                matches.sort(key=lambda m: (-m.similarity, str(m.folder), m.name))
+                report[name] = matches
+    finally:
+        dedup.close()
+    return report
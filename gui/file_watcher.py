@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+フォルダ監視機能
+
+sns/・sns/draft/・sns/posted/ のファイル作成・削除・リネームを検知し、
+変更分だけをコールバックに通知する。Linux では inotify、それ以外ではポーリングを使用。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# イベント種別
+CREATED = 'created'
+DELETED = 'deleted'
+MODIFIED = 'modified'
+
+# (種別, フォルダ, ファイル名)
+FileEvent = Tuple[str, Path, str]
+
+# inotify 定数（<sys/inotify.h>）
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_EVENT_HEADER = struct.Struct('iIII')
+
+_WATCH_MASK = _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CLOSE_WRITE
+
+
+def _load_libc():
+    """inotify が使える libc を読み込み（使えない場合None）"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """フォルダ監視クラス（バックグラウンドスレッドで動作）"""
+
+    def __init__(
+        self,
+        folders: List,
+        callback: Callable[[List[FileEvent]], None],
+        poll_interval: float = 1.0,
+        suffix: str = '.txt'
+    ):
+        """
+        フォルダ監視を初期化
+
+        Args:
+            folders: 監視対象フォルダのリスト
+            callback: イベント通知コールバック（監視スレッドから呼ばれる）
+            poll_interval: ポーリング間隔（秒）、inotify では停止確認の間隔
+            suffix: 対象ファイルの拡張子
+        """
+        self.folders = [Path(folder) for folder in folders]
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.suffix = suffix
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.backend = 'inotify' if _load_libc() else 'polling'
+
+    def start(self):
+        """監視を開始"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        target = self._run_inotify if self.backend == 'inotify' else self._run_polling
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """監視を停止"""
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.poll_interval * 2)
+        self._thread = None
+
+    def _emit(self, events: List[FileEvent]):
+        """イベントをまとめて通知"""
+        if events and not self._stop_event.is_set():
+            try:
+                self.callback(events)
+            except Exception as e:
+                print(f"フォルダ監視コールバックエラー: {e}", file=sys.stderr)
+
+    def _snapshot(self, folder: Path) -> Dict[str, int]:
+        """フォルダ内の対象ファイル名と更新時刻を取得"""
+        names = {}
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self.suffix):
+                        try:
+                            if entry.is_file():
+                                names[entry.name] = entry.stat().st_mtime_ns
+                        except OSError:
+                            continue
+        except OSError:
+            pass
+        return names
+
+    def _run_polling(self):
+        """ポーリングによる監視（inotify が使えない環境向け）"""
+        snapshots = {folder: self._snapshot(folder) for folder in self.folders}
+
+        while not self._stop_event.wait(self.poll_interval):
+            events = []
+            for folder in self.folders:
+                previous = snapshots[folder]
+                current = self._snapshot(folder)
+
+                for name in previous.keys() - current.keys():
+                    events.append((DELETED, folder, name))
+                for name, mtime_ns in current.items():
+                    if name not in previous:
+                        events.append((CREATED, folder, name))
+                    elif previous[name] != mtime_ns:
+                        events.append((MODIFIED, folder, name))
+
+                snapshots[folder] = current
+            self._emit(events)
+
+    def _run_inotify(self):
+        """inotify による監視"""
+        libc = _load_libc()
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            self._run_polling()
+            return
+
+        watches = {}
+        try:
+            for folder in self.folders:
+                folder.mkdir(parents=True, exist_ok=True)
+                wd = libc.inotify_add_watch(fd, os.fsencode(str(folder)), _WATCH_MASK)
+                if wd >= 0:
+                    watches[wd] = folder
+
+            if not watches:
+                self._run_polling()
+                return
+
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([fd], [], [], self.poll_interval)
+                if not readable:
+                    continue
+                try:
+                    buffer = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                self._emit(self._parse_inotify(buffer, watches))
+        finally:
+            os.close(fd)
+
+    def _parse_inotify(self, buffer: bytes, watches: Dict[int, Path]) -> List[FileEvent]:
+        """inotify イベントバッファを解析"""
+        events = []
+        offset = 0
+        while offset + _IN_EVENT_HEADER.size <= len(buffer):
+            wd, mask, _cookie, length = _IN_EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _IN_EVENT_HEADER.size
+            raw_name = buffer[offset:offset + length].rstrip(b'\0')
+            offset += length
+
+            folder = watches.get(wd)
+            name = os.fsdecode(raw_name)
+            if folder is None or not name.endswith(self.suffix):
+                continue
+
+            # リネームは「元の名前の削除」と「新しい名前の作成」として扱う
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                events.append((CREATED, folder, name))
+            elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                events.append((DELETED, folder, name))
+            elif mask & (_IN_CLOSE_WRITE | _IN_MODIFY):
+                events.append((MODIFIED, folder, name))
+        return events
@@ -6,10 +6,14 @@ Git操作管理機能
 """
 
 import subprocess
-import threading
 from pathlib import Path
 from typing import Callable, Optional
 
+from .git_queue import GitJob, GitJobQueue
+from .git_remote import DEFAULT_POLL_INTERVAL, RemotePoller
+from .process_runner import run_process
+from .git_status import GitStatusService
+
 
 class GitManager:
     """Git操作管理クラス"""
@@ -22,6 +26,15 @@ class GitManager:
             work_dir: 作業ディレクトリ（Noneの場合は現在のディレクトリ）
         """
         self.work_dir = Path(work_dir) if work_dir else Path.cwd()
+        self.status_service = GitStatusService(self.work_dir)
+        # Git操作は1つのキューで順番に実行（終了ごとに状態キャッシュを破棄）
+        self.job_queue = GitJobQueue(
+            self.work_dir,
+            message_builder=self.generate_commit_message,
+            on_job_finished=self.status_service.invalidate
+        )
+        # リモート変更の確認（ls-remote で変化があった場合のみ fetch）
+        self.remote_poller = RemotePoller(self.work_dir, self.status_service)
         
     def check_git_status(self) -> bool:
         """
@@ -30,63 +43,19 @@ class GitManager:
         Returns:
             Git管理下の場合True
         """
-        try:
-            result = subprocess.run(
-                ['git', 'status'],
-                cwd=self.work_dir,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+        return self.status_service.git_dir is not None
     
     def get_git_status(self) -> dict:
         """
-        Git状態の詳細取得
+        Git状態の詳細取得（変更があるまでキャッシュを返す）
         
         Returns:
             Git状態情報の辞書
         """
         try:
-            # git status --porcelain
-            status_result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                cwd=self.work_dir,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if status_result.returncode != 0:
-                return {'error': 'Git status取得失敗'}
-            
-            # 変更ファイルを解析
-            changes = []
-            for line in status_result.stdout.strip().split('\n'):
-                if line.strip():
-                    status_code = line[:2]
-                    file_path = line[3:]
-                    changes.append({'status': status_code, 'file': file_path})
-            
-            # ブランチ情報取得
-            branch_result = subprocess.run(
-                ['git', 'branch', '--show-current'],
-                cwd=self.work_dir,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            current_branch = branch_result.stdout.strip() if branch_result.returncode == 0 else 'unknown'
-            
-            return {
-                'has_changes': len(changes) > 0,
-                'changes': changes,
-                'current_branch': current_branch
-            }
-            
+            return self.status_service.status().to_dict()
+        except subprocess.TimeoutExpired:
+            return {'error': 'Git status取得がタイムアウトしました'}
         except Exception as e:
             return {'error': str(e)}
     
@@ -96,80 +65,22 @@ class GitManager:
         commit_message: str,
         progress_callback: Optional[Callable[[str], None]] = None,
         completion_callback: Optional[Callable[[bool, str], None]] = None
-    ):
+    ) -> GitJob:
         """
         ファイルをコミット・プッシュ（バックグラウンド実行）
+
+        開始前のコミットがあれば1つにまとめ、まとめて1回だけプッシュする。
         
         Args:
             file_paths: コミット対象ファイルのパス一覧
             commit_message: コミットメッセージ
             progress_callback: 進行状況コールバック
             completion_callback: 完了コールバック(成功フラグ, メッセージ)
+
+        Returns:
+            キャンセル用のジョブ（job_queue.cancel に渡す）
         """
-        def execute():
-            try:
-                if progress_callback:
-                    progress_callback("Git操作を開始...")
-                
-                # git add
-                if progress_callback:
-                    progress_callback("ファイルをステージング中...")
-                    
-                add_cmd = ['git', 'add'] + file_paths
-                add_result = subprocess.run(
-                    add_cmd,
-                    cwd=self.work_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                if add_result.returncode != 0:
-                    raise Exception(f"git add失敗: {add_result.stderr}")
-                
-                # git commit
-                if progress_callback:
-                    progress_callback("コミット中...")
-                    
-                commit_result = subprocess.run(
-                    ['git', 'commit', '-m', commit_message],
-                    cwd=self.work_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                if commit_result.returncode != 0:
-                    raise Exception(f"git commit失敗: {commit_result.stderr}")
-                
-                # git push
-                if progress_callback:
-                    progress_callback("GitHubにプッシュ中...")
-                    
-                push_result = subprocess.run(
-                    ['git', 'push'],
-                    cwd=self.work_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-                
-                if push_result.returncode != 0:
-                    raise Exception(f"git push失敗: {push_result.stderr}")
-                
-                if completion_callback:
-                    completion_callback(True, "GitHubへの反映が完了しました")
-                    
-            except subprocess.TimeoutExpired:
-                if completion_callback:
-                    completion_callback(False, "Git操作がタイムアウトしました")
-            except Exception as e:
-                if completion_callback:
-                    completion_callback(False, f"Git操作エラー: {str(e)}")
-        
-        # バックグラウンドで実行
-        thread = threading.Thread(target=execute, daemon=True)
-        thread.start()
+        return self.job_queue.submit_commit(file_paths, commit_message, progress_callback, completion_callback)
     
     def generate_commit_message(self, file_paths: list) -> str:
         """
@@ -199,125 +110,60 @@ class GitManager:
     def pull_from_remote(
         self,
         progress_callback: Optional[Callable[[str], None]] = None,
-        completion_callback: Optional[Callable[[bool, str], None]] = None
-    ):
+        completion_callback: Optional[Callable[[bool, str], None]] = None,
+        require_repository: bool = False
+    ) -> GitJob:
         """
-        リモートからpullを実行（バックグラウンド実行）
+        リモートからpullを実行（バックグラウンド実行、開始前のpullとは重複させない）
 
         Args:
             progress_callback: 進行状況コールバック
             completion_callback: 完了コールバック(成功フラグ, メッセージ)
-        """
-        def execute():
-            try:
-                if progress_callback:
-                    progress_callback("最新情報を取得中...")
-
-                # git pull
-                pull_result = subprocess.run(
-                    ['git', 'pull'],
-                    cwd=self.work_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-
-                if pull_result.returncode != 0:
-                    # マージ競合の可能性をチェック
-                    if "CONFLICT" in pull_result.stdout or "CONFLICT" in pull_result.stderr:
-                        raise Exception(f"マージ競合が発生しました。手動で解決してください。")
-                    else:
-                        raise Exception(f"git pull失敗: {pull_result.stderr}")
+            require_repository: Trueの場合、Gitが使えない・リポジトリでなければ何もせず
+                job.skipped をTrueにして完了する（確認はワーカースレッドで行う）
 
-                # 結果解析
-                output = pull_result.stdout.strip()
-                if "Already up to date" in output:
-                    message = "既に最新状態です"
-                elif "Fast-forward" in output or "Merge made" in output:
-                    message = "最新情報を取得しました"
-                else:
-                    message = "同期が完了しました"
-
-                if completion_callback:
-                    completion_callback(True, message)
-
-            except subprocess.TimeoutExpired:
-                if completion_callback:
-                    completion_callback(False, "Git pullがタイムアウトしました")
-            except Exception as e:
-                if completion_callback:
-                    completion_callback(False, f"Git pullエラー: {str(e)}")
-
-        # バックグラウンドで実行
-        thread = threading.Thread(target=execute, daemon=True)
-        thread.start()
+        Returns:
+            キャンセル用のジョブ（job_queue.cancel に渡す）
+        """
+        precondition = None
+        if require_repository:
+            precondition = lambda: self.is_git_available() and self.check_git_status()
+        return self.job_queue.submit_pull(progress_callback, completion_callback, precondition)
 
     def check_remote_changes(self) -> dict:
         """
-        リモートの変更をチェック
+        リモートの変更をチェック（リモートのコミットIDが変わった場合のみ fetch）
 
         Returns:
             {
                 'has_changes': bool,  # リモートに変更あり
                 'behind_count': int,  # ローカルが遅れているコミット数
                 'ahead_count': int,   # ローカルが進んでいるコミット数
+                'fetched': bool,      # 今回 fetch を実行した場合True
                 'error': str         # エラーメッセージ
             }
         """
-        try:
-            # git fetch
-            fetch_result = subprocess.run(
-                ['git', 'fetch'],
-                cwd=self.work_dir,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if fetch_result.returncode != 0:
-                return {'error': f'git fetch失敗: {fetch_result.stderr}'}
-
-            # リモートとの差分をチェック
-            status_result = subprocess.run(
-                ['git', 'status', '-b', '--porcelain'],
-                cwd=self.work_dir,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if status_result.returncode != 0:
-                return {'error': 'git status取得失敗'}
+        return self.remote_poller.check()
 
-            # 第一行からブランチ情報を解析
-            lines = status_result.stdout.strip().split('\n')
-            if not lines:
-                return {'has_changes': False, 'behind_count': 0, 'ahead_count': 0}
-
-            branch_line = lines[0]
-            behind_count = 0
-            ahead_count = 0
-
-            # [behind N] または [ahead N] を検索
-            import re
-            behind_match = re.search(r'\[behind (\d+)\]', branch_line)
-            ahead_match = re.search(r'\[ahead (\d+)\]', branch_line)
+    def start_remote_polling(self, callback: Callable[[dict], None], interval: Optional[float] = None):
+        """
+        リモート変更のバックグラウンド確認を開始（失敗が続く場合は間隔を延ばす）
 
-            if behind_match:
-                behind_count = int(behind_match.group(1))
-            if ahead_match:
-                ahead_count = int(ahead_match.group(1))
+        Gitが使えない・リポジトリでない場合は何もしない（確認は確認スレッドで行う）。
 
-            return {
-                'has_changes': behind_count > 0,
-                'behind_count': behind_count,
-                'ahead_count': ahead_count
-            }
+        Args:
+            callback: 確認結果（check_remote_changes と同じ形式）を受け取る関数（確認スレッドから呼ばれる）
+            interval: 確認間隔（秒、Noneの場合はデフォルト）
+        """
+        self.remote_poller.start(
+            callback,
+            interval or DEFAULT_POLL_INTERVAL,
+            precondition=lambda: self.is_git_available() and self.check_git_status()
+        )
 
-        except subprocess.TimeoutExpired:
-            return {'error': 'Git操作がタイムアウトしました'}
-        except Exception as e:
-            return {'error': str(e)}
+    def stop_remote_polling(self):
+        """リモート変更のバックグラウンド確認を停止"""
+        self.remote_poller.stop()
 
     def is_git_available(self) -> bool:
         """
@@ -327,11 +173,6 @@ class GitManager:
             Git利用可能な場合True
         """
         try:
-            subprocess.run(
-                ['git', '--version'],
-                capture_output=True,
-                timeout=5
-            )
-            return True
+            return run_process(['git', '--version'], timeout=5).ok
         except Exception:
             return False
\ No newline at end of file
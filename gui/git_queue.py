@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+Git操作のジョブキュー
+
+Git操作を1つのワーカースレッドで順番に実行する（index.lock の競合を防ぐ）。
+開始前のコミットジョブは1つにまとめ、開始前のpullジョブは重複させない。
+実行中・待機中のジョブはキャンセルでき、各コマンドにはタイムアウトを設ける。
+"""
+
+import subprocess
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from .git_status import parse_name_status
+from .process_runner import ProcessResult, run_process
+
+
+# ジョブの種類
+COMMIT = 'commit'
+PULL = 'pull'
+
+# ジョブの状態
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+CANCELLED = 'cancelled'
+
+# コマンドごとのタイムアウト秒数
+ADD_TIMEOUT = 30
+COMMIT_TIMEOUT = 30
+PUSH_TIMEOUT = 60
+PULL_TIMEOUT = 60
+
+
+class JobCancelled(Exception):
+    """ジョブがキャンセルされた場合の例外"""
+    pass
+
+
+class GitJob:
+    """Git操作ジョブ（まとめられた依頼のコールバックを全て保持）"""
+
+    def __init__(self, kind: str, file_paths: Optional[List[str]] = None, commit_message: Optional[str] = None):
+        """
+        ジョブを作成
+
+        Args:
+            kind: COMMIT または PULL
+            file_paths: コミット対象ファイル（COMMIT のみ）
+            commit_message: コミットメッセージ（COMMIT のみ）
+        """
+        self.kind = kind
+        self.file_paths = list(file_paths or [])
+        self.commit_message = commit_message
+        self.state = PENDING
+        self.progress_callbacks: List[Callable[[str], None]] = []
+        self.completion_callbacks: List[Callable[[bool, str], None]] = []
+        self.cancel_event = threading.Event()
+        # pull で変わったファイル [(状態, パス), ...]（PULL のみ、差分を取得できない場合None）
+        self.changes: Optional[List[Tuple[str, str]]] = None
+        # pull 前後の HEAD（PULL のみ、取得できない場合None）
+        self.old_head: Optional[str] = None
+        self.new_head: Optional[str] = None
+        # 実行前にワーカースレッドで呼ぶ確認（Falseを返した場合は実行しない）
+        self.precondition: Optional[Callable[[], bool]] = None
+        # precondition により実行しなかった場合True
+        self.skipped = False
+
+    def add_callbacks(self, progress_callback=None, completion_callback=None):
+        """依頼元のコールバックを追加"""
+        if progress_callback:
+            self.progress_callbacks.append(progress_callback)
+        if completion_callback:
+            self.completion_callbacks.append(completion_callback)
+
+    def report(self, message: str):
+        """進行状況を全ての依頼元に通知"""
+        for callback in self.progress_callbacks:
+            callback(message)
+
+    def complete(self, success: bool, message: str):
+        """完了を全ての依頼元に通知"""
+        for callback in self.completion_callbacks:
+            callback(success, message)
+
+
+class GitJobQueue:
+    """Git操作のジョブキュー（ワーカー1つ）"""
+
+    def __init__(
+        self,
+        work_dir=None,
+        message_builder: Optional[Callable[[List[str]], str]] = None,
+        on_job_finished: Optional[Callable[[], None]] = None
+    ):
+        """
+        ジョブキューを初期化
+
+        Args:
+            work_dir: 作業ディレクトリ（Noneの場合は現在のディレクトリ）
+            message_builder: まとめたコミットのメッセージ生成関数（対象ファイル一覧を受け取る）
+            on_job_finished: ジョブ終了ごとに呼ぶ関数（Git状態キャッシュの破棄など）
+        """
+        self.work_dir = Path(work_dir) if work_dir else Path.cwd()
+        self.message_builder = message_builder
+        self.on_job_finished = on_job_finished
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit_commit(
+        self,
+        file_paths: List[str],
+        commit_message: str,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        completion_callback: Optional[Callable[[bool, str], None]] = None
+    ) -> GitJob:
+        """
+        コミット・プッシュを依頼（開始前のコミットがあればまとめる）
+
+        Args:
+            file_paths: コミット対象ファイルのパス一覧
+            commit_message: コミットメッセージ
+            progress_callback: 進行状況コールバック
+            completion_callback: 完了コールバック(成功フラグ, メッセージ)
+
+        Returns:
+            依頼をまとめた先のジョブ
+        """
+        with self._condition:
+            job = next((j for j in self._pending if j.kind == COMMIT), None)
+            if job is None:
+                job = GitJob(COMMIT, file_paths, commit_message)
+                self._pending.append(job)
+            else:
+                job.file_paths += [path for path in file_paths if path not in job.file_paths]
+                if commit_message != job.commit_message:
+                    job.commit_message = (
+                        self.message_builder(job.file_paths) if self.message_builder else commit_message
+                    )
+            job.add_callbacks(progress_callback, completion_callback)
+            self._ensure_worker()
+            self._condition.notify()
+        return job
+
+    def submit_pull(
+        self,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        completion_callback: Optional[Callable[[bool, str], None]] = None,
+        precondition: Optional[Callable[[], bool]] = None
+    ) -> GitJob:
+        """
+        pullを依頼（開始前のpullがあればそれに相乗り）
+
+        Args:
+            progress_callback: 進行状況コールバック
+            completion_callback: 完了コールバック(成功フラグ, メッセージ)
+            precondition: 実行前にワーカースレッドで呼ぶ確認（Falseを返した場合は実行せず job.skipped をTrueにする、
+                開始前のpullに相乗りした場合は使わない）
+
+        Returns:
+            依頼をまとめた先のジョブ
+        """
+        with self._condition:
+            job = next((j for j in self._pending if j.kind == PULL), None)
+            if job is None:
+                job = GitJob(PULL)
+                job.precondition = precondition
+                self._pending.append(job)
+            job.add_callbacks(progress_callback, completion_callback)
+            self._ensure_worker()
+            self._condition.notify()
+        return job
+
+    def cancel(self, job: GitJob) -> bool:
+        """
+        ジョブをキャンセル（実行中の場合は実行中のコマンドを停止）
+
+        Args:
+            job: 対象ジョブ
+
+        Returns:
+            キャンセルできた場合True（終了済みの場合False）
+        """
+        with self._condition:
+            if job.state == RUNNING:
+                # 実行中のコマンドは run_process が停止する
+                job.cancel_event.set()
+                return True
+            if job.state != PENDING:
+                return False
+            self._pending.remove(job)
+            job.state = CANCELLED
+
+        job.complete(False, "Git操作をキャンセルしました")
+        return True
+
+    def pending_count(self) -> int:
+        """
+        待機中のジョブ数を取得
+
+        Returns:
+            開始前のジョブ数
+        """
+        with self._condition:
+            return len(self._pending)
+
+    def _ensure_worker(self):
+        """ワーカースレッドを起動（_condition を保持した状態で呼ぶ）"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._work, daemon=True)
+            self._worker.start()
+
+    def _work(self):
+        """ワーカースレッド本体"""
+        while True:
+            with self._condition:
+                while not self._pending:
+                    # 一定時間依頼がなければスレッドを終了（次の依頼で再起動）
+                    if not self._condition.wait(timeout=30):
+                        if not self._pending:
+                            self._worker = None
+                            return
+                job = self._pending.popleft()
+                job.state = RUNNING
+
+            try:
+                if job.precondition is not None and not job.precondition():
+                    job.skipped = True
+                    success, message = True, "Gitが利用できないため同期をスキップしました"
+                elif job.kind == COMMIT:
+                    success, message = self._execute_commit(job)
+                else:
+                    success, message = self._execute_pull(job)
+            except JobCancelled:
+                success, message = False, "Git操作をキャンセルしました"
+            except subprocess.TimeoutExpired:
+                label = "Git pull" if job.kind == PULL else "Git操作"
+                success, message = False, f"{label}がタイムアウトしました"
+            except Exception as e:
+                label = "Git pull" if job.kind == PULL else "Git操作"
+                success, message = False, f"{label}エラー: {str(e)}"
+
+            with self._condition:
+                job.state = CANCELLED if job.cancel_event.is_set() else DONE
+
+            if self.on_job_finished:
+                self.on_job_finished()
+            job.complete(success, message)
+
+    def _run(self, job: GitJob, args: List[str], timeout: float) -> ProcessResult:
+        """
+        Gitコマンドを実行（キャンセル・タイムアウト時はプロセスを停止）
+
+        Raises:
+            JobCancelled: キャンセルされた場合
+            subprocess.TimeoutExpired: タイムアウトした場合
+        """
+        if job.cancel_event.is_set():
+            raise JobCancelled()
+
+        result = run_process(args, cwd=self.work_dir, timeout=timeout, cancel_event=job.cancel_event)
+        if result.cancelled:
+            raise JobCancelled()
+        if result.timed_out:
+            raise subprocess.TimeoutExpired(args, timeout)
+        return result
+
+    def _execute_commit(self, job: GitJob):
+        """add・commit・push を実行"""
+        job.report("Git操作を開始...")
+
+        # git add
+        job.report("ファイルをステージング中...")
+        add_result = self._run(job, ['git', 'add'] + job.file_paths, ADD_TIMEOUT)
+        if add_result.returncode != 0:
+            raise Exception(f"git add失敗: {add_result.stderr}")
+
+        # git commit（まとめた結果、内容が変わっていない場合はコミットせずにプッシュのみ）
+        diff_result = self._run(job, ['git', 'diff', '--cached', '--quiet', '--'] + job.file_paths, COMMIT_TIMEOUT)
+        if diff_result.returncode != 0:
+            job.report("コミット中...")
+            commit_result = self._run(job, ['git', 'commit', '-m', job.commit_message], COMMIT_TIMEOUT)
+            if commit_result.returncode != 0:
+                raise Exception(f"git commit失敗: {commit_result.stderr}")
+
+        # git push
+        job.report("GitHubにプッシュ中...")
+        push_result = self._run(job, ['git', 'push'], PUSH_TIMEOUT)
+        if push_result.returncode != 0:
+            raise Exception(f"git push失敗: {push_result.stderr}")
+
+        return True, "GitHubへの反映が完了しました"
+
+    def _head(self, job: GitJob) -> Optional[str]:
+        """HEAD のコミットIDを取得（初回コミット前はNone）"""
+        result = self._run(job, ['git', 'rev-parse', '--verify', '--quiet', 'HEAD'], ADD_TIMEOUT)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def _execute_pull(self, job: GitJob):
+        """pull を実行（前後の HEAD の差分を job.changes に記録）"""
+        job.report("最新情報を取得中...")
+
+        job.old_head = self._head(job)
+        pull_result = self._run(job, ['git', 'pull'], PULL_TIMEOUT)
+
+        if pull_result.returncode != 0:
+            # マージ競合の可能性をチェック
+            if "CONFLICT" in pull_result.stdout or "CONFLICT" in pull_result.stderr:
+                raise Exception("マージ競合が発生しました。手動で解決してください。")
+            raise Exception(f"git pull失敗: {pull_result.stderr}")
+
+        # 取り込んだ範囲で変わったファイル（画面は全件を読み直さずにこれだけ反映する）
+        job.new_head = self._head(job)
+        if job.old_head and job.old_head == job.new_head:
+            job.changes = []
+        elif job.old_head and job.new_head:
+            diff_result = self._run(
+                job,
+                ['git', 'diff', '--name-status', '-z', job.old_head, job.new_head],
+                PULL_TIMEOUT
+            )
+            if diff_result.returncode == 0:
+                job.changes = parse_name_status(diff_result.stdout)
+
+        # 結果解析
+        output = pull_result.stdout.strip()
+        if "Already up to date" in output:
+            return True, "既に最新状態です"
+        if "Fast-forward" in output or "Merge made" in output:
+            return True, "最新情報を取得しました"
+        return True, "同期が完了しました"
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+リモート変更の検出
+
+追跡ブランチの最新コミットIDを git ls-remote で取得し、前回確認したIDと比べる。
+変わっていない場合は fetch せずにローカルの ahead/behind をそのまま使い、
+変わった場合だけ fetch する。バックグラウンドで一定間隔ごとに確認し、
+失敗が続く場合は間隔を倍々に延ばす。
+"""
+
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from .git_status import GitStatusService
+from .process_runner import ProcessResult, run_process
+
+
+# バックグラウンド確認の既定の間隔（秒）
+DEFAULT_POLL_INTERVAL = 300
+
+# 失敗時に延ばす間隔の上限（秒）
+MAX_BACKOFF_INTERVAL = 3600
+
+LS_REMOTE_TIMEOUT = 15
+FETCH_TIMEOUT = 30
+
+
+class RemotePoller:
+    """リモート変更の確認クラス"""
+
+    def __init__(self, work_dir=None, status_service: Optional[GitStatusService] = None):
+        """
+        リモート確認を初期化
+
+        Args:
+            work_dir: 作業ディレクトリ（Noneの場合は現在のディレクトリ）
+            status_service: Git状態の取得サービス（Noneの場合は新規作成）
+        """
+        self.work_dir = Path(work_dir) if work_dir else Path.cwd()
+        self.status_service = status_service or GitStatusService(self.work_dir)
+        self._lock = threading.Lock()
+        self._known_sha = {}  # {追跡ブランチ名: 最後に fetch したリモートのコミットID}
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def _git(self, args, timeout: float) -> ProcessResult:
+        """
+        Gitコマンドを実行
+
+        Raises:
+            subprocess.TimeoutExpired: タイムアウトした場合
+        """
+        result = run_process(['git'] + args, cwd=self.work_dir, timeout=timeout)
+        if result.timed_out:
+            raise subprocess.TimeoutExpired(result.args, timeout)
+        return result
+
+    def _local_sha(self, upstream: str) -> Optional[str]:
+        """ローカルの追跡ブランチのコミットIDを取得"""
+        result = self._git(['rev-parse', '--verify', '--quiet', f'refs/remotes/{upstream}'], 10)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def check(self) -> dict:
+        """
+        リモートの変更を確認（リモートのコミットIDが変わった場合のみ fetch）
+
+        Returns:
+            {
+                'has_changes': bool,  # リモートに変更あり
+                'behind_count': int,  # ローカルが遅れているコミット数
+                'ahead_count': int,   # ローカルが進んでいるコミット数
+                'fetched': bool,      # 今回 fetch を実行した場合True
+                'error': str         # エラーメッセージ（失敗時のみ）
+            }
+        """
+        with self._lock:
+            try:
+                status = self.status_service.status()
+                if not status.upstream:
+                    # 追跡ブランチがない場合は比較対象がない
+                    return {'has_changes': False, 'behind_count': 0, 'ahead_count': 0, 'fetched': False}
+
+                remote, _, branch = status.upstream.partition('/')
+                ls_result = self._git(['ls-remote', remote, f'refs/heads/{branch}'], LS_REMOTE_TIMEOUT)
+                if ls_result.returncode != 0:
+                    return {'error': f'git ls-remote失敗: {ls_result.stderr.strip()}'}
+                fields = ls_result.stdout.split()
+                remote_sha = fields[0] if fields else None
+
+                known_sha = self._known_sha.get(status.upstream)
+                if known_sha is None:
+                    known_sha = self._local_sha(status.upstream)
+
+                fetched = False
+                if remote_sha != known_sha:
+                    fetch_result = self._git(['fetch', remote], FETCH_TIMEOUT)
+                    if fetch_result.returncode != 0:
+                        return {'error': f'git fetch失敗: {fetch_result.stderr}'}
+                    fetched = True
+                    # 追跡ブランチの更新でキャッシュキーが変わるため、ahead/behind は取り直される
+                    status = self.status_service.status()
+
+                self._known_sha[status.upstream] = remote_sha
+                return {
+                    'has_changes': status.behind > 0,
+                    'behind_count': status.behind,
+                    'ahead_count': status.ahead,
+                    'fetched': fetched
+                }
+
+            except subprocess.TimeoutExpired:
+                return {'error': 'Git操作がタイムアウトしました'}
+            except Exception as e:
+                return {'error': str(e)}
+
+    def start(
+        self,
+        callback: Callable[[dict], None],
+        interval: float = DEFAULT_POLL_INTERVAL,
+        max_interval: float = MAX_BACKOFF_INTERVAL,
+        precondition: Optional[Callable[[], bool]] = None
+    ):
+        """
+        バックグラウンドでの定期確認を開始（既に動いている場合は再起動）
+
+        Args:
+            callback: 確認結果を受け取る関数（確認スレッドから呼ばれる）
+            interval: 確認間隔（秒）
+            max_interval: 失敗時に延ばす間隔の上限（秒）
+            precondition: 確認を始める前に確認スレッドで1回呼ぶ関数（Falseを返した場合は確認しない）
+        """
+        self.stop()
+        stop_event = threading.Event()
+        self._stop_event = stop_event
+
+        def run():
+            # Gitコマンドの有無などの確認も呼び出し元のスレッドを止めないよう確認スレッドで行う
+            if precondition is not None and not precondition():
+                return
+            failures = 0
+            while not stop_event.is_set():
+                result = self.check()
+                if stop_event.is_set():
+                    break
+                callback(result)
+
+                # 失敗が続く場合は間隔を倍々に延ばす
+                failures = failures + 1 if 'error' in result else 0
+                delay = min(interval * (2 ** failures), max(interval, max_interval))
+                stop_event.wait(delay)
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """定期確認を停止"""
+        self._stop_event.set()
+        self._thread = None
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Git状態の取得とキャッシュ
+
+git status --porcelain=v2 --branch -z を1回だけ実行し、ブランチ情報と変更ファイルを
+まとめて解析する。結果は .git/index・HEAD・ブランチ参照の更新時刻をキーにキャッシュし、
+これらが変わるまでは git を起動せずに返す。
+"""
+
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .process_runner import run_process
+
+
+# git status のタイムアウト秒数
+STATUS_TIMEOUT = 30
+
+# ステージしていない作業ツリーの変更は index の更新時刻に現れないため、この秒数で再取得
+DEFAULT_MAX_AGE = 60.0
+
+
+class GitStatusError(Exception):
+    """Git状態の取得に失敗した場合の例外"""
+    pass
+
+
+class StatusEntry:
+    """変更ファイル1件"""
+
+    def __init__(self, kind: str, xy: str, path: str, orig_path: Optional[str] = None):
+        """
+        変更ファイルを作成
+
+        Args:
+            kind: 'changed'・'renamed'・'unmerged'・'untracked'・'ignored' のいずれか
+            xy: ステージ・作業ツリーの状態（v2形式、変更なしは '.'）
+            path: ファイルパス（リポジトリルートからの相対パス）
+            orig_path: リネーム・コピー元のパス
+        """
+        self.kind = kind
+        self.xy = xy
+        self.path = path
+        self.orig_path = orig_path
+
+    @property
+    def status_code(self) -> str:
+        """従来の --porcelain 形式の2文字の状態コード"""
+        if self.kind == 'untracked':
+            return '??'
+        if self.kind == 'ignored':
+            return '!!'
+        return self.xy.replace('.', ' ')
+
+    def __repr__(self):
+        return f"StatusEntry({self.kind!r}, {self.xy!r}, {self.path!r}, {self.orig_path!r})"
+
+
+class GitStatus:
+    """git status の解析結果"""
+
+    def __init__(
+        self,
+        branch: Optional[str] = None,
+        oid: Optional[str] = None,
+        upstream: Optional[str] = None,
+        ahead: int = 0,
+        behind: int = 0,
+        entries: Optional[List[StatusEntry]] = None
+    ):
+        """
+        解析結果を作成
+
+        Args:
+            branch: 現在のブランチ名（detached HEAD の場合None）
+            oid: HEAD のコミットID（初回コミット前はNone）
+            upstream: 追跡ブランチ名（未設定の場合None）
+            ahead: ローカルが進んでいるコミット数
+            behind: ローカルが遅れているコミット数
+            entries: 変更ファイルのリスト
+        """
+        self.branch = branch
+        self.oid = oid
+        self.upstream = upstream
+        self.ahead = ahead
+        self.behind = behind
+        self.entries = entries or []
+
+    @property
+    def has_changes(self) -> bool:
+        """無視ファイル以外の変更がある場合True"""
+        return any(entry.kind != 'ignored' for entry in self.entries)
+
+    def to_dict(self) -> dict:
+        """
+        GitManager.get_git_status の従来形式に変換
+
+        Returns:
+            {'has_changes', 'changes': [{'status', 'file'}], 'current_branch'}
+        """
+        return {
+            'has_changes': self.has_changes,
+            'changes': [
+                {'status': entry.status_code, 'file': entry.path}
+                for entry in self.entries if entry.kind != 'ignored'
+            ],
+            'current_branch': self.branch or 'unknown'
+        }
+
+
+def _decode_path(raw: bytes) -> str:
+    """-z 出力のパスを文字列に変換（UTF-8以外のバイトも保持）"""
+    return raw.decode('utf-8', errors='surrogateescape')
+
+
+def parse_porcelain_v2(output: bytes) -> GitStatus:
+    """
+    git status --porcelain=v2 --branch -z の出力を解析
+
+    Args:
+        output: コマンドの標準出力（バイト列）
+
+    Returns:
+        GitStatus
+
+    Raises:
+        GitStatusError: 出力の形式が不正な場合
+    """
+    status = GitStatus()
+    records = output.split(b'\0')
+
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+
+        try:
+            if record.startswith(b'# '):
+                key, _, value = record[2:].decode('utf-8', errors='replace').partition(' ')
+                if key == 'branch.oid':
+                    status.oid = None if value == '(initial)' else value
+                elif key == 'branch.head':
+                    status.branch = None if value == '(detached)' else value
+                elif key == 'branch.upstream':
+                    status.upstream = value
+                elif key == 'branch.ab':
+                    ahead, behind = value.split()
+                    status.ahead = int(ahead.lstrip('+'))
+                    status.behind = int(behind.lstrip('-'))
+            elif record.startswith(b'1 '):
+                # 1 XY sub mH mI mW hH hI path
+                fields = record.split(b' ', 8)
+                status.entries.append(StatusEntry('changed', fields[1].decode('ascii'), _decode_path(fields[8])))
+            elif record.startswith(b'2 '):
+                # 2 XY sub mH mI mW hH hI Xscore path、続くレコードが元のパス
+                fields = record.split(b' ', 9)
+                orig_path = _decode_path(records[i])
+                i += 1
+                status.entries.append(
+                    StatusEntry('renamed', fields[1].decode('ascii'), _decode_path(fields[9]), orig_path)
+                )
+            elif record.startswith(b'u '):
+                # u XY sub m1 m2 m3 mW h1 h2 h3 path
+                fields = record.split(b' ', 10)
+                status.entries.append(StatusEntry('unmerged', fields[1].decode('ascii'), _decode_path(fields[10])))
+            elif record.startswith(b'? '):
+                status.entries.append(StatusEntry('untracked', '??', _decode_path(record[2:])))
+            elif record.startswith(b'! '):
+                status.entries.append(StatusEntry('ignored', '!!', _decode_path(record[2:])))
+        except (IndexError, ValueError) as e:
+            raise GitStatusError(f"git status の出力を解析できません: {record[:80]!r}") from e
+
+    return status
+
+
+def parse_name_status(output: str) -> List[Tuple[str, str]]:
+    """
+    git diff --name-status -z の出力を解析
+
+    Args:
+        output: コマンドの標準出力
+
+    Returns:
+        [(状態の1文字目 'A'・'D'・'M' など, ファイルパス), ...]
+        （リネーム・コピーは元のパスを 'D'、新しいパスを 'A' として返す）
+    """
+    changes = []
+    records = output.split('\0')
+
+    i = 0
+    while i < len(records):
+        code = records[i]
+        i += 1
+        if not code:
+            continue
+        if code[0] in ('R', 'C'):
+            if code[0] == 'R':
+                changes.append(('D', records[i]))
+            changes.append(('A', records[i + 1]))
+            i += 2
+        else:
+            changes.append((code[0], records[i]))
+            i += 1
+    return changes
+
+
+class GitStatusService:
+    """Git状態の取得サービス（変更があるまで結果をキャッシュ）"""
+
+    def __init__(self, work_dir=None, max_age: Optional[float] = DEFAULT_MAX_AGE):
+        """
+        状態取得サービスを初期化
+
+        Args:
+            work_dir: 作業ディレクトリ（Noneの場合は現在のディレクトリ）
+            max_age: キャッシュの最大保持秒数（Noneの場合は無期限）
+        """
+        self.work_dir = Path(work_dir) if work_dir else Path.cwd()
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._git_dir: Optional[Path] = None
+        self._git_dir_checked = False
+        self._cached: Optional[Tuple[tuple, float, GitStatus]] = None
+
+    @property
+    def git_dir(self) -> Optional[Path]:
+        """.git ディレクトリ（Gitリポジトリでない・Gitがない場合None）"""
+        with self._lock:
+            if not self._git_dir_checked:
+                self._git_dir = self._find_git_dir()
+                self._git_dir_checked = True
+            return self._git_dir
+
+    def _find_git_dir(self) -> Optional[Path]:
+        """git rev-parse で .git ディレクトリを取得"""
+        try:
+            result = run_process(['git', 'rev-parse', '--absolute-git-dir'], cwd=self.work_dir, timeout=10)
+        except OSError:
+            return None
+        if not result.ok:
+            return None
+        return Path(result.stdout.strip())
+
+    def _cache_key(self, git_dir: Path, upstream: Optional[str]) -> tuple:
+        """キャッシュキー（index・HEAD・参照ファイルの更新時刻）を計算"""
+        paths = [git_dir / 'index', git_dir / 'HEAD', git_dir / 'packed-refs']
+
+        try:
+            head = (git_dir / 'HEAD').read_text(encoding='utf-8').strip()
+        except OSError:
+            head = ''
+        if head.startswith('ref: '):
+            paths.append(git_dir / head[5:])
+        if upstream:
+            # fetch で追跡ブランチが更新されると ahead/behind が変わる
+            paths.append(git_dir / 'refs' / 'remotes' / upstream)
+
+        key = [head]
+        for path in paths:
+            try:
+                key.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                key.append(None)
+        return tuple(key)
+
+    def invalidate(self):
+        """キャッシュを破棄（次回は必ず git status を実行）"""
+        with self._lock:
+            self._cached = None
+
+    def status(self, force: bool = False) -> GitStatus:
+        """
+        Git状態を取得
+
+        Args:
+            force: Trueの場合はキャッシュを使わない
+
+        Returns:
+            GitStatus
+
+        Raises:
+            GitStatusError: Gitリポジトリでない・git status が失敗した場合
+            subprocess.TimeoutExpired: git status がタイムアウトした場合
+        """
+        git_dir = self.git_dir
+        if git_dir is None:
+            raise GitStatusError('Gitリポジトリではありません')
+
+        with self._lock:
+            cached = self._cached
+        upstream = cached[2].upstream if cached else None
+
+        if cached is not None and not force:
+            key, fetched_at, status = cached
+            fresh = self.max_age is None or time.monotonic() - fetched_at < self.max_age
+            if fresh and key == self._cache_key(git_dir, upstream):
+                return status
+
+        # 実行前のキーを使う（実行中に変更された場合は次回取り直す）
+        key = self._cache_key(git_dir, upstream)
+        fetched_at = time.monotonic()
+        # -z 出力のパスはUTF-8以外のバイトも含みうるため変換せずに受け取る
+        args = ['git', 'status', '--porcelain=v2', '--branch', '-z']
+        result = run_process(args, cwd=self.work_dir, timeout=STATUS_TIMEOUT, encoding=None)
+        if result.timed_out:
+            raise subprocess.TimeoutExpired(args, STATUS_TIMEOUT)
+        if result.returncode != 0:
+            raise GitStatusError(
+                f"git status失敗: {result.stderr.decode('utf-8', errors='replace').strip()}"
+            )
+
+        status = parse_porcelain_v2(result.stdout)
+        if status.upstream != upstream:
+            # 追跡ブランチが変わった場合はその参照ファイルを含めてキーを計算し直す
+            key = self._cache_key(git_dir, status.upstream)
+
+        with self._lock:
+            self._cached = (key, fetched_at, status)
+        return status
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+投稿キューの一括検証
+
+空ファイル・制御文字・文字数（X の重み付き文字数）・絵文字（prompts/ の生成ルールで禁止）・
+URLの重複を検証する。ファイル単位の結果は内容ハッシュ単位でキャッシュし、
+新規・変更ファイルだけをプロセスプールで検証する。ファイルをまたぐURLの重複は
+キャッシュしたURL一覧から毎回判定する。
+"""
+
+import json
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .queue_index import DEFAULT_DB_PATH, QueueIndex
+from .tweet_length import MAX_WEIGHTED_LENGTH, extract_urls, weighted_length
+
+
+# 検証ルールのバージョン（ルールを変えたら上げてキャッシュを無効化）
+LINT_VERSION = 1
+
+# 重要度
+ERROR = 'error'
+WARNING = 'warning'
+
+# この件数未満はプロセスプールを使わずに検証
+_PARALLEL_THRESHOLD = 64
+
+# 制御文字（改行・タブ・復帰を除く、core/file-manager.js と同じ）
+_CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+
+# 絵文字（絵文字用の領域・標準で絵文字表示になる記号・絵文字化の修飾）
+_EMOJI = re.compile(
+    '[\U0001F000-\U0001FAFF\uFE0F\u20E3'
+    '\u231A\u231B\u23E9-\u23EC\u23F0\u23F3\u25FD\u25FE\u2614\u2615\u2648-\u2653'
+    '\u267F\u2693\u26A1\u26AA\u26AB\u26BD\u26BE\u26C4\u26C5\u26CE\u26D4\u26EA'
+    '\u26F2\u26F3\u26F5\u26FA\u26FD\u2705\u270A\u270B\u2728\u274C\u274E'
+    '\u2753-\u2755\u2757\u2795-\u2797\u27B0\u27BF\u2B1B\u2B1C\u2B50\u2B55]'
+)
+
+
+class LintIssue:
+    """検証で見つかった問題1件"""
+
+    def __init__(self, code: str, severity: str, message: str):
+        """
+        問題を作成
+
+        Args:
+            code: 問題の種類（'empty'・'control'・'length'・'emoji'・'duplicate_url' など）
+            severity: ERROR または WARNING
+            message: 表示用メッセージ
+        """
+        self.code = code
+        self.severity = severity
+        self.message = message
+
+    def __repr__(self):
+        return f"LintIssue({self.code!r}, {self.severity!r}, {self.message!r})"
+
+
+def lint_text(text: str) -> Tuple[List[LintIssue], List[str]]:
+    """
+    本文を検証（ファイルをまたぐURLの重複は除く）
+
+    Args:
+        text: 投稿本文
+
+    Returns:
+        (問題のリスト, 本文中のURLのリスト)
+    """
+    issues = []
+    if not text.strip():
+        return [LintIssue('empty', ERROR, '空のファイルです')], []
+
+    if _CONTROL_CHARS.search(text):
+        issues.append(LintIssue('control', ERROR, '制御文字が含まれています'))
+
+    length = weighted_length(text)
+    if length > MAX_WEIGHTED_LENGTH:
+        issues.append(LintIssue('length', ERROR, f'文字数超過 ({length}/{MAX_WEIGHTED_LENGTH})'))
+
+    emoji = _EMOJI.search(text)
+    if emoji:
+        issues.append(LintIssue('emoji', ERROR, f'絵文字が含まれています ({emoji.group()})'))
+
+    urls = extract_urls(text)
+    seen = set()
+    for url in urls:
+        if url in seen:
+            issues.append(LintIssue('duplicate_url', WARNING, f'同じURLが複数あります: {url}'))
+        seen.add(url)
+    return issues, urls
+
+
+def lint_file(file_path) -> Tuple[List[LintIssue], List[str]]:
+    """
+    ファイルを検証
+
+    Args:
+        file_path: ファイルパス
+
+    Returns:
+        (問題のリスト, 本文中のURLのリスト)
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return [LintIssue('encoding', ERROR, 'UTF-8として読み込めません')], []
+    except OSError as e:
+        return [LintIssue('read', ERROR, f'読み込みエラー: {e}')], []
+    return lint_text(text)
+
+
+def _lint_worker(file_path: str) -> Tuple[List[Tuple[str, str, str]], List[str]]:
+    """プロセスプール用のラッパー（結果はキャッシュ保存用のタプルで返す）"""
+    issues, urls = lint_file(file_path)
+    return [(issue.code, issue.severity, issue.message) for issue in issues], urls
+
+
+class LintCache:
+    """ファイル単位の検証結果のキャッシュ（内容ハッシュ単位）"""
+
+    def __init__(self, db_path=None):
+        """
+        キャッシュを初期化
+
+        Args:
+            db_path: キャッシュDBのパス（Noneの場合はキューインデックスと同じDB）
+        """
+        db_path = Path(db_path) if db_path else Path.cwd() / DEFAULT_DB_PATH
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path))
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS lint_results ('
+            'version INTEGER NOT NULL, hash TEXT NOT NULL, issues TEXT NOT NULL, urls TEXT NOT NULL, '
+            'PRIMARY KEY (version, hash)) WITHOUT ROWID'
+        )
+        self._conn.commit()
+
+    def lookup(self, hashes: Sequence[str]) -> Dict[str, Tuple[list, List[str]]]:
+        """
+        キャッシュ済みの検証結果を取得
+
+        Args:
+            hashes: 内容ハッシュのリスト
+
+        Returns:
+            {ハッシュ: (問題のタプルのリスト, URLのリスト)} の辞書（キャッシュにあるもののみ）
+        """
+        found = {}
+        unique = list(set(hashes))
+        # SQLiteのパラメータ数上限を考慮して分割
+        for i in range(0, len(unique), 500):
+            chunk = unique[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for digest, issues, urls in self._conn.execute(
+                f'SELECT hash, issues, urls FROM lint_results WHERE version = ? AND hash IN ({placeholders})',
+                [LINT_VERSION] + chunk
+            ):
+                found[digest] = (json.loads(issues), json.loads(urls))
+        return found
+
+    def store(self, results: Dict[str, Tuple[list, List[str]]]):
+        """
+        検証結果を保存
+
+        Args:
+            results: {ハッシュ: (問題のタプルのリスト, URLのリスト)} の辞書
+        """
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO lint_results (version, hash, issues, urls) VALUES (?, ?, ?, ?)',
+                [
+                    (LINT_VERSION, digest, json.dumps(issues, ensure_ascii=False), json.dumps(urls))
+                    for digest, (issues, urls) in results.items()
+                ]
+            )
+
+    def close(self):
+        """DB接続を閉じる"""
+        self._conn.close()
+
+
+def lint_folder(
+    folder,
+    names: Optional[List[str]] = None,
+    db_path=None,
+    max_workers: Optional[int] = None
+) -> Dict[str, List[LintIssue]]:
+    """
+    フォルダ内の投稿ファイルを検証（新規・変更ファイルのみ検証し直す）
+
+    Args:
+        folder: 対象フォルダ
+        names: 対象ファイル名（Noneの場合はフォルダ内の全投稿ファイル）
+        db_path: インデックス・キャッシュDBのパス（Noneの場合はデフォルト）
+        max_workers: プロセス数（Noneの場合はCPU数）
+
+    Returns:
+        {ファイル名: 問題のリスト} の辞書（問題がないファイルは空リスト）
+    """
+    folder = Path(folder)
+
+    # 変更のあったファイルだけハッシュを再計算
+    index = QueueIndex(folder, db_path)
+    cache = LintCache(db_path)
+    try:
+        index.sync()
+        hashes = index.hashes()
+        if names is not None:
+            hashes = {name: hashes[name] for name in names if name in hashes}
+
+        cached = cache.lookup(list(hashes.values()))
+        # 同じ内容のファイルは1回だけ検証
+        digests = sorted({digest for digest in hashes.values() if digest not in cached})
+        first_names = {}
+        for name, digest in hashes.items():
+            first_names.setdefault(digest, name)
+        tasks = [str(folder / first_names[digest]) for digest in digests]
+
+        if len(tasks) >= _PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_lint_worker, tasks, chunksize=32))
+        else:
+            results = [_lint_worker(task) for task in tasks]
+
+        new_results = dict(zip(digests, results))
+        if new_results:
+            cache.store(new_results)
+        cached.update(new_results)
+    finally:
+        cache.close()
+        index.close()
+
+    report = {}
+    files_by_url = {}
+    for name, digest in hashes.items():
+        issues, urls = cached[digest]
+        report[name] = [LintIssue(*issue) for issue in issues]
+        for url in dict.fromkeys(urls):
+            files_by_url.setdefault(url, []).append(name)
+
+    # ファイルをまたぐURLの重複
+    for url, url_names in files_by_url.items():
+        if len(url_names) < 2:
+            continue
+        for name in url_names:
+            others = [other for other in url_names if other != name]
+            report[name].append(LintIssue(
+                'duplicate_url', WARNING,
+                f'URLが他のファイルと重複しています: {url} ({others[0]}' + (f' 他{len(others) - 1}件)' if len(others) > 1 else ')')
+            ))
+
+    # インデックスに載らなかったファイル（読み込みエラー等）は個別に検証
+    for name in names or []:
+        if name not in report:
+            report[name] = lint_file(folder / name)[0]
+    return report
+
+
+def lint_status(issues: Sequence[LintIssue]) -> Optional[str]:
+    """
+    問題のリストの重要度をまとめる
+
+    Args:
+        issues: 問題のリスト
+
+    Returns:
+        ERROR・WARNING のいずれか（問題がない場合None）
+    """
+    severities = {issue.severity for issue in issues}
+    if ERROR in severities:
+        return ERROR
+    if WARNING in severities:
+        return WARNING
+    return None
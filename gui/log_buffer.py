@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+ログ表示用のリングバッファ
+
+どのスレッドからでも行を追加でき、画面側は一定間隔でまとめて取り出して表示する。
+未表示の行は上限件数までしか保持せず、超えた分は古い行から捨てて件数だけ数える。
+"""
+
+import threading
+from collections import deque
+from typing import List, Tuple
+
+
+# 保持する行数の既定の上限（未表示分・表示中のログ共通）
+MAX_LOG_LINES = 1000
+
+
+class LogBuffer:
+    """未表示のログ行を保持するリングバッファ（スレッドセーフ）"""
+
+    def __init__(self, max_lines: int = MAX_LOG_LINES):
+        """
+        バッファを初期化
+
+        Args:
+            max_lines: 保持する行数の上限
+        """
+        self.max_lines = max_lines
+        self._pending = deque(maxlen=max_lines)
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def append(self, line: str, level: str = "INFO") -> bool:
+        """
+        行を追加
+
+        Args:
+            line: ログ行（改行を含む）
+            level: ログレベル
+
+        Returns:
+            バッファが空だった場合True（呼び出し側はこのときだけ表示を予約する）
+        """
+        with self._lock:
+            was_empty = not self._pending
+            if len(self._pending) == self.max_lines:
+                self._dropped += 1
+            self._pending.append((line, level))
+            return was_empty
+
+    def drain(self) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        未表示の行をすべて取り出す
+
+        Returns:
+            ([(ログ行, ログレベル), ...], 上限を超えて捨てた行数)
+        """
+        with self._lock:
+            lines = list(self._pending)
+            dropped = self._dropped
+            self._pending.clear()
+            self._dropped = 0
+        return lines, dropped
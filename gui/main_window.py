@@ -8,26 +8,48 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
+import time
 from pathlib import Path
 
-from .post_tab import PostTab
+from .post_tab import PostTab, SCHEDULE_PATHS
 from .config_tab import ConfigTab
 from .git_manager import GitManager
+from .config_store import get_config_store
+
+
+# 起動から初回描画までの目標時間（ミリ秒）
+STARTUP_TARGET_MS = 300
 
 
 class MainWindow:
     """メインGUIウィンドウクラス"""
     
-    def __init__(self):
-        """メインウィンドウを初期化"""
+    def __init__(self, fast_start: bool = False):
+        """
+        メインウィンドウを初期化
+
+        Args:
+            fast_start: Trueの場合は先にウィンドウを表示し、タブは初回選択時に作成、
+                起動時のpullはステータスバーに表示してバックグラウンドで実行
+        """
+        self._started_at = time.perf_counter()
+        self.fast_start = fast_start
         self.root = tk.Tk()
         self.git_manager = GitManager()
         self._setup_window()
-        self._create_tabs()
+        self._create_status_bar()
+        if fast_start:
+            self._create_deferred_tabs()
+        else:
+            self._create_tabs()
         self._setup_menu()
 
-        # GUI起動時に自動pull実行
-        self._auto_pull_on_startup()
+        # 初回描画までの時間を計測
+        self.root.bind('<Map>', self._on_map, add='+')
+
+        # GUI起動時に自動pull実行（高速起動では初回描画後に実行）
+        if not fast_start:
+            self._auto_pull_on_startup()
         
     def _setup_window(self):
         """ウィンドウの基本設定"""
@@ -55,7 +77,7 @@ class MainWindow:
             
         # 設定タブを作成
         try:
-            self.config_tab = ConfigTab(self.notebook)
+            self.config_tab = ConfigTab(self.notebook, git_manager=self.git_manager)
             self.notebook.add(self.config_tab.frame, text="設定")
         except Exception as e:
             messagebox.showerror("エラー", f"設定タブの作成に失敗しました: {e}")
@@ -63,6 +85,84 @@ class MainWindow:
         # ノートブックを配置
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
         
+    def _create_deferred_tabs(self):
+        """タブの枠だけを作成（中身は初回選択時に作成）"""
+        self.notebook = ttk.Notebook(self.root)
+
+        # {枠のウィジェット名: (枠, 中身の作成関数)}
+        self._pending_tabs = {}
+        for text, builder in (("投稿管理", self._build_post_tab), ("設定", self._build_config_tab)):
+            placeholder = ttk.Frame(self.notebook)
+            self.notebook.add(placeholder, text=text)
+            self._pending_tabs[str(placeholder)] = (placeholder, builder)
+
+        self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
+
+    def _build_post_tab(self, placeholder):
+        """投稿管理タブの中身を作成（ファイルリストはワーカースレッドで読み込み）"""
+        try:
+            self.post_tab = PostTab(placeholder, load_async=True)
+            self.post_tab.frame.pack(fill='both', expand=True)
+        except Exception as e:
+            messagebox.showerror("エラー", f"投稿管理タブの作成に失敗しました: {e}")
+
+    def _build_config_tab(self, placeholder):
+        """設定タブの中身を作成"""
+        try:
+            self.config_tab = ConfigTab(placeholder, git_manager=self.git_manager)
+            self.config_tab.frame.pack(fill='both', expand=True)
+            self.config_tab.load_config()
+        except Exception as e:
+            messagebox.showerror("エラー", f"設定タブの作成に失敗しました: {e}")
+
+    def _on_tab_changed(self, event=None):
+        """タブ選択時の処理（未作成のタブを作成）"""
+        pending = self._pending_tabs.pop(self.notebook.select(), None)
+        if pending:
+            placeholder, builder = pending
+            builder(placeholder)
+
+    def _create_status_bar(self):
+        """ステータスバーを作成（ウィンドウ下部）"""
+        self.status_bar = ttk.Frame(self.root)
+        self.status_bar_label = ttk.Label(self.status_bar, text="", font=("Arial", 9))
+        self.status_bar_label.pack(side='left', padx=(10, 0))
+        # 同期中のみ表示
+        self.sync_progress = ttk.Progressbar(self.status_bar, mode='indeterminate', length=80)
+        self.status_bar.pack(side='bottom', fill='x', pady=(0, 5))
+
+    def set_status(self, message: str, foreground: str = "black"):
+        """
+        ステータスバーの表示を更新
+
+        Args:
+            message: 表示するメッセージ
+            foreground: 文字色
+        """
+        self.status_bar_label.config(text=message, foreground=foreground)
+
+    def _on_map(self, event):
+        """ウィンドウ表示時の処理（子ウィジェットの表示でも呼ばれるため初回のルートのみ処理）"""
+        if event.widget is not self.root:
+            return
+        self.root.unbind('<Map>')
+        # 表示後の描画処理が終わってから計測
+        self.root.after_idle(self._on_first_paint)
+
+    def _on_first_paint(self):
+        """初回描画後の処理（起動時間の報告・高速起動の残りの初期化）"""
+        elapsed_ms = (time.perf_counter() - self._started_at) * 1000
+        message = f"起動: {elapsed_ms:.0f} ms"
+        if elapsed_ms > STARTUP_TARGET_MS:
+            message += f"（目標 {STARTUP_TARGET_MS} ms を超過）"
+        self.set_status(message, "gray")
+
+        if self.fast_start:
+            # 選択中のタブを作成し、以降は初回選択時に作成
+            self._on_tab_changed()
+            self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+            self._background_pull_on_startup()
+
     def _setup_menu(self):
         """メニューバーの設定（将来の拡張用）"""
         menubar = tk.Menu(self.root)
@@ -91,10 +191,22 @@ class MainWindow:
     def _on_closing(self):
         """ウィンドウ閉じる時の処理"""
         try:
-            # 未保存の変更があるかチェック（将来的に実装）
+            # フォルダ監視を停止
+            if hasattr(self, 'post_tab'):
+                self.post_tab.stop_watching()
+
+            # リモート変更の定期確認を停止
+            self.git_manager.stop_remote_polling()
+
+            # 設定タブの変更通知を解除
             if hasattr(self, 'config_tab'):
-                # 設定タブに未保存の変更があるかチェック
-                pass
+                self.config_tab.close()
+
+            # 書き込み待ちの設定を保存
+            try:
+                get_config_store().flush()
+            except OSError as e:
+                print(f"設定ファイル保存エラー: {e}", file=sys.stderr)
                 
             self.root.quit()
             self.root.destroy()
@@ -121,12 +233,12 @@ class MainWindow:
             print(f"実行エラー: {e}", file=sys.stderr)
             
     def _initial_load(self):
-        """初回データ読み込み"""
+        """初回データ読み込み（高速起動では各タブの作成時に読み込む）"""
+        if self.fast_start:
+            return
         try:
-            # 投稿管理タブのデータ読み込み
-            if hasattr(self, 'post_tab'):
-                self.post_tab.refresh_files()
-                
+            # 投稿管理タブはタブ作成時に読み込み済み（pull後は変わったファイルだけ反映）
+
             # 設定タブのデータ読み込み
             if hasattr(self, 'config_tab'):
                 self.config_tab.load_config()
@@ -156,14 +268,57 @@ class MainWindow:
 
         def on_pull_completion(success, message):
             """Pull完了処理"""
-            self.root.after(0, lambda: self._on_pull_completion(success, message, progress_dialog))
+            self.root.after(0, lambda: self._on_pull_completion(success, message, progress_dialog, job))
 
-        # 自動pullを実行
-        self.git_manager.pull_from_remote(
+        # 自動pullを実行（完了処理はメインスレッドで動くため、その時点で job は代入済み）
+        job = self.git_manager.pull_from_remote(
             progress_callback=on_pull_progress,
             completion_callback=on_pull_completion
         )
 
+    def _background_pull_on_startup(self):
+        """
+        GUI起動時の自動pull処理（ダイアログを出さずステータスバーに表示）
+
+        Gitの有無・リポジトリの確認もジョブの中で行い、UIスレッドでGitを起動しない。
+        Gitが使えない場合は何も表示しない。
+        """
+        def show_progress(message):
+            """同期の開始・進行状況を表示（ジョブが実際に始まってから表示する）"""
+            if not self.sync_progress.winfo_ismapped():
+                self.sync_progress.pack(side='right', padx=(0, 10))
+                self.sync_progress.start()
+            self.set_status(message, "gray")
+
+        def on_pull_progress(message):
+            """Pull進行状況更新"""
+            self.root.after(0, lambda: show_progress(message))
+
+        def on_pull_completion(success, message):
+            """Pull完了処理"""
+            self.root.after(0, lambda: self._on_background_pull_completion(success, message, job))
+
+        # 完了処理はメインスレッドで動くため、その時点で job は代入済み
+        job = self.git_manager.pull_from_remote(
+            progress_callback=on_pull_progress,
+            completion_callback=on_pull_completion,
+            require_repository=True
+        )
+
+    def _on_background_pull_completion(self, success, message, job):
+        """バックグラウンドpull完了時の処理"""
+        self.sync_progress.stop()
+        self.sync_progress.pack_forget()
+        if job.skipped:
+            # Gitが使えない環境では起動時間の表示を残す
+            return
+
+        if success:
+            self.set_status(message, "green")
+            self._apply_pulled_changes(job.changes)
+        else:
+            self.set_status(f"同期エラー: {message}", "red")
+
     def _create_pull_progress_dialog(self):
         """Pull用プログレスダイアログ作成"""
         class PullProgressDialog:
@@ -197,11 +352,13 @@ class MainWindow:
 
         return PullProgressDialog(self.root)
 
-    def _on_pull_completion(self, success, message, progress_dialog):
+    def _on_pull_completion(self, success, message, progress_dialog, job=None):
         """Pull完了時の処理"""
         progress_dialog.close()
 
         if success:
+            self._apply_pulled_changes(job.changes if job else None)
+
             # 成功時は控えめに表示（ステータスバーがあれば理想的）
             if "既に最新状態" not in message:
                 # 更新があった場合のみ通知
@@ -217,6 +374,27 @@ class MainWindow:
                 "手動で同期するか、ネットワーク接続を確認してください。"
             )
     
+    def _apply_pulled_changes(self, changes):
+        """
+        pull で変わったファイルだけを各タブに反映
+
+        Args:
+            changes: [(状態, リポジトリルートからのパス), ...]（Noneの場合は全体を読み直す）
+        """
+        if changes is None:
+            self.refresh_all()
+            return
+        if not changes:
+            return
+
+        try:
+            if hasattr(self, 'post_tab'):
+                self.post_tab.apply_pulled_changes(changes)
+            if hasattr(self, 'config_tab') and any(path in SCHEDULE_PATHS for _code, path in changes):
+                self.config_tab.load_config()
+        except Exception as e:
+            messagebox.showerror("更新エラー", f"データ更新に失敗しました: {e}")
+
     def refresh_all(self):
         """全タブのデータを更新（他のタブから呼び出し用）"""
         try:
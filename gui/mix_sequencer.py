@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+投稿カテゴリの重み付きミックス
+
+各カテゴリの k 件目を「全体の中での理想位置（k × 重みの合計 / 重み）」の順に並べる。
+理想位置をヒープで管理するため、件数 n・カテゴリ数 c に対して O(n log c) で順序が決まる。
+最小間隔を満たせないカテゴリは一時的に飛ばし、どのカテゴリも満たせない場合だけ間隔を緩める。
+"""
+
+import heapq
+import math
+from fractions import Fraction
+from typing import Any, List, Sequence, Tuple
+
+
+class MixCategory:
+    """ミックス対象のカテゴリ"""
+
+    def __init__(self, name: str, items: Sequence[Any], weight=1, min_spacing: int = 0):
+        """
+        カテゴリを作成
+
+        Args:
+            name: カテゴリ名
+            items: このカテゴリの投稿（この順序で配置）
+            weight: 配置比率の重み（正の数。例: ブログ1・通常9 で10回に1回）
+            min_spacing: 同じカテゴリの投稿の間に挟む他カテゴリの最小件数
+
+        Raises:
+            ValueError: 重み・最小間隔が不正な場合
+        """
+        weight = Fraction(weight).limit_denominator(10 ** 6) if isinstance(weight, float) else Fraction(weight)
+        if weight <= 0:
+            raise ValueError(f"重みは正の数で指定してください: {name}")
+        if min_spacing < 0:
+            raise ValueError(f"最小間隔は0以上で指定してください: {name}")
+
+        self.name = name
+        self.items = list(items)
+        self.weight = weight
+        self.min_spacing = min_spacing
+
+    def __repr__(self):
+        return (f"MixCategory({self.name!r}, {len(self.items)} items, "
+                f"weight={self.weight}, min_spacing={self.min_spacing})")
+
+
+def interleave(categories: Sequence[MixCategory]) -> List[Tuple[str, Any]]:
+    """
+    カテゴリを重みの比率で交互に並べる
+
+    理想位置が同じ場合は重みの大きいカテゴリ、次に指定順の早いカテゴリを優先する
+    （ブログ1・通常9 ならブログは10, 20, 30... 番目）。件数の少ないカテゴリが
+    なくなった後は、残ったカテゴリだけで同じ比率の計算を続ける。
+
+    Args:
+        categories: カテゴリのリスト
+
+    Returns:
+        [(カテゴリ名, 投稿), ...] の配置順リスト
+    """
+    active = [category for category in categories if category.items]
+    if not active:
+        return []
+
+    # 重みを整数化し、最小公倍数を掛けて理想位置を整数のまま比較する
+    denominator = math.lcm(*(category.weight.denominator for category in active))
+    weights = [int(category.weight * denominator) for category in active]
+    scale = sum(weights) * math.lcm(*weights)
+    steps = [scale // weight for weight in weights]
+
+    heap = [(steps[i], -weights[i], i) for i in range(len(active))]
+    heapq.heapify(heap)
+
+    placed = [0] * len(active)
+    last_position = [None] * len(active)
+    order = []
+
+    for position in range(sum(len(category.items) for category in active)):
+        # 最小間隔を満たす中で理想位置が最も早いカテゴリを選ぶ
+        deferred = []
+        while heap:
+            entry = heapq.heappop(heap)
+            i = entry[2]
+            if last_position[i] is None or position - last_position[i] > active[i].min_spacing:
+                break
+            deferred.append(entry)
+        else:
+            # どのカテゴリも間隔を満たせない場合は理想位置が最も早いものを採用
+            entry = deferred.pop(0)
+
+        for pending in deferred:
+            heapq.heappush(heap, pending)
+
+        i = entry[2]
+        category = active[i]
+        order.append((category.name, category.items[placed[i]]))
+        placed[i] += 1
+        last_position[i] = position
+
+        if placed[i] < len(category.items):
+            heapq.heappush(heap, ((placed[i] + 1) * steps[i], -weights[i], i))
+
+    return order
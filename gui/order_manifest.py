@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+投稿順序マニフェスト
+
+フォルダの隣に置く <フォルダ名>.order.json に投稿順を記録する（例: sns/ → sns.order.json）。
+マニフェストがある場合は記載順を優先し、記載のない新規ファイルはファイル名順で後ろに続ける。
+並べ替えはファイル名を変えずにマニフェスト1ファイルの書き込みで済む。
+core/file-manager.js も同じ形式を読む。
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable, List
+
+
+# マニフェストファイル名の接尾辞
+MANIFEST_SUFFIX = '.order.json'
+
+
+def manifest_path(folder) -> Path:
+    """
+    フォルダに対応するマニフェストのパスを取得
+
+    Args:
+        folder: 対象フォルダ
+
+    Returns:
+        マニフェストファイルのパス（フォルダと同じ階層）
+    """
+    folder = Path(folder)
+    return folder.parent / (folder.name + MANIFEST_SUFFIX)
+
+
+class OrderManifest:
+    """投稿順序マニフェストの読み書きクラス"""
+
+    def __init__(self, folder):
+        """
+        マニフェストを初期化
+
+        Args:
+            folder: 対象フォルダ
+        """
+        self.folder = Path(folder)
+        self.path = manifest_path(self.folder)
+
+    def exists(self) -> bool:
+        """マニフェストが存在する場合True"""
+        return self.path.exists()
+
+    def load(self) -> List[str]:
+        """
+        記載順のファイル名を読み込み
+
+        Returns:
+            ファイル名のリスト（マニフェストがない・壊れている場合は空）
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as e:
+            print(f"順序マニフェスト読み込みエラー: {e}")
+            return []
+
+        order = data.get('order', []) if isinstance(data, dict) else []
+        return [name for name in order if isinstance(name, str)]
+
+    def save(self, names: Iterable[str]):
+        """
+        投稿順を書き込み（一時ファイル経由でアトミックに置き換え）
+
+        Args:
+            names: 投稿順のファイル名
+        """
+        order = list(dict.fromkeys(names))
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'order': order}, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def append(self, names: Iterable[str]):
+        """
+        ファイルを末尾に追加（マニフェストがない場合は何もしない）
+
+        投稿済みなどでフォルダからなくなったファイルはこのとき除去する。
+
+        Args:
+            names: 追加するファイル名
+        """
+        if not self.exists():
+            return
+        current = [name for name in self.load() if (self.folder / name).exists()]
+        listed = set(current)
+        self.save(current + [name for name in names if name not in listed])
+
+    def delete(self):
+        """マニフェストを削除（ファイル名順に戻す）"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def apply(self, names: Iterable[str]) -> List[str]:
+        """
+        ファイル名をマニフェストの順序に並べる
+
+        Args:
+            names: 対象のファイル名
+
+        Returns:
+            記載のあるファイルを記載順、その後に記載のないファイルをファイル名順で並べたリスト
+        """
+        names = set(names)
+        listed = [name for name in dict.fromkeys(self.load()) if name in names]
+        unlisted = sorted(names.difference(listed))
+        return listed + unlisted
+
+
+def order_names(folder, names: Iterable[str]) -> List[str]:
+    """
+    フォルダの投稿順に並べる（マニフェストがない場合はファイル名順）
+
+    Args:
+        folder: 対象フォルダ
+        names: 対象のファイル名
+
+    Returns:
+        投稿順のファイル名リスト
+    """
+    return OrderManifest(folder).apply(names)
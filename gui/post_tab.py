@@ -7,34 +7,116 @@ sns/ディレクトリの投稿待ちファイルを管理
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from pathlib import Path
-from typing import List
+from pathlib import Path, PurePosixPath
+from typing import Callable, List, Optional, Tuple
+import bisect
 import os
+import shutil
 
-import subprocess
 import threading
 import datetime
-from .utils import get_sns_files
+from .utils import get_sns_files, load_config, parse_fixed_times, read_workflow_times
+from .scheduler import SlotCalculator, format_jst_datetime, get_posting_times, parse_start_date
+from .queue_index import is_queue_file
+from .order_manifest import OrderManifest
+from .content_cache import get_content_cache
+from .file_watcher import FileWatcher, CREATED, DELETED, MODIFIED
+from .log_buffer import LogBuffer
+from .process_runner import STDERR, run_process
+from .tweet_length import MAX_WEIGHTED_LENGTH, TextLengthTracker, weighted_length
+from .linter import ERROR, WARNING, lint_folder, lint_status
+from .search_index import get_search_index
+from .config_store import get_config_store
+
+
+# CLI確認（npm run plan）の制限時間（秒）
+CLI_PLAN_TIMEOUT = 120
+
+# ログ表示の更新間隔（ミリ秒）
+LOG_FLUSH_INTERVAL_MS = 50
+
+# ログレベルごとの文字色（INFO は既定色）
+LOG_LEVEL_COLORS = {
+    "ERROR": "#ff6b6b",
+    "SUCCESS": "#51cf66",
+    "WARNING": "#ffd93d",
+}
+
+# ファイル変更から検証開始までの待ち時間（ミリ秒、連続した変更をまとめる）
+LINT_DELAY_MS = 300
+
+# 検証結果ごとの行の背景色
+LINT_ROW_COLORS = {
+    ERROR: "#ffd6d6",
+    WARNING: "#fff3bf",
+}
+
+# 投稿予定時刻の計算に使う設定ファイル（リポジトリルートからのパス）
+CONFIG_PATH = 'configs/sns.json'
+SCHEDULE_PATHS = (CONFIG_PATH, '.github/workflows/sns.yml')
 
 
 class PostTab:
     """投稿管理タブクラス"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, load_async: bool = False):
         """
         投稿管理タブを初期化
         
         Args:
             parent: 親ウィジェット（通常はNotebook）
+            load_async: Trueの場合はファイルリストをワーカースレッドで読み込む（画面表示を待たせない）
         """
         self.parent = parent
         self.frame = ttk.Frame(parent)
+
+        # リストボックスと同じ順序のファイル名（差分更新用）
+        self._file_names = []
+        # 順序マニフェスト（ある場合は _file_names がファイル名順ではない）
+        self._order_manifest = OrderManifest(Path.cwd() / 'sns')
+        self._manifest_order = False
+
+        # 投稿枠の計算（投稿予定時刻の表示用、refresh_files で再作成）
+        self._slot_calculator = None
+
+        # ワーカースレッドで読み込み中の場合True（その間の pull 結果は読み込み後に読み直して反映）
+        self._loading = False
+        self._reload_pending = False
+
+        # 未表示のログ行（log_message で追加し、_flush_log でまとめて表示）
+        self._log_buffer = LogBuffer()
+
+        # 実行中の CLI 確認の中止用（実行していない場合None）
+        self._plan_cancel = None
+
+        # 検証結果 {ファイル名: 問題のリスト}（ワーカースレッドで検証し、行の色とプレビューに反映）
+        self._lint_results = {}
+        self._lint_running = False
+        self._lint_pending = False
+        self._lint_after = None
+
+        # 全文検索（検索語がない場合 _search_matches はNone、ある場合はリストに表示するファイル名の集合）
+        self._search_index = get_search_index(Path.cwd())
+        self._search_matches = None
+        self._search_updating = False
+        self._search_update_pending = False
+
         self._create_widgets()
         self._setup_layout()
         self._bind_events()
 
+        # 設定の変更（設定タブでの保存・pull）を通知で受け取り、予定時刻の計算を作り直す
+        get_config_store().subscribe(self._on_config_changed)
+
+        # フォルダ監視（変更分だけリストに反映、ファイルリストの読み込み後に開始）
+        self.watcher = FileWatcher([Path.cwd() / 'sns'], self._on_file_events)
+
         # 初期化時にファイルリストを読み込み
-        self.refresh_files()
+        if load_async:
+            self.refresh_files_async(on_loaded=self.watcher.start)
+        else:
+            self.refresh_files()
+            self.watcher.start()
         
     def _create_widgets(self):
         """ウィジェットを作成"""
@@ -57,6 +139,20 @@ class PostTab:
             width=15
         )
         
+        # CLI照合ボタン（Node.js が必要）
+        self.cli_plan_button = ttk.Button(
+            self.top_frame,
+            text="CLIで確認",
+            command=self.run_cli_plan,
+            width=10
+        )
+
+        # 検索ボックス（入力のたびにリストを絞り込む）
+        self.search_frame = ttk.Frame(self.frame)
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(self.search_frame, textvariable=self.search_var, width=30)
+        self.search_result_label = ttk.Label(self.search_frame, text="", font=("Arial", 8), foreground="gray")
+
         # ファイルリストフレーム
         self.list_frame = ttk.Frame(self.frame)
         
@@ -132,6 +228,9 @@ class PostTab:
             bg="#2d3748",
             fg="#e2e8f0"
         )
+        # レベルごとの色（タグはレベル名で共通、行ごとには作らない）
+        for level, color in LOG_LEVEL_COLORS.items():
+            self.log_text.tag_config(level, foreground=color)
         
         # ログスクロールバー
         self.log_scrollbar = ttk.Scrollbar(
@@ -173,7 +272,14 @@ class PostTab:
         self.top_frame.pack(fill='x', padx=5, pady=(5, 0))
         self.refresh_button.pack(side='left')
         self.plan_button.pack(side='left', padx=(10, 0))
+        self.cli_plan_button.pack(side='left', padx=(10, 0))
         
+        # 検索ボックスのレイアウト
+        self.search_frame.pack(fill='x', padx=5, pady=(5, 0))
+        ttk.Label(self.search_frame, text="検索:").pack(side='left')
+        self.search_entry.pack(side='left', padx=(5, 0))
+        self.search_result_label.pack(side='left', padx=(10, 0))
+
         # ファイルリストフレームのレイアウト
         self.list_frame.pack(fill='x', padx=5, pady=5)
         self.files_listbox.pack(side='left', fill='both', expand=True)
@@ -206,41 +312,375 @@ class PostTab:
         self.info_label.pack(side='left', padx=(20, 0))
         
     def refresh_files(self):
-        """ファイルリストを更新"""
+        """ファイルリストを更新（ワーカースレッドで読み込み中の場合は読み込み後に更新）"""
+        if self._loading:
+            self._reload_pending = True
+            return
         try:
-            # 既存のリストをクリア
-            self.files_listbox.delete(0, tk.END)
+            self._show_files(*self._load_files())
+        except Exception as e:
+            messagebox.showerror("エラー", f"ファイルリストの更新に失敗しました:\n{str(e)}")
+            self._update_status(0, f"エラー: {str(e)}")
 
-            # sns/ディレクトリから投稿待ちファイルを取得
-            files = get_sns_files()
+    def refresh_files_async(self, on_loaded: Optional[Callable[[], None]] = None):
+        """
+        ファイルリストをワーカースレッドで読み込んで更新
 
-            # リストボックスに追加（昇順でソート済み）
-            for file_name in files:
-                self.files_listbox.insert(tk.END, file_name)
+        Args:
+            on_loaded: 表示の更新後にメインスレッドで呼ぶ関数
+        """
+        self._loading = True
+        self.status_label.config(text="投稿待ちファイルを読み込み中...", foreground="gray")
 
-            # ファイルがある場合は最初のファイルを選択
-            if files:
-                self.files_listbox.selection_set(0)
-                self.update_preview()
-            else:
-                self._clear_preview("投稿待ちファイルがありません")
+        def load():
+            try:
+                result, error = self._load_files(), None
+            except Exception as e:
+                result, error = None, e
+            try:
+                self.frame.after(0, lambda: self._on_files_loaded(result, error, on_loaded))
+            except (tk.TclError, RuntimeError):
+                pass  # 読み込み中にウィンドウが閉じられた
 
-            # ステータスを更新
-            self._update_status(len(files))
+        threading.Thread(target=load, daemon=True).start()
+
+    def _on_files_loaded(self, result, error, on_loaded):
+        """ワーカースレッドでの読み込み完了時の処理"""
+        self._loading = False
+        if error:
+            self._update_status(0, f"エラー: {str(error)}")
+        else:
+            self._show_files(*result)
+
+        if self._reload_pending:
+            # 読み込み中に pull で変わったファイルがあった
+            self._reload_pending = False
+            self.refresh_files()
+        if on_loaded:
+            on_loaded()
+
+    def _load_files(self):
+        """
+        投稿待ちファイルと投稿枠の計算を読み込み（Tkを使わないためワーカースレッドからも呼べる）
+
+        Returns:
+            (投稿順のファイル名リスト, 投稿枠の計算, マニフェスト順の場合True)
+        """
+        files = get_sns_files()
+        return files, self._create_slot_calculator(), self._order_manifest.exists()
+
+    def _show_files(self, files: List[str], slot_calculator, manifest_order: bool):
+        """読み込んだファイルリストを表示"""
+        # 既存のリストをクリア
+        self.files_listbox.delete(0, tk.END)
+
+        self._slot_calculator = slot_calculator
+        self._manifest_order = manifest_order
+
+        # リストボックスに追加（投稿順で並び済み、検索中は該当するファイルのみ）
+        self._file_names = list(files)
+        shown = self._shown_names()
+        if shown:
+            self.files_listbox.insert(tk.END, *shown)
+
+        # ファイルがある場合は最初のファイルを選択
+        if shown:
+            self.files_listbox.selection_set(0)
+            self.update_preview()
+        elif files:
+            self._clear_preview("検索に該当するファイルがありません")
+        else:
+            self._clear_preview("投稿待ちファイルがありません")
+
+        # ステータスを更新
+        self._update_status(len(files))
+        self._schedule_lint()
+        self._schedule_search_update()
+
+    def _shown_names(self) -> List[str]:
+        """リストボックスに表示するファイル名（検索中は該当するもののみ、投稿順）"""
+        if self._search_matches is None:
+            return self._file_names
+        return [name for name in self._file_names if name in self._search_matches]
+
+    def _render_list(self):
+        """検索の絞り込みに合わせてリストボックスを作り直す（選択と検証結果の色は引き継ぐ）"""
+        selected_file = self.get_selected_file()
+        shown = self._shown_names()
+        self.files_listbox.delete(0, tk.END)
+        if shown:
+            self.files_listbox.insert(tk.END, *shown)
+        self._apply_lint_colors()
+
+        if selected_file in shown:
+            index = shown.index(selected_file)
+            self.files_listbox.selection_set(index)
+            self.files_listbox.see(index)
+        elif shown:
+            self.files_listbox.selection_set(0)
+            self.update_preview()
+        else:
+            self._clear_preview("検索に該当するファイルがありません" if self._file_names else "投稿待ちファイルがありません")
+
+    def _on_search_changed(self, *args):
+        """検索語の変更（入力のたびにメモリ上の索引で絞り込む）"""
+        self._apply_search()
+        self._render_list()
+
+    def _apply_search(self):
+        """現在の検索語で _search_matches と件数表示を更新"""
+        query = self.search_var.get().strip()
+        if not query:
+            self._search_matches = None
+            self.search_result_label.config(text="")
+            return
+
+        results = self._search_index.search(query)
+        self._search_matches = results.get(Path.cwd() / 'sns', set())
+        text = self._search_index.summary(results)
+        if self._search_updating and not len(self._search_index):
+            text = "索引を作成中..."
+        self.search_result_label.config(text=text)
+
+    def _schedule_search_update(self):
+        """検索索引の更新をワーカースレッドで開始（内容ハッシュが変わったファイルだけ読み直す）"""
+        if self._search_updating:
+            # 実行中の更新が終わってから最新の状態で更新し直す
+            self._search_update_pending = True
+            return
+        self._search_updating = True
+
+        def run_update():
+            try:
+                changed = self._search_index.update()
+            except Exception as e:
+                changed = False
+                self.log_message(f"検索索引の更新エラー: {str(e)}", "ERROR")
+            try:
+                self.frame.after(0, lambda: self._on_search_updated(changed))
+            except (tk.TclError, RuntimeError):
+                pass  # 更新中にウィンドウが閉じられた
+
+        threading.Thread(target=run_update, daemon=True).start()
+
+    def _on_search_updated(self, changed: bool):
+        """索引の更新後、検索中であれば結果を更新"""
+        self._search_updating = False
+        if changed and self.search_var.get().strip():
+            self._apply_search()
+            self._render_list()
+        if self._search_update_pending:
+            self._search_update_pending = False
+            self._schedule_search_update()
+
+    def _on_file_events(self, events):
+        """フォルダ監視イベント受信（監視スレッドから呼ばれる）"""
+        self.frame.after(0, lambda: self._apply_file_events(events))
+
+    def _apply_file_events(self, events):
+        """変更のあったファイルだけをリストに反映"""
+        if self._manifest_order:
+            # マニフェスト順の場合は挿入位置が名前から決まらないため読み直す
+            self.refresh_files()
+            return
+
+        selected_file = self.get_selected_file()
+        preview_stale = False
+        # 検索中はリストボックスの位置が _file_names と一致しないため最後に作り直す
+        filtering = self._search_matches is not None
+
+        for kind, _folder, name in events:
+            if not is_queue_file(name):
+                continue
+
+            index = bisect.bisect_left(self._file_names, name)
+            exists = index < len(self._file_names) and self._file_names[index] == name
+
+            if kind == CREATED and not exists:
+                self._file_names.insert(index, name)
+                if not filtering:
+                    self.files_listbox.insert(index, name)
+            elif kind == DELETED and exists:
+                del self._file_names[index]
+                if not filtering:
+                    self.files_listbox.delete(index)
+                if name == selected_file:
+                    preview_stale = True
+            elif kind == MODIFIED and exists and name == selected_file:
+                preview_stale = True
+
+        if filtering:
+            self._render_list()
+        if preview_stale:
+            self.update_preview()
+        self._update_status(len(self._file_names))
+        self._schedule_lint()
+        self._schedule_search_update()
+
+    def apply_pulled_changes(self, changes: List[Tuple[str, str]]):
+        """
+        pull で変わったファイルだけをリストに反映
+
+        Args:
+            changes: [(状態 'A'・'D'・'M' など, リポジトリルートからのパス), ...]
+        """
+        if self._loading:
+            # 読み込み中のリストは pull 前の状態の可能性があるため、読み込み後に読み直す
+            self.refresh_files()
+            return
+
+        # 投稿済み・記事の変更も検索索引に反映
+        self._schedule_search_update()
+
+        kinds = {'A': CREATED, 'D': DELETED}
+        sns_dir = Path.cwd() / 'sns'
+        events = []
+        schedule_changed = False
+
+        for code, path in changes:
+            if path == self._order_manifest.path.name:
+                # 順序が変わった場合は全体を読み直す
+                self.refresh_files()
+                return
+            if path == CONFIG_PATH:
+                # 設定ストアが読み直して通知する（_on_config_changed で反映）
+                get_config_store().refresh()
+                continue
+            if path in SCHEDULE_PATHS:
+                schedule_changed = True
+                continue
+            parts = PurePosixPath(path).parts
+            if len(parts) == 2 and parts[0] == 'sns':
+                events.append((kinds.get(code, MODIFIED), sns_dir, parts[1]))
+
+        if schedule_changed:
+            # 投稿時刻の設定が変わった場合は予定時刻の計算だけを作り直す
+            self._slot_calculator = self._create_slot_calculator()
+        if events:
+            self._apply_file_events(events)
+        elif schedule_changed:
+            self._update_status(len(self._file_names))
+            self.update_preview()
+
+    def _schedule_lint(self):
+        """検証を予約（短時間の連続した変更は1回にまとめる）"""
+        if self._lint_after is not None:
+            self.frame.after_cancel(self._lint_after)
+        self._lint_after = self.frame.after(LINT_DELAY_MS, self._start_lint)
+
+    def _start_lint(self):
+        """キュー全体の検証をワーカースレッドで開始（変更のないファイルはキャッシュを使う）"""
+        self._lint_after = None
+        if self._lint_running:
+            # 実行中の検証が終わってから最新のリストで検証し直す
+            self._lint_pending = True
+            return
+        self._lint_running = True
+        names = list(self._file_names)
+
+        def run_lint():
+            try:
+                results = lint_folder(Path.cwd() / 'sns', names)
+            except Exception as e:
+                results = None
+                self.log_message(f"検証エラー: {str(e)}", "ERROR")
+            try:
+                self.frame.after(0, lambda: self._apply_lint_results(results))
+            except (tk.TclError, RuntimeError):
+                pass  # 検証中にウィンドウが閉じられた
+
+        threading.Thread(target=run_lint, daemon=True).start()
+
+    def _apply_lint_results(self, results):
+        """検証結果を行の色・ステータス・プレビューに反映"""
+        self._lint_running = False
+        if results is not None:
+            self._lint_results = results
+            self._apply_lint_colors()
+            self._update_status(len(self._file_names))
+            self.update_preview()
+
+        if self._lint_pending:
+            self._lint_pending = False
+            self._start_lint()
+
+    def _apply_lint_colors(self):
+        """検証結果を表示中の行の背景色に反映"""
+        for index, name in enumerate(self._shown_names()):
+            status = lint_status(self._lint_results.get(name, ()))
+            self.files_listbox.itemconfig(index, background=LINT_ROW_COLORS.get(status, ''))
+
+    def _on_config_changed(self, snapshot):
+        """設定の変更通知（保存したスレッド・タイマースレッドから呼ばれる）"""
+        try:
+            self.frame.after(0, self._apply_config_change)
+        except (tk.TclError, RuntimeError):
+            pass  # ウィンドウが閉じられた
+
+    def _apply_config_change(self):
+        """変わった設定で予定時刻の計算を作り直す"""
+        self._slot_calculator = self._create_slot_calculator()
+        if not self._loading:
+            self._update_status(len(self._file_names))
+            self.update_preview()
+
+    def stop_watching(self):
+        """フォルダ監視と設定の変更通知を停止"""
+        self.watcher.stop()
+        get_config_store().unsubscribe(self._on_config_changed)
 
-        except Exception as e:
-            messagebox.showerror("エラー", f"ファイルリストの更新に失敗しました:\n{str(e)}")
-            self._update_status(0, f"エラー: {str(e)}")
-    
     def _update_status(self, file_count: int, error_msg: str = None):
         """ステータス表示を更新"""
         if error_msg:
             self.status_label.config(text=error_msg, foreground="red")
         else:
-            self.status_label.config(
-                text=f"投稿待ちファイル: {file_count}件",
-                foreground="black"
+            text = f"投稿待ちファイル: {file_count}件"
+            if file_count and self._slot_calculator:
+                # キューを投稿し終える予定時刻（ランウェイ）
+                last_slot = self._slot_calculator.slot_at(file_count - 1)
+                text += f"（最終予定: {format_jst_datetime(last_slot)}）"
+            if self._lint_results:
+                statuses = [lint_status(self._lint_results.get(name, ())) for name in self._file_names]
+                text += f" | 検証: エラー{statuses.count(ERROR)}件・警告{statuses.count(WARNING)}件"
+            self.status_label.config(text=text, foreground="black")
+
+    def _create_slot_calculator(self):
+        """投稿枠の計算オブジェクトを作成（投稿時刻が未設定の場合None）"""
+        try:
+            # 投稿時刻は設定ファイル、未設定ならワークフローのcronから取得
+            posting = load_config().get('posting', {})
+            times = get_posting_times(posting) or parse_fixed_times(read_workflow_times())
+            if not times:
+                return None
+            return SlotCalculator(
+                times,
+                parse_start_date(posting.get('startDate', 'auto')),
+                posting.get('skipWeekends', False)
             )
+        except (OSError, ValueError):
+            return None
+
+    def get_file_eta(self, file_name: str):
+        """
+        ファイルの投稿予定時刻を取得
+
+        Args:
+            file_name: ファイル名
+
+        Returns:
+            投稿予定時刻（キューにない・投稿時刻が未設定の場合None）
+        """
+        if not self._slot_calculator:
+            return None
+        if self._manifest_order:
+            try:
+                return self._slot_calculator.slot_at(self._file_names.index(file_name))
+            except ValueError:
+                return None
+        index = bisect.bisect_left(self._file_names, file_name)
+        if index >= len(self._file_names) or self._file_names[index] != file_name:
+            return None
+        return self._slot_calculator.slot_at(index)
     
     def get_selected_file(self) -> str:
         """選択されているファイル名を取得"""
@@ -256,6 +696,9 @@ class PostTab:
         """イベントバインド"""
         # ファイル選択時のプレビュー更新
         self.files_listbox.bind('<<ListboxSelect>>', self._on_file_select)
+
+        # 検索語の入力のたびに絞り込み
+        self.search_var.trace_add('write', self._on_search_changed)
         
     def _on_file_select(self, event):
         """ファイル選択時の処理"""
@@ -272,20 +715,29 @@ class PostTab:
             # ファイルの内容を読み込み
             file_path = Path.cwd() / 'sns' / selected_file
             if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
+                # 本文はキャッシュ経由で読み込み（更新時刻が変わるまで再読み込みしない）
+                content = get_content_cache().get(file_path)
                 
                 # プレビューに表示
                 self.preview_text.config(state=tk.NORMAL)
                 self.preview_text.delete(1.0, tk.END)
                 self.preview_text.insert(1.0, content)
                 
-                # 文字数表示
-                char_count = len(content)
-                color = "red" if char_count > 280 else "green"
-                self.preview_text.insert(tk.END, f"\n\n--- 文字数: {char_count}/280 ---")
+                # 文字数・投稿予定時刻表示
+                char_count = weighted_length(content)
+                color = "red" if char_count > MAX_WEIGHTED_LENGTH else "green"
+                eta = self.get_file_eta(selected_file)
+                eta_text = f" | 予定: {format_jst_datetime(eta)}" if eta else ""
+                self.preview_text.insert(tk.END, f"\n\n--- 文字数: {char_count}/{MAX_WEIGHTED_LENGTH}{eta_text} ---")
                 self.preview_text.tag_add("char_count", f"end-2l", "end")
                 self.preview_text.tag_config("char_count", foreground=color, font=("Arial", 8))
+
+                # 検証結果
+                for issue in self._lint_results.get(selected_file, ()):
+                    label = "エラー" if issue.severity == ERROR else "警告"
+                    self.preview_text.insert(tk.END, f"\n[{label}] {issue.message}", ("lint_" + issue.severity,))
+                self.preview_text.tag_config("lint_" + ERROR, foreground="red", font=("Arial", 8))
+                self.preview_text.tag_config("lint_" + WARNING, foreground="#b58100", font=("Arial", 8))
                 
                 self.preview_text.config(state=tk.DISABLED)
             else:
@@ -302,70 +754,143 @@ class PostTab:
         self.preview_text.config(state=tk.DISABLED)
     
     def log_message(self, message, level="INFO"):
-        """ログにメッセージを追加"""
+        """
+        ログにメッセージを追加（どのスレッドからでも呼べる、表示は一定間隔でまとめて行う）
+
+        Args:
+            message: メッセージ
+            level: ログレベル（INFO・SUCCESS・WARNING・ERROR）
+        """
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         log_line = f"[{timestamp}] [{level}] {message}\n"
-        
+
+        if self._log_buffer.append(log_line, level):
+            try:
+                self.frame.after(LOG_FLUSH_INTERVAL_MS, self._flush_log)
+            except (tk.TclError, RuntimeError):
+                pass  # ウィンドウが閉じられた
+
+    def _flush_log(self):
+        """たまったログ行をまとめて表示し、上限を超えた古い行を削除"""
+        lines, dropped = self._log_buffer.drain()
+        if not lines:
+            return
+
+        # insert はテキストとタグの組を複数受け取れるため1回で追加
+        chunks = []
+        if dropped:
+            chunks += [f"... {dropped} 行を省略 ...\n", "WARNING"]
+        for line, level in lines:
+            chunks += [line, level if level in LOG_LEVEL_COLORS else ()]
+
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, log_line)
-        
-        # 色付け
-        if level == "ERROR":
-            self.log_text.tag_add("error", f"end-2l", "end-1l")
-            self.log_text.tag_config("error", foreground="#ff6b6b")
-        elif level == "SUCCESS":
-            self.log_text.tag_add("success", f"end-2l", "end-1l")
-            self.log_text.tag_config("success", foreground="#51cf66")
-        elif level == "WARNING":
-            self.log_text.tag_add("warning", f"end-2l", "end-1l")
-            self.log_text.tag_config("warning", foreground="#ffd93d")
-        
+        self.log_text.insert(tk.END, *chunks)
+
+        # 末尾は常に空行のため、その1行を除いた行数で判定
+        line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+        excess = line_count - self._log_buffer.max_lines
+        if excess > 0:
+            self.log_text.delete('1.0', f'{excess + 1}.0')
+
         # 最新行にスクロール
         self.log_text.see(tk.END)
         self.log_text.config(state=tk.DISABLED)
     
     def show_schedule(self):
-        """スケジュール確認（API不要）"""
+        """スケジュール確認（API不要・プロセス内で計算）"""
         self.log_message("=== スケジュール確認開始 ===")
 
-        # ボタンを一時無効化
-        self.plan_button.config(state='disabled')
+        try:
+            files = get_sns_files()
+            if not files:
+                self.log_message("投稿対象ファイルが見つかりません", "WARNING")
+                return
+
+            calculator = self._create_slot_calculator()
+            if not calculator:
+                self.log_message("投稿時刻が未設定のため予定時刻は表示できません", "WARNING")
+
+            self.log_message(f"総件数: {len(files)}件")
+            self.log_message(f"次回投稿ファイル: {files[0]}")
+            if calculator:
+                self.log_message(
+                    f"期間: {format_jst_datetime(calculator.slot_at(0))} ～ "
+                    f"{format_jst_datetime(calculator.slot_at(len(files) - 1))}"
+                )
+
+            # 最初の10件を表示
+            sns_dir = Path.cwd() / 'sns'
+            display_count = min(len(files), 10)
+            for i in range(display_count):
+                marker = '👉' if i == 0 else '  '
+                self.log_message(f"{marker} {i + 1}. {files[i]}")
+                if calculator:
+                    self.log_message(f"   予定時刻: {format_jst_datetime(calculator.slot_at(i))}")
+                try:
+                    content = get_content_cache().get(sns_dir / files[i])
+                    truncated = '...' if len(content) > 50 else ''
+                    self.log_message(f"   内容: \"{content[:50]}{truncated}\"")
+                except OSError:
+                    self.log_message("   内容: 読み込みエラー", "WARNING")
+
+            if len(files) > 10:
+                self.log_message(f"... 他 {len(files) - 10} 件")
+
+            self.log_message("スケジュール確認が完了しました", "SUCCESS")
+            self.log_message("実際の投稿はGitHub Actionsで行ってください", "INFO")
+
+        except Exception as e:
+            self.log_message(f"スケジュール計算エラー: {str(e)}", "ERROR")
+
+    def run_cli_plan(self):
+        """Node CLI (npm run plan) でのスケジュール確認（照合用、実行中に押すと中止）"""
+        if self._plan_cancel is not None:
+            self._plan_cancel.set()
+            self.log_message("CLIスケジュール確認を中止しています...", "WARNING")
+            return
+
+        self.log_message("=== CLIスケジュール確認開始 ===")
+
+        # シェルを経由せずに実行（Windows の npm.cmd もパスを解決して直接起動）
+        npm = shutil.which('npm')
+        if not npm:
+            self.log_message("npm が見つかりません。Node.js をインストールしてください", "ERROR")
+            return
+
+        # 実行中はボタンを中止ボタンとして使う
+        cancel_event = threading.Event()
+        self._plan_cancel = cancel_event
+        self.cli_plan_button.config(text="中止")
+
+        def on_line(stream, line):
+            # 標準出力と標準エラーを届いた順に表示
+            if line.strip():
+                self.log_message(line.strip(), "ERROR" if stream == STDERR else "INFO")
 
         def run_plan():
             try:
                 # npm run plan 実行（API不要）
-                process = subprocess.Popen(
-                    "npm run plan",
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    encoding='utf-8'
+                result = run_process(
+                    [npm, 'run', 'plan'],
+                    cwd=Path.cwd(),
+                    timeout=CLI_PLAN_TIMEOUT,
+                    on_line=on_line,
+                    cancel_event=cancel_event
                 )
 
-                # リアルタイム出力
-                while True:
-                    output = process.stdout.readline()
-                    if output == '' and process.poll() is not None:
-                        break
-                    if output:
-                        self._add_log_safely(output.strip())
-
-                # エラー出力を取得
-                stderr_output = process.stderr.read()
-                if stderr_output:
-                    self._add_log_safely(stderr_output.strip(), "ERROR")
-
                 # 結果判定
-                return_code = process.poll()
-                if return_code == 0:
-                    self._add_log_safely("スケジュール確認が完了しました", "SUCCESS")
-                    self._add_log_safely("実際の投稿はGitHub Actionsで行ってください", "INFO")
+                if result.cancelled:
+                    self.log_message("CLIスケジュール確認を中止しました", "WARNING")
+                elif result.timed_out:
+                    self.log_message(f"CLIスケジュール確認がタイムアウトしました（{CLI_PLAN_TIMEOUT}秒）", "ERROR")
+                elif result.returncode == 0:
+                    self.log_message("スケジュール確認が完了しました", "SUCCESS")
+                    self.log_message("実際の投稿はGitHub Actionsで行ってください", "INFO")
                 else:
-                    self._add_log_safely(f"スケジュール確認が失敗しました (終了コード: {return_code})", "ERROR")
+                    self.log_message(f"スケジュール確認が失敗しました (終了コード: {result.returncode})", "ERROR")
 
             except Exception as e:
-                self._add_log_safely(f"実行エラー: {str(e)}", "ERROR")
+                self.log_message(f"実行エラー: {str(e)}", "ERROR")
             finally:
                 # ボタンを有効化
                 self.frame.after(0, self._enable_buttons)
@@ -374,13 +899,10 @@ class PostTab:
         thread = threading.Thread(target=run_plan, daemon=True)
         thread.start()
 
-    def _add_log_safely(self, message, level="INFO"):
-        """スレッドセーフなログ追加"""
-        self.frame.after(0, lambda: self.log_message(message, level))
-
     def _enable_buttons(self):
         """ボタンを有効化"""
-        self.plan_button.config(state='normal')
+        self._plan_cancel = None
+        self.cli_plan_button.config(state='normal', text="CLIで確認")
 
     def edit_file(self):
         """ファイル編集機能"""
@@ -447,23 +969,19 @@ class PostTab:
         char_count_frame = ttk.Frame(dialog)
         char_count_frame.pack(fill='x', padx=10, pady=(0, 5))
 
-        char_count_label = ttk.Label(char_count_frame, text="文字数: 0/280")
+        char_count_label = ttk.Label(char_count_frame, text=f"文字数: 0/{MAX_WEIGHTED_LENGTH}")
         char_count_label.pack(side='left')
 
-        # 文字数更新関数
-        def update_char_count(event=None):
-            current_content = text_area.get(1.0, 'end-1c')
-            char_count = len(current_content)
-            color = "red" if char_count > 280 else "green"
+        # 文字数更新関数（X の重み付き文字数）
+        def update_char_count(length, over):
             char_count_label.config(
-                text=f"文字数: {char_count}/280",
-                foreground=color
+                text=f"文字数: {length}/{MAX_WEIGHTED_LENGTH}",
+                foreground="red" if over else "green"
             )
 
-        # 文字数カウントをリアルタイム更新
-        text_area.bind('<KeyRelease>', update_char_count)
-        text_area.bind('<Button-1>', update_char_count)
-        update_char_count()  # 初期表示
+        # 文字数カウントをリアルタイム更新（編集された行だけ数え直し、超過部分を強調表示）
+        tracker = TextLengthTracker(text_area, update_char_count)
+        tracker.refresh(full=True)  # 初期表示
 
         # ボタンフレーム
         button_frame = ttk.Frame(dialog)
@@ -473,9 +991,10 @@ class PostTab:
 
         def save_and_close():
             current_content = text_area.get(1.0, 'end-1c')
-            if len(current_content) > 280:
+            char_count = weighted_length(current_content)
+            if char_count > MAX_WEIGHTED_LENGTH:
                 if not messagebox.askyesno("確認",
-                    f"文字数が280文字を超えています ({len(current_content)}文字)。\n保存しますか？"):
+                    f"文字数が{MAX_WEIGHTED_LENGTH}文字を超えています ({char_count}文字)。\n保存しますか？"):
                     return
             result['content'] = current_content
             dialog.destroy()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+GUI用の外部コマンド実行
+
+標準出力と標準エラーを別々のスレッドで同時に読み、行単位で通知する
+（片方のパイプが詰まって子プロセスが止まることがない）。
+経過時間のタイムアウトとキャンセルに対応し、どちらの場合も子プロセスを停止する。
+Windows ではパイプを select できないため、読み取りは selectors ではなくスレッドで行う。
+"""
+
+import queue
+import subprocess
+import threading
+import time
+from typing import Callable, List, Optional, Union
+
+
+# 標準出力・標準エラーの識別子
+STDOUT = 'stdout'
+STDERR = 'stderr'
+
+# キャンセル・タイムアウトを確認する間隔（秒）
+POLL_INTERVAL = 0.1
+
+# 子プロセス停止後に残りの出力を待つ時間（孫プロセスがパイプを保持している場合に打ち切る）
+KILL_GRACE = 1.0
+
+
+class ProcessResult:
+    """外部コマンドの実行結果"""
+
+    def __init__(self, args: List[str], returncode: Optional[int],
+                 stdout: Union[str, bytes], stderr: Union[str, bytes],
+                 timed_out: bool = False, cancelled: bool = False):
+        """
+        実行結果を作成
+
+        Args:
+            args: 実行したコマンド
+            returncode: 終了コード（停止した場合は停止後の終了コード）
+            stdout: 標準出力の全文（encoding=None で実行した場合はバイト列）
+            stderr: 標準エラーの全文（encoding=None で実行した場合はバイト列）
+            timed_out: タイムアウトで停止した場合True
+            cancelled: キャンセルで停止した場合True
+        """
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timed_out = timed_out
+        self.cancelled = cancelled
+
+    @property
+    def ok(self) -> bool:
+        """正常終了した場合True"""
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+
+def _read_lines(stream, name: str, lines: queue.Queue):
+    """パイプを1行ずつ読んでキューに送る（終端で None を送る）"""
+    try:
+        for raw in iter(stream.readline, b''):
+            lines.put((name, raw))
+    except (OSError, ValueError):
+        pass
+    finally:
+        lines.put((name, None))
+
+
+def run_process(
+    args: List[str],
+    cwd=None,
+    timeout: Optional[float] = None,
+    on_line: Optional[Callable[[str, str], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    encoding: Optional[str] = 'utf-8'
+) -> ProcessResult:
+    """
+    外部コマンドを実行し、出力を行単位で通知
+
+    Args:
+        args: コマンドと引数（シェルは経由しない）
+        cwd: 作業ディレクトリ
+        timeout: 開始からの制限時間（秒、Noneの場合は無制限）
+        on_line: 1行ごとに呼ぶ関数(STDOUT または STDERR, 改行を除いた行)（呼び出し元スレッドで呼ばれる）
+        cancel_event: セットされると子プロセスを停止する
+        encoding: 出力の文字コード（解釈できないバイトは置き換える）。Noneの場合は変換せず、
+            出力をそのままのバイト列で返す（-z 出力など。on_line には改行を除いたバイト列を渡す）
+
+    Returns:
+        ProcessResult
+
+    Raises:
+        OSError: コマンドを起動できない場合
+    """
+    process = subprocess.Popen(
+        args,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+
+    lines = queue.Queue()
+    readers = [
+        threading.Thread(target=_read_lines, args=(process.stdout, STDOUT, lines), daemon=True),
+        threading.Thread(target=_read_lines, args=(process.stderr, STDERR, lines), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    collected = {STDOUT: [], STDERR: []}
+    open_streams = len(readers)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    give_up_at = None
+    timed_out = cancelled = False
+
+    while open_streams:
+        now = time.monotonic()
+        if give_up_at is None:
+            # 出力が途切れなく続く場合もここで毎回確認する
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+            elif deadline is not None and now >= deadline:
+                timed_out = True
+            if cancelled or timed_out:
+                process.kill()
+                give_up_at = now + KILL_GRACE
+        elif now >= give_up_at:
+            break
+
+        try:
+            name, raw = lines.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            continue
+        if raw is None:
+            open_streams -= 1
+            continue
+        if encoding is None:
+            collected[name].append(raw)
+            line = raw.rstrip(b'\r\n')
+        else:
+            line = raw.decode(encoding, errors='replace').rstrip('\r\n')
+            collected[name].append(line)
+        if on_line:
+            on_line(name, line)
+
+    try:
+        returncode = process.wait(timeout=KILL_GRACE if give_up_at is not None else None)
+    except subprocess.TimeoutExpired:
+        returncode = None
+    if not open_streams:
+        process.stdout.close()
+        process.stderr.close()
+
+    join = b''.join if encoding is None else '\n'.join
+    return ProcessResult(
+        args,
+        returncode,
+        join(collected[STDOUT]),
+        join(collected[STDERR]),
+        timed_out=timed_out,
+        cancelled=cancelled
+    )
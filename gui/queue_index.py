@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+投稿キューのインデックス
+
+sns/ディレクトリのファイル情報（サイズ・更新時刻・内容ハッシュ）をSQLiteに保持し、
+変更のあったファイルだけを読み直す。並び順・次回投稿・件数はインデックスから返す。
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+# インデックスDBの既定の保存先（プロジェクトルートからの相対パス）
+DEFAULT_DB_PATH = Path('.cache') / 'queue_index.sqlite3'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    folder   TEXT    NOT NULL,
+    name     TEXT    NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash     TEXT    NOT NULL,
+    PRIMARY KEY (folder, name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS folders (
+    folder TEXT PRIMARY KEY,
+    count  INTEGER NOT NULL
+);
+"""
+
+
+def hash_bytes(data: bytes) -> str:
+    """
+    ファイル内容のハッシュ値を計算
+
+    Args:
+        data: ファイル内容
+
+    Returns:
+        16進数のハッシュ文字列
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def is_queue_file(name: str) -> bool:
+    """
+    投稿キューの対象ファイルか判定
+
+    Args:
+        name: ファイル名
+
+    Returns:
+        *.txt かつ README.txt・投稿済みファイル以外の場合True
+    """
+    return name.endswith('.txt') and name != 'README.txt' and 'posted' not in name
+
+
+def is_posted_file(name: str) -> bool:
+    """
+    投稿済みフォルダの対象ファイルか判定
+
+    投稿済みのファイルは moveToPosted（core/file-manager.js）により
+    <元の名前>_posted_<日時>.txt（失敗時は _failed_）に名前が変わるため、名前の "posted" では除外しない。
+
+    Args:
+        name: ファイル名
+
+    Returns:
+        *.txt かつ README.txt 以外の場合True
+    """
+    return name.endswith('.txt') and name != 'README.txt'
+
+
+class QueueIndex:
+    """投稿キューのSQLiteインデックス"""
+
+    def __init__(self, folder, db_path=None, match: Callable[[str], bool] = is_queue_file):
+        """
+        インデックスを初期化
+
+        Args:
+            folder: 対象フォルダ（sns/ または sns/draft/ など）
+            db_path: インデックスDBのパス（Noneの場合はデフォルト）
+            match: 対象ファイル名の判定（インデックスはフォルダ単位のため、同じフォルダには同じ判定を使う）
+        """
+        self.folder = Path(folder)
+        self.match = match
+        self.key = str(self.folder.resolve())
+        self.db_path = Path(db_path) if db_path else Path.cwd() / DEFAULT_DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 監視スレッド等からも呼ばれるため接続はロックで保護する
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def sync(self) -> Dict[str, List[str]]:
+        """
+        フォルダとインデックスを同期
+
+        stat情報（サイズ・更新時刻）が変わったファイルのみ内容を読み直す。
+
+        Returns:
+            {'added': [...], 'updated': [...], 'removed': [...]} のファイル名リスト
+        """
+        with self._lock:
+            known = {
+                name: (size, mtime_ns)
+                for name, size, mtime_ns in self._conn.execute(
+                    'SELECT name, size, mtime_ns FROM files WHERE folder = ?', (self.key,)
+                )
+            }
+
+            added, updated, rows = [], [], []
+            seen = set()
+
+            if self.folder.exists():
+                with os.scandir(self.folder) as entries:
+                    for entry in entries:
+                        if not self.match(entry.name):
+                            continue
+                        try:
+                            if not entry.is_file():
+                                continue
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+
+                        seen.add(entry.name)
+                        previous = known.get(entry.name)
+                        if previous == (stat.st_size, stat.st_mtime_ns):
+                            continue
+
+                        try:
+                            with open(entry.path, 'rb') as f:
+                                digest = hash_bytes(f.read())
+                        except OSError:
+                            continue
+
+                        rows.append((self.key, entry.name, stat.st_size, stat.st_mtime_ns, digest))
+                        (updated if previous else added).append(entry.name)
+
+            removed = [name for name in known if name not in seen]
+
+            if rows or removed:
+                with self._conn:
+                    self._conn.executemany(
+                        'INSERT OR REPLACE INTO files (folder, name, size, mtime_ns, hash) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        rows
+                    )
+                    self._conn.executemany(
+                        'DELETE FROM files WHERE folder = ? AND name = ?',
+                        [(self.key, name) for name in removed]
+                    )
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO folders (folder, count) VALUES (?, ?)',
+                        (self.key, len(seen))
+                    )
+            elif not known:
+                with self._conn:
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO folders (folder, count) VALUES (?, ?)',
+                        (self.key, 0)
+                    )
+
+            return {'added': sorted(added), 'updated': sorted(updated), 'removed': sorted(removed)}
+
+    def pending_files(self, limit: Optional[int] = None, offset: int = 0) -> List[str]:
+        """
+        投稿順（ファイル名昇順）のファイル名リストを取得
+
+        Args:
+            limit: 取得件数（Noneの場合は全件）
+            offset: 先頭からのスキップ件数
+
+        Returns:
+            ファイル名のリスト
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT name FROM files WHERE folder = ? ORDER BY name LIMIT ? OFFSET ?',
+                (self.key, -1 if limit is None else limit, offset)
+            )
+            return [row[0] for row in cursor]
+
+    def next_post(self) -> Optional[str]:
+        """
+        次回投稿ファイル名を取得
+
+        Returns:
+            ファイル名（キューが空の場合None）
+        """
+        names = self.pending_files(limit=1)
+        return names[0] if names else None
+
+    def count(self) -> int:
+        """
+        キューの件数を取得
+
+        Returns:
+            インデックス上のファイル件数
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT count FROM folders WHERE folder = ?', (self.key,)
+            ).fetchone()
+            return row[0] if row else 0
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        ファイルのインデックス情報を取得
+
+        Args:
+            name: ファイル名
+
+        Returns:
+            {'name', 'size', 'mtime_ns', 'hash'} の辞書（未登録の場合None）
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT name, size, mtime_ns, hash FROM files WHERE folder = ? AND name = ?',
+                (self.key, name)
+            ).fetchone()
+        if not row:
+            return None
+        return {'name': row[0], 'size': row[1], 'mtime_ns': row[2], 'hash': row[3]}
+
+    def hashes(self) -> Dict[str, str]:
+        """
+        全ファイルの内容ハッシュを取得
+
+        Returns:
+            {ファイル名: ハッシュ} の辞書
+        """
+        with self._lock:
+            return dict(self._conn.execute(
+                'SELECT name, hash FROM files WHERE folder = ?', (self.key,)
+            ))
+
+    def close(self):
+        """DB接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: Dict[str, QueueIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_queue_index(folder) -> QueueIndex:
+    """
+    フォルダごとに共有されるインデックスを取得
+
+    Args:
+        folder: 対象フォルダ
+
+    Returns:
+        QueueIndexインスタンス
+    """
+    key = str(Path(folder).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = QueueIndex(folder)
+            _indexes[key] = index
+        return index
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+キューの並べ替え（最小リネーム）
+
+現在のファイル名と並べ替え後のファイル名を比べ、名前が変わるファイルだけをリネームする。
+リネームは「移動先が別のリネーム元」という連鎖と循環に分解し、連鎖は末尾から順に、
+循環は1ファイルだけ一時名に退避して実行する。実行はジャーナル付き一括移動で行う。
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .batch_move import BatchMover
+
+
+# 循環の退避に使う一時名の接尾辞（.txt で終わらないため監視・インデックスの対象外）
+TEMP_SUFFIX = '.reorder'
+
+
+def _temp_name(name: str, taken: set) -> str:
+    """使われていない一時名を作成"""
+    candidate = name + TEMP_SUFFIX
+    counter = 1
+    while candidate in taken:
+        candidate = f"{name}{TEMP_SUFFIX}{counter}"
+        counter += 1
+    return candidate
+
+
+def plan_renames(renames: Dict[str, str], existing_names: Iterable[str] = ()) -> List[Tuple[str, str]]:
+    """
+    リネーム手順を作成（名前が変わらないファイルは含めない）
+
+    Args:
+        renames: {現在のファイル名: 新しいファイル名}
+        existing_names: フォルダ内の既存ファイル名（リネーム対象以外との衝突検出用）
+
+    Returns:
+        [(リネーム元, リネーム先), ...] の実行順リスト
+
+    Raises:
+        ValueError: リネーム先が重複する場合・リネーム対象外の既存ファイルと衝突する場合
+    """
+    renames = {src: dst for src, dst in renames.items() if src != dst}
+
+    sources_by_target = {}
+    for src, dst in renames.items():
+        if dst in sources_by_target:
+            raise ValueError(f"リネーム先が重複しています: {dst}")
+        sources_by_target[dst] = src
+
+    taken = set(existing_names) | set(renames)
+    for dst in sources_by_target:
+        if dst in taken and dst not in renames:
+            raise ValueError(f"リネーム先のファイルが既に存在します: {dst}")
+    taken |= set(sources_by_target)
+
+    steps = []
+    done = set()
+
+    # 連鎖: 他のファイルの移動先になっていない名前から辿り、末尾から実行
+    for head in renames:
+        if head in sources_by_target:
+            continue
+        chain = [head]
+        while renames[chain[-1]] in renames:
+            chain.append(renames[chain[-1]])
+        for src in reversed(chain):
+            steps.append((src, renames[src]))
+        done.update(chain)
+
+    # 残りは循環: 先頭を一時名に退避して空いた名前から順に埋める
+    for start in renames:
+        if start in done:
+            continue
+        cycle = [start]
+        while renames[cycle[-1]] != start:
+            cycle.append(renames[cycle[-1]])
+
+        temp = _temp_name(start, taken)
+        taken.add(temp)
+        steps.append((start, temp))
+        for src in reversed(cycle[1:]):
+            steps.append((src, renames[src]))
+        steps.append((temp, renames[start]))
+        done.update(cycle)
+
+    return steps
+
+
+def execute_renames(folder, renames: Dict[str, str], journal_path=None) -> int:
+    """
+    フォルダ内のファイルを最小のリネームで並べ替え
+
+    Args:
+        folder: 対象フォルダ
+        renames: {現在のファイル名: 新しいファイル名}
+        journal_path: 一括移動のジャーナルパス（Noneの場合はデフォルト）
+
+    Returns:
+        名前が変わったファイル数
+
+    Raises:
+        ValueError: リネーム先が重複・衝突する場合
+        OSError: リネームに失敗した場合（リネーム済みのファイルは元に戻る）
+    """
+    folder = Path(folder)
+    mover = BatchMover(journal_path)
+    # 前回中断した処理があれば元に戻してから計画する
+    mover.recover()
+
+    existing_names = [entry.name for entry in folder.iterdir()]
+    steps = plan_renames(renames, existing_names)
+    mover.execute([(folder / src, folder / dst) for src, dst in steps])
+    return sum(1 for src, dst in renames.items() if src != dst)
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+投稿スケジュール計算
+
+core/scheduler.js の calculateSchedule と同じ枠割り当て（固定時刻・開始日・週末スキップ・
+過去時刻のスキップ）をPythonで実装。GUIから子プロセスなしで呼び出せる。
+JS と同じく投稿時刻は設定の順に使い、並べ替え・重複の除去はしない。
+キュー位置 k の投稿時刻は日単位の走査をせず、1日の枠数と週末スキップから直接計算する。
+"""
+
+import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 日本標準時
+JST = datetime.timezone(datetime.timedelta(hours=9), 'JST')
+
+
+def now_jst() -> datetime.datetime:
+    """
+    現在時刻(JST)を取得
+
+    Returns:
+        タイムゾーン付きの現在時刻
+    """
+    return datetime.datetime.now(JST)
+
+
+def parse_start_date(value: Optional[str]) -> Optional[datetime.date]:
+    """
+    開始日設定を日付に変換
+
+    Args:
+        value: "auto" または "YYYY-MM-DD"（ISO形式の日時も可）
+
+    Returns:
+        開始日（"auto"・未指定の場合None）
+
+    Raises:
+        ValueError: 日付として解釈できない場合
+    """
+    if not value or value == 'auto':
+        return None
+
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        pass
+
+    try:
+        return datetime.datetime.fromisoformat(value).date()
+    except ValueError:
+        raise ValueError(f"無効な開始日付: {value}")
+
+
+def parse_times(times: List[str]) -> List[datetime.time]:
+    """
+    投稿時刻リストを時刻オブジェクトに変換
+
+    Args:
+        times: "HH:MM" 形式の時刻リスト
+
+    Returns:
+        時刻オブジェクトのリスト（設定順）
+
+    Raises:
+        ValueError: 時刻形式が不正な場合
+    """
+    parsed = []
+    for time_str in times:
+        try:
+            hour, minute = (int(part) for part in time_str.split(':'))
+            parsed.append(datetime.time(hour, minute))
+        except (ValueError, TypeError):
+            raise ValueError(f"無効な投稿時刻: {time_str}")
+    return parsed
+
+
+def get_posting_times(posting: Dict[str, Any]) -> Optional[List[str]]:
+    """
+    posting設定から投稿時刻配列を取得（fixedTimes は後方互換）
+
+    Args:
+        posting: configs/sns.json の posting セクション
+
+    Returns:
+        時刻配列（未設定の場合None）
+    """
+    times = posting.get('times') or posting.get('fixedTimes')
+    return times if isinstance(times, (list, tuple)) else None
+
+
+class SlotCalculator:
+    """投稿枠の計算（キュー位置から投稿時刻を O(1) で求める）"""
+
+    def __init__(
+        self,
+        times: List[str],
+        start_date: Optional[datetime.date] = None,
+        skip_weekends: bool = False,
+        now: Optional[datetime.datetime] = None
+    ):
+        """
+        投稿枠の計算を初期化
+
+        Args:
+            times: "HH:MM" 形式の投稿時刻リスト（calculateSchedule と同じく設定の順に使い、重複もそのまま枠にする）
+            start_date: 開始日（Noneの場合は当日）
+            skip_weekends: 土日をスキップする場合True
+            now: 基準となる現在時刻（Noneの場合は実際の現在時刻）
+
+        Raises:
+            ValueError: 投稿時刻が空・不正な場合
+        """
+        self.slot_times = parse_times(times)
+        if not self.slot_times:
+            raise ValueError('投稿時刻の設定が必要です (times配列)')
+
+        self.skip_weekends = skip_weekends
+        self.slots_per_day = len(self.slot_times)
+
+        now = (now or now_jst()).astimezone(JST)
+        today = now.date()
+        day = max(start_date or today, today)
+
+        # 最初の投稿日の週末スキップ
+        if skip_weekends and day.weekday() >= 5:
+            day += datetime.timedelta(days=7 - day.weekday())
+
+        # 最初の投稿日に使う枠（当日は過去時刻の枠を除く。設定の順のため過去の枠が先頭に並ぶとは限らない）
+        first_slots = list(range(self.slots_per_day))
+        if day == today:
+            first_slots = [
+                index for index in first_slots
+                if datetime.datetime.combine(day, self.slot_times[index], tzinfo=JST) > now
+            ]
+
+        self.first_day = day
+        self.first_slots = first_slots
+
+    def _add_days(self, day_index: int) -> datetime.date:
+        """最初の投稿日から day_index 日目（週末スキップ時は平日のみ数える）の日付"""
+        if not self.skip_weekends:
+            return self.first_day + datetime.timedelta(days=day_index)
+
+        weeks, rest = divmod(day_index, 5)
+        days = weeks * 7 + rest
+        if self.first_day.weekday() + rest >= 5:
+            days += 2
+        return self.first_day + datetime.timedelta(days=days)
+
+    def slot_at(self, position: int) -> datetime.datetime:
+        """
+        キュー位置の投稿予定時刻を取得
+
+        Args:
+            position: キュー内の位置（0 = 次回投稿）
+
+        Returns:
+            投稿予定時刻（JST）
+        """
+        if position < len(self.first_slots):
+            day_index, slot_index = 0, self.first_slots[position]
+        else:
+            day_index, slot_index = divmod(position - len(self.first_slots), self.slots_per_day)
+            day_index += 1
+        return datetime.datetime.combine(
+            self._add_days(day_index), self.slot_times[slot_index], tzinfo=JST
+        )
+
+    def timeline(self, count: int) -> List[datetime.datetime]:
+        """
+        先頭から count 件分の投稿予定時刻を取得
+
+        Args:
+            count: 件数
+
+        Returns:
+            投稿予定時刻のリスト
+        """
+        return [self.slot_at(position) for position in range(count)]
+
+    def timeline_array(self, count: int):
+        """
+        先頭から count 件分の投稿予定時刻を一括計算（NumPy が必要）
+
+        Args:
+            count: 件数
+
+        Returns:
+            JSTの壁時計時刻を表す datetime64[m] 配列
+
+        Raises:
+            ImportError: NumPy がインストールされていない場合
+        """
+        if np is None:
+            raise ImportError("timeline_array には NumPy が必要です (pip install numpy)")
+
+        # 最初の投稿日の枠を先に使い、残りは翌日から1日 slots_per_day 枠ずつ
+        positions = np.arange(count, dtype=np.int64) - len(self.first_slots)
+        day_index, slot_index = np.divmod(positions, self.slots_per_day)
+        day_index += 1
+        head = min(count, len(self.first_slots))
+        day_index[:head] = 0
+        slot_index[:head] = self.first_slots[:head]
+
+        if self.skip_weekends:
+            weeks, rest = np.divmod(day_index, 5)
+            days = weeks * 7 + rest + np.where(self.first_day.weekday() + rest >= 5, 2, 0)
+        else:
+            days = day_index
+
+        slot_minutes = np.array(
+            [slot_time.hour * 60 + slot_time.minute for slot_time in self.slot_times],
+            dtype=np.int64
+        )
+        first_day = np.datetime64(self.first_day.isoformat(), 'm')
+        return first_day + (days * 1440 + slot_minutes[slot_index]).astype('timedelta64[m]')
+
+
+def calculate_schedule(
+    files: List[str],
+    posting: Dict[str, Any],
+    now: Optional[datetime.datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    投稿スケジュールを計算（core/scheduler.js の calculateSchedule 相当）
+
+    Args:
+        files: 投稿順のファイル名リスト
+        posting: configs/sns.json の posting セクション
+        now: 基準となる現在時刻（Noneの場合は実際の現在時刻）
+
+    Returns:
+        [{'file': str, 'scheduled': bool, 'scheduled_time': datetime}, ...]
+        スケジューリング無効時は {'file', 'scheduled': False, 'reason'}
+
+    Raises:
+        ValueError: 投稿時刻・開始日の設定が不正な場合
+    """
+    if not posting.get('use'):
+        return [
+            {'file': name, 'scheduled': False, 'reason': 'スケジューリングが無効'}
+            for name in files
+        ]
+
+    times = get_posting_times(posting)
+    if not times:
+        raise ValueError('投稿時刻の設定が必要です (times配列)')
+
+    calculator = SlotCalculator(
+        times,
+        parse_start_date(posting.get('startDate', 'auto')),
+        posting.get('skipWeekends', False),
+        now
+    )
+
+    return [
+        {'file': name, 'scheduled': True, 'scheduled_time': slot}
+        for name, slot in zip(files, calculator.timeline(len(files)))
+    ]
+
+
+def format_jst_datetime(value: datetime.datetime) -> str:
+    """
+    JST日時を表示用にフォーマット
+
+    Args:
+        value: 日時
+
+    Returns:
+        "YYYY/MM/DD HH:MM JST" 形式の文字列
+    """
+    return value.astimezone(JST).strftime('%Y/%m/%d %H:%M') + ' JST'
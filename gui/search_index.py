@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+投稿・記事の全文検索
+
+文字 bigram（2文字）と1文字の転置インデックスをメモリに持ち、入力のたびにすぐ検索できるようにする。
+単語分割が要らないため日本語でもそのまま使える。検索語の bigram をすべて含む文書に絞り込んでから
+部分一致を確認するため、bigram の組み合わせによる誤検出はない。
+
+ファイルの変更はキューインデックス（stat・内容ハッシュ）で検出し、内容ハッシュが変わった文書だけを
+入れ替える。正規化した本文は内容ハッシュ単位でSQLiteにキャッシュし、起動時にファイルを読み直さない。
+"""
+
+import re
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .queue_index import DEFAULT_DB_PATH, QueueIndex, is_posted_file, is_queue_file
+
+
+# 正規化の形式のバージョン（正規化を変えたら上げてキャッシュを無効化）
+SEARCH_VERSION = 1
+
+# 候補がこの件数以下になったら残りの bigram で絞り込まずに部分一致を確認
+_VERIFY_THRESHOLD = 64
+
+# 削除済みの文書がこの割合を超えたら転置リストを作り直す
+_COMPACT_RATIO = 0.25
+
+# bigram を取り出す連続した文字（空白を含む bigram は検索語に現れない）
+_WORD = re.compile(r'\S+')
+
+# 検索結果の件数表示に使うフォルダ名ごとの表示名
+_SOURCE_LABELS = {
+    'draft': '下書き',
+    'sns': 'キュー',
+    'posted': '投稿済み',
+    'articles': '記事',
+}
+
+
+def is_article_file(name: str) -> bool:
+    """
+    検索対象の記事ファイルか判定
+
+    Args:
+        name: ファイル名
+
+    Returns:
+        *.md の場合True
+    """
+    return name.endswith('.md')
+
+
+def default_sources(root) -> List[Tuple[Path, Callable[[str], bool]]]:
+    """
+    既定の検索対象（下書き・投稿キュー・投稿済み・記事）
+
+    Args:
+        root: プロジェクトルート
+
+    Returns:
+        [(フォルダ, ファイル名の判定), ...]
+    """
+    root = Path(root)
+    return [
+        (root / 'sns' / 'draft', is_queue_file),
+        (root / 'sns', is_queue_file),
+        (root / 'sns' / 'posted', is_posted_file),
+        (root / 'articles', is_article_file),
+    ]
+
+
+def normalize(text: str) -> str:
+    """
+    検索用に正規化（全角・半角を揃え、小文字にする）
+
+    Args:
+        text: 本文または検索語
+
+    Returns:
+        正規化した文字列
+    """
+    return unicodedata.normalize('NFKC', text).lower()
+
+
+def grams(text: str) -> Set[str]:
+    """
+    正規化済みの文字列の索引語（bigram と1文字）を取得
+
+    1文字の検索語も全文書を確認せずに済むよう、1文字も索引に含める。
+
+    Args:
+        text: 正規化済みの文字列
+
+    Returns:
+        空白を含まない2文字・1文字の集合
+    """
+    words = _WORD.findall(text)
+    found = {word[i:i + 2] for word in words for i in range(len(word) - 1)}
+    for word in words:
+        found.update(word)
+    return found
+
+
+class _Document:
+    """インデックス内の文書"""
+
+    __slots__ = ('source', 'name', 'hash', 'text')
+
+    def __init__(self, source: int, name: str, digest: str, text: str):
+        self.source = source
+        self.name = name
+        self.hash = digest
+        self.text = text
+
+
+class SearchIndex:
+    """文字 bigram の転置インデックス（スレッドセーフ）"""
+
+    def __init__(self, sources: Sequence[Tuple[Path, Callable[[str], bool]]], db_path=None):
+        """
+        インデックスを初期化（文書は update で読み込む）
+
+        Args:
+            sources: [(フォルダ, ファイル名の判定), ...]（default_sources の形式）
+            db_path: インデックス・キャッシュDBのパス（Noneの場合はキューインデックスと同じDB）
+        """
+        self.sources = [(Path(folder), match) for folder, match in sources]
+        self.db_path = Path(db_path) if db_path else Path.cwd() / DEFAULT_DB_PATH
+
+        self._docs: List[Optional[_Document]] = []
+        self._ids: Dict[Tuple[int, str], int] = {}
+        self._postings: Dict[str, array] = {}
+        self._removed = 0
+        self._lock = threading.Lock()
+        # update を複数のスレッドから同時に実行しない
+        self._update_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """インデックス内の文書数"""
+        with self._lock:
+            return len(self._ids)
+
+    def update(self) -> bool:
+        """
+        フォルダとインデックスを同期（内容ハッシュが変わった文書だけ入れ替える）
+
+        ファイルの読み込みは検索を止めずに行い、入れ替えの間だけロックを取る。
+
+        Returns:
+            文書が追加・変更・削除された場合True
+        """
+        with self._update_lock:
+            current = {}
+            for source, (folder, match) in enumerate(self.sources):
+                if not folder.exists():
+                    continue
+                index = QueueIndex(folder, self.db_path, match)
+                try:
+                    index.sync()
+                    for name, digest in index.hashes().items():
+                        current[(source, name)] = digest
+                finally:
+                    index.close()
+
+            with self._lock:
+                known = {key: self._docs[doc_id].hash for key, doc_id in self._ids.items()}
+            changed = {key: digest for key, digest in current.items() if known.get(key) != digest}
+            removed = [key for key in known if key not in current]
+            if not changed and not removed:
+                return False
+
+            texts = self._load_texts(changed)
+            with self._lock:
+                for key in removed:
+                    self._remove(key)
+                for key, digest in changed.items():
+                    self._remove(key)
+                    text = texts.get(digest)
+                    if text is not None:
+                        self._add(_Document(key[0], key[1], digest, text))
+                if self._removed > _COMPACT_RATIO * len(self._docs):
+                    self._compact()
+            return True
+
+    def _load_texts(self, changed: Dict[Tuple[int, str], str]) -> Dict[str, str]:
+        """正規化した本文をキャッシュから取得（ないものはファイルから読んでキャッシュに保存）"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS search_texts ('
+                'version INTEGER NOT NULL, hash TEXT NOT NULL, text TEXT NOT NULL, '
+                'PRIMARY KEY (version, hash)) WITHOUT ROWID'
+            )
+            texts = {}
+            unique = list(set(changed.values()))
+            # SQLiteのパラメータ数上限を考慮して分割
+            for i in range(0, len(unique), 500):
+                chunk = unique[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                texts.update(conn.execute(
+                    f'SELECT hash, text FROM search_texts WHERE version = ? AND hash IN ({placeholders})',
+                    [SEARCH_VERSION] + chunk
+                ))
+
+            new_texts = {}
+            for (source, name), digest in changed.items():
+                if digest in texts or digest in new_texts:
+                    continue
+                try:
+                    with open(self.sources[source][0] / name, 'r', encoding='utf-8') as f:
+                        new_texts[digest] = normalize(f.read())
+                except (OSError, UnicodeDecodeError):
+                    continue
+
+            if new_texts:
+                with conn:
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO search_texts (version, hash, text) VALUES (?, ?, ?)',
+                        [(SEARCH_VERSION, digest, text) for digest, text in new_texts.items()]
+                    )
+            texts.update(new_texts)
+            return texts
+        finally:
+            conn.close()
+
+    def _add(self, doc: _Document):
+        """文書を追加（ロック内で呼ぶ）"""
+        doc_id = len(self._docs)
+        self._docs.append(doc)
+        self._ids[(doc.source, doc.name)] = doc_id
+        postings = self._postings
+        for gram in grams(doc.text):
+            try:
+                postings[gram].append(doc_id)
+            except KeyError:
+                postings[gram] = array('I', (doc_id,))
+
+    def _remove(self, key: Tuple[int, str]):
+        """文書を削除済みにする（転置リストからは compact で除く、ロック内で呼ぶ）"""
+        doc_id = self._ids.pop(key, None)
+        if doc_id is not None:
+            self._docs[doc_id] = None
+            self._removed += 1
+
+    def _compact(self):
+        """削除済みの文書を除いて番号を振り直す（ロック内で呼ぶ）"""
+        docs = [doc for doc in self._docs if doc is not None]
+        self._docs = []
+        self._ids = {}
+        self._postings = {}
+        self._removed = 0
+        for doc in docs:
+            self._add(doc)
+
+    def _match_term(self, term: str, within: Optional[Set[int]]) -> Set[int]:
+        """検索語1つを含む文書番号（ロック内で呼ぶ）"""
+        docs = self._docs
+        if len(term) <= 2:
+            # 1文字・2文字は索引語そのものなので部分一致の確認は不要（削除済みの文書だけ除く）
+            posting = self._postings.get(term, ())
+            candidates = set(posting) if within is None else within.intersection(posting)
+            if self._removed:
+                candidates = {doc_id for doc_id in candidates if docs[doc_id] is not None}
+            return candidates
+
+        postings = [self._postings.get(gram) for gram in grams(term) if len(gram) == 2]
+        if any(posting is None for posting in postings):
+            return set()
+        postings.sort(key=len)
+        candidates = set(postings[0]) if within is None else within.intersection(postings[0])
+        for posting in postings[1:]:
+            if len(candidates) <= _VERIFY_THRESHOLD:
+                break
+            candidates.intersection_update(posting)
+
+        # bigram をすべて含んでも連続して現れるとは限らないため部分一致を確認
+        return {
+            doc_id for doc_id in candidates
+            if docs[doc_id] is not None and term in docs[doc_id].text
+        }
+
+    def search(self, query: str) -> Dict[Path, Set[str]]:
+        """
+        検索語をすべて含む文書を検索（空白区切りでAND検索）
+
+        Args:
+            query: 検索語
+
+        Returns:
+            {フォルダ: ファイル名の集合} の辞書（該当がないフォルダは含まない）
+        """
+        terms = sorted(set(normalize(query).split()), key=len, reverse=True)
+        results: Dict[Path, Set[str]] = {}
+        if not terms:
+            return results
+
+        with self._lock:
+            # 長い検索語ほど候補が少ないため先に絞り込む
+            matched = None
+            for term in terms:
+                matched = self._match_term(term, matched)
+                if not matched:
+                    return results
+            names = [[] for _ in self.sources]
+            docs = self._docs
+            for doc_id in matched:
+                doc = docs[doc_id]
+                names[doc.source].append(doc.name)
+        for (folder, _match), found in zip(self.sources, names):
+            if found:
+                results[folder] = set(found)
+        return results
+
+
+    def summary(self, results: Dict[Path, Set[str]]) -> str:
+        """
+        検索結果のフォルダごとの件数を表示用にまとめる
+
+        Args:
+            results: search の戻り値
+
+        Returns:
+            「下書き 2件・キュー 5件」のような文字列（該当がない場合は「該当なし」）
+        """
+        parts = [
+            f"{_SOURCE_LABELS.get(folder.name, folder.name)} {len(results[folder])}件"
+            for folder, _match in self.sources if results.get(folder)
+        ]
+        return '・'.join(parts) if parts else '該当なし'
+
+
+_indexes: Dict[str, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(root) -> SearchIndex:
+    """
+    プロジェクトごとに共有される検索インデックスを取得（default_sources を対象とする）
+
+    Args:
+        root: プロジェクトルート
+
+    Returns:
+        SearchIndexインスタンス（初回は空のため update を呼ぶ）
+    """
+    key = str(Path(root).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = SearchIndex(default_sources(root), Path(root) / DEFAULT_DB_PATH)
+            _indexes[key] = index
+        return index
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+日付連番の割り当て
+
+last_number.json の日付別連番を、ファイルロックを取ったうえでまとめて予約する。
+Draft Manager と取り込みスクリプトを同時に動かしても番号が重複しない。
+桁数の上限を超えた番号は印を付けて桁を広げるため、投稿の多い日も同じ日のうちに番号が尽きない。
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+# 連番の既定の桁数（YYYYMMDDNNN）
+DEFAULT_WIDTH = 3
+
+# 桁数の上限を超えた連番の前に付ける印（数字より後に並ぶ英字、広げるたびに1文字）
+WIDE_MARKER = 'X'
+
+# 印1つごとに広げる桁数
+WIDE_EXTRA_DIGITS = 3
+
+
+def format_number(number: int, width: int = DEFAULT_WIDTH) -> str:
+    """
+    連番をファイル名用の文字列に変換
+
+    10**width - 1 以下の番号は width 桁のゼロ埋め。それを超える番号は印を付けて WIDE_EXTRA_DIGITS 桁ずつ広げる
+    （桁数3の場合 "999" の次は "X001000"、"X999999" の次は "XX001000000"）。
+    印は数字より後に並ぶため、同じ日の中で桁が広がってもファイル名の並び順は番号順のまま。
+
+    Args:
+        number: 連番
+        width: その日の連番の桁数
+
+    Returns:
+        連番の文字列
+    """
+    prefix = ''
+    while number > 10 ** width - 1:
+        prefix += WIDE_MARKER
+        width += WIDE_EXTRA_DIGITS
+    return f"{prefix}{number:0{width}d}"
+
+
+@contextmanager
+def file_lock(lock_path: Path, timeout: float = 10.0):
+    """
+    排他ロックを取得（fcntl、Windows では msvcrt）
+
+    Args:
+        lock_path: ロックファイルのパス
+        timeout: ロック待ちの最大秒数（Windows のみ）
+
+    Raises:
+        TimeoutError: ロックを取得できなかった場合
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"ロックを取得できませんでした: {lock_path}")
+                    time.sleep(0.05)
+        yield
+    finally:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+
+class SequenceAllocator:
+    """日付連番の割り当てクラス"""
+
+    def __init__(self, path, default_width: int = DEFAULT_WIDTH):
+        """
+        連番割り当てを初期化
+
+        Args:
+            path: last_number.json のパス
+            default_width: 新しい日の連番の桁数（last_number.json の width が優先、
+                当日分の桁数は day_width として記録。上限を超えた番号は format_number で広げる）
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+        self.default_width = default_width
+
+    def _read(self) -> dict:
+        """last_number.json を読み込み（存在しない・壊れている場合は空）"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"last_number.json読み込みエラー: {e}")
+            return {}
+
+    def _write(self, data: dict):
+        """last_number.json を一時ファイル経由でアトミックに書き込み"""
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def _plan(self, data: dict, count: int, today: str) -> Tuple[int, int]:
+        """開始番号と桁数を決定（桁数の上限を超える番号は format_number が印を付けて広げる）"""
+        if data.get('date', '') == today:
+            start_number = data.get('last_number', 0) + 1
+            # 同じ日の途中で桁数を変えるとファイル名の並び順が崩れるため維持する
+            width = data.get('day_width', self.default_width)
+        else:
+            # 日付が変わった場合は001から開始
+            start_number = 1
+            width = data.get('width', self.default_width)
+        return start_number, width
+
+    def peek(self, count: int, today: Optional[str] = None) -> Tuple[str, List[int], int]:
+        """
+        次に割り当てられる連番を確認（予約はしない）
+
+        Args:
+            count: 必要な番号の数
+            today: 日付 YYYYMMDD（Noneの場合は今日）
+
+        Returns:
+            (日付, 番号リスト, 桁数)（ファイル名には format_number で変換して使う）
+        """
+        today = today or datetime.now().strftime('%Y%m%d')
+        start_number, width = self._plan(self._read(), count, today)
+        return today, list(range(start_number, start_number + count)), width
+
+    def reserve(self, count: int, today: Optional[str] = None) -> Tuple[str, List[int], int]:
+        """
+        連番をまとめて予約（ロック中に1回だけ書き込む）
+
+        Args:
+            count: 必要な番号の数
+            today: 日付 YYYYMMDD（Noneの場合は今日）
+
+        Returns:
+            (日付, 番号リスト, 桁数)（ファイル名には format_number で変換して使う）
+
+        Raises:
+            TimeoutError: ロックを取得できなかった場合
+        """
+        today = today or datetime.now().strftime('%Y%m%d')
+        with file_lock(self.lock_path):
+            data = self._read()
+            start_number, width = self._plan(data, count, today)
+            last_number = start_number + count - 1
+
+            data.update({'date': today, 'last_number': last_number})
+            if width != self.default_width:
+                data['day_width'] = width
+            else:
+                data.pop('day_width', None)
+            self._write(data)
+
+        return today, list(range(start_number, last_number + 1)), width
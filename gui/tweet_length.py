@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""
+X (Twitter) の重み付き文字数
+
+twitter-text（v3設定）と同じ規則で数える。
+- ラテン文字・一般的な記号（U+0000-U+10FF など）は1、それ以外（日本語など）は2
+- URLは長さに関係なく23
+- 絵文字は結合シーケンス（肌の色・ZWJ・国旗・キーキャップ）全体で2
+- 改行は1
+
+行をまたぐURL・絵文字はないため、行ごとの重みの合計に改行数を足せば全体の重みになる。
+TweetLengthCounter はこれを使い、編集された行だけを数え直す。
+core/tweet-length.js も同じ規則で数える（変更時は両方を合わせる）。
+"""
+
+import re
+import unicodedata
+from typing import Iterator, List, Optional, Tuple
+
+
+# 投稿できる重み付き文字数の上限
+MAX_WEIGHTED_LENGTH = 280
+
+# URLの重み（t.co に短縮された長さ）
+URL_WEIGHT = 23
+
+# 重み1の範囲（コードポイントの両端を含む）
+_LIGHT_RANGES = (
+    (0x0000, 0x10FF),
+    (0x2000, 0x200D),
+    (0x2010, 0x201F),
+    (0x2032, 0x2037),
+)
+
+# スキームなしのドメインをURLとみなすTLD
+_BARE_URL_TLDS = frozenset((
+    'com', 'net', 'org', 'info', 'biz', 'edu', 'gov', 'mil', 'int', 'name', 'pro',
+    'xyz', 'top', 'site', 'online', 'shop', 'blog', 'news', 'app', 'dev', 'page',
+    'io', 'ai', 'me', 'tv', 'co', 'ly', 'gl', 'to', 'fm', 'gg', 'so', 'sh',
+    'jp', 'us', 'uk', 'de', 'fr', 'cn', 'kr', 'tw', 'hk', 'eu', 'ca', 'au', 'in',
+    'ru', 'br', 'es', 'it', 'nl', 'se', 'ch', 'at', 'be', 'pl', 'nz', 'sg', 'tokyo',
+))
+
+# URL候補（前後の区切りと末尾の句読点は _find_urls で判定）
+_URL_PATTERN = re.compile(
+    r'(?<![A-Za-z0-9@$#_.\-/])'
+    r'(?P<scheme>https?://)?'
+    r'(?P<host>(?:[A-Za-z0-9](?:[A-Za-z0-9\-]*[A-Za-z0-9])?\.)+(?P<tld>[A-Za-z]{2,}))'
+    r'(?::\d{1,5})?'
+    r'(?:[/?#][!-~\u00c0-\u024f]*)?'
+    r'(?![A-Za-z0-9@])'
+)
+
+# URL末尾から除く句読点
+_URL_TRAILING_PUNCTUATION = '.,;:!?\'"'
+
+# 絵文字の修飾（異体字セレクタ・キーキャップ・肌の色・タグ）
+_VS16 = 0xFE0F
+_VS15 = 0xFE0E
+_KEYCAP = 0x20E3
+_ZWJ = 0x200D
+
+
+def _char_weight(cp: int) -> int:
+    """1文字の重み"""
+    for low, high in _LIGHT_RANGES:
+        if low <= cp <= high:
+            return 1
+    return 2
+
+
+def _is_regional_indicator(cp: int) -> bool:
+    return 0x1F1E6 <= cp <= 0x1F1FF
+
+
+def _is_emoji_modifier(cp: int) -> bool:
+    """直前の文字を絵文字にする修飾（異体字セレクタ16・キーキャップ・肌の色・タグ）"""
+    return cp in (_VS16, _KEYCAP) or 0x1F3FB <= cp <= 0x1F3FF or 0xE0020 <= cp <= 0xE007F
+
+
+def _find_urls(line: str) -> List[Tuple[int, int]]:
+    """
+    行内のURLの位置を取得
+
+    Returns:
+        [(開始位置, 終了位置), ...]
+    """
+    spans = []
+    for match in _URL_PATTERN.finditer(line):
+        if not match.group('scheme') and match.group('tld').lower() not in _BARE_URL_TLDS:
+            continue
+        start, end = match.span()
+        # 末尾の句読点と対応しない閉じ括弧はURLに含めない
+        while end > match.end('host'):
+            last = line[end - 1]
+            if last in _URL_TRAILING_PUNCTUATION:
+                end -= 1
+            elif last == ')' and line.count('(', start, end) < line.count(')', start, end):
+                end -= 1
+            else:
+                break
+        spans.append((start, end))
+    return spans
+
+
+def _segments(line: str) -> Iterator[Tuple[int, int, int]]:
+    """
+    行を数える単位（URL・絵文字シーケンス・1文字）に分割
+
+    Yields:
+        (開始位置, 終了位置, 重み)
+    """
+    urls = _find_urls(line) if '.' in line else []
+    url_index = 0
+    n = len(line)
+    i = 0
+    while i < n:
+        if url_index < len(urls) and urls[url_index][0] == i:
+            end = urls[url_index][1]
+            url_index += 1
+            yield i, end, URL_WEIGHT
+            i = end
+            continue
+
+        cp = ord(line[i])
+        j = i + 1
+        emoji = 0x1F000 <= cp <= 0x1FAFF
+        if _is_regional_indicator(cp) and j < n and _is_regional_indicator(ord(line[j])):
+            j += 1
+
+        # 修飾と ZWJ でつながった文字をまとめる
+        while j < n:
+            next_cp = ord(line[j])
+            if _is_emoji_modifier(next_cp):
+                emoji = True
+                j += 1
+            elif next_cp == _VS15:
+                j += 1
+            elif next_cp == _ZWJ and emoji and j + 1 < n:
+                j += 2
+            else:
+                break
+
+        if emoji:
+            weight = 2
+        else:
+            weight = sum(_char_weight(ord(c)) for c in line[i:j])
+        yield i, j, weight
+        i = j
+
+
+def _line_weight(line: str) -> int:
+    """改行を含まない1行の重み"""
+    if line.isascii():
+        if '.' not in line:
+            return len(line)
+        spans = _find_urls(line)
+        return len(line) - sum(end - start for start, end in spans) + URL_WEIGHT * len(spans)
+    return sum(weight for _start, _end, weight in _segments(unicodedata.normalize('NFC', line)))
+
+
+def _line_overflow(line: str, budget: int) -> Optional[int]:
+    """行内で重みの合計が budget を超える最初の単位の開始位置（超えない場合None）"""
+    total = 0
+    for start, _end, weight in _segments(line):
+        total += weight
+        if total > budget:
+            return start
+    return None
+
+
+def extract_urls(text: str) -> List[str]:
+    """
+    本文中のURLを取得（文字数で23として数えるものと同じ判定）
+
+    Args:
+        text: 投稿本文
+
+    Returns:
+        出現順のURLのリスト
+    """
+    if '.' not in text:
+        return []
+    return [
+        line[start:end]
+        for line in text.split('\n')
+        for start, end in _find_urls(line)
+    ]
+
+
+def weighted_length(text: str) -> int:
+    """
+    重み付き文字数を計算
+
+    Args:
+        text: 投稿本文
+
+    Returns:
+        X の文字数（上限は MAX_WEIGHTED_LENGTH）
+    """
+    if text.isascii() and '.' not in text:
+        return len(text)
+    return sum(_line_weight(line) for line in text.split('\n')) + text.count('\n')
+
+
+def overflow_offset(text: str, limit: int = MAX_WEIGHTED_LENGTH) -> Optional[int]:
+    """
+    上限を超える最初の文字の位置を取得
+
+    Args:
+        text: 投稿本文
+        limit: 重み付き文字数の上限
+
+    Returns:
+        上限を超える単位の開始位置（上限以内の場合None）
+    """
+    offset = 0
+    used = 0
+    for line in text.split('\n'):
+        weight = _line_weight(line)
+        if used + weight > limit:
+            column = _line_overflow(line, limit - used)
+            return offset + (len(line) if column is None else column)
+        used += weight + 1
+        offset += len(line) + 1
+        if used > limit and offset <= len(text):
+            # 行末の改行で超える
+            return offset - 1
+    return None
+
+
+class TweetLengthCounter:
+    """行ごとの重みを保持し、変わった行だけを数え直す文字数カウンタ"""
+
+    def __init__(self, text: str = ''):
+        """
+        カウンタを初期化
+
+        Args:
+            text: 初期テキスト
+        """
+        self._lines: List[str] = ['']
+        self._weights: List[int] = [0]
+        self.set_text(text)
+
+    @property
+    def line_count(self) -> int:
+        """行数"""
+        return len(self._lines)
+
+    @property
+    def length(self) -> int:
+        """重み付き文字数"""
+        return sum(self._weights) + len(self._lines) - 1
+
+    def line(self, index: int) -> str:
+        """
+        行の内容を取得
+
+        Args:
+            index: 行番号（0始まり）
+
+        Returns:
+            行の内容（改行を含まない）
+        """
+        return self._lines[index]
+
+    def set_text(self, text: str):
+        """
+        テキスト全体を設定（同じ位置の行が変わっていなければ数え直さない）
+
+        Args:
+            text: テキスト全体
+        """
+        lines = text.split('\n')
+        weights = []
+        for index, line in enumerate(lines):
+            if index < len(self._lines) and self._lines[index] == line:
+                weights.append(self._weights[index])
+            else:
+                weights.append(_line_weight(line))
+        self._lines = lines
+        self._weights = weights
+
+    def update_line(self, index: int, line: str):
+        """
+        1行だけを更新（行数が変わらない編集用）
+
+        Args:
+            index: 行番号（0始まり）
+            line: 行の内容（改行を含まない）
+        """
+        if self._lines[index] != line:
+            self._lines[index] = line
+            self._weights[index] = _line_weight(line)
+
+    def overflow_position(self, limit: int = MAX_WEIGHTED_LENGTH) -> Optional[Tuple[int, int]]:
+        """
+        上限を超える最初の文字の位置を取得
+
+        Args:
+            limit: 重み付き文字数の上限
+
+        Returns:
+            (行番号（0始まり）, 行内の位置)（上限以内の場合None）
+        """
+        used = 0
+        for index, (line, weight) in enumerate(zip(self._lines, self._weights)):
+            if used + weight > limit:
+                column = _line_overflow(line, limit - used)
+                return index, len(line) if column is None else column
+            used += weight + 1
+            if used > limit and index + 1 < len(self._lines):
+                return index, len(line)
+        return None
+
+
+class TextLengthTracker:
+    """Text ウィジェットの重み付き文字数を追跡し、上限を超えた部分を強調表示"""
+
+    OVERFLOW_TAG = 'tweet_overflow'
+
+    def __init__(self, text_widget, on_update=None, limit: int = MAX_WEIGHTED_LENGTH):
+        """
+        追跡を開始
+
+        Args:
+            text_widget: 対象の tk.Text
+            on_update: 数え直すたびに呼ぶ関数(重み付き文字数, 上限を超えた場合True)
+            limit: 重み付き文字数の上限
+        """
+        self.widget = text_widget
+        self.on_update = on_update
+        self.limit = limit
+        self.counter = TweetLengthCounter()
+        self._overflow = None
+        # Tcl 8.6 以前は文字位置を UTF-16 単位で数える（絵文字は2）
+        self._utf16_index = float(text_widget.tk.call('info', 'tclversion')) < 8.7
+
+        text_widget.tag_config(self.OVERFLOW_TAG, background='#ffd6d6', foreground='#c00000')
+        text_widget.bind('<KeyRelease>', lambda event: self.refresh(), add='+')
+        for sequence in ('<<Paste>>', '<<Cut>>', '<<Undo>>', '<<Redo>>'):
+            # 複数行が変わりうる操作は処理後に全体を数え直す
+            text_widget.bind(sequence, lambda event: text_widget.after_idle(self.refresh, True), add='+')
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        文字数を数え直す（行数が変わらない場合はカーソル行だけ）
+
+        Args:
+            full: Trueの場合は全体を数え直す
+
+        Returns:
+            重み付き文字数
+        """
+        widget = self.widget
+        line_count = int(widget.index('end-1c').split('.')[0])
+        if full or line_count != self.counter.line_count:
+            self.counter.set_text(widget.get('1.0', 'end-1c'))
+        else:
+            line = int(widget.index('insert').split('.')[0])
+            self.counter.update_line(line - 1, widget.get(f'{line}.0', f'{line}.end'))
+
+        self._update_overflow()
+        length = self.counter.length
+        if self.on_update:
+            self.on_update(length, length > self.limit)
+        return length
+
+    def _update_overflow(self):
+        """上限を超えた部分の強調表示を更新（位置が変わった場合のみ）"""
+        position = self.counter.overflow_position(self.limit)
+        if position == self._overflow:
+            return
+        self._overflow = position
+
+        self.widget.tag_remove(self.OVERFLOW_TAG, '1.0', 'end')
+        if position is not None:
+            line, column = position
+            if self._utf16_index:
+                column = len(self.counter.line(line)[:column].encode('utf-16-le')) // 2
+            self.widget.tag_add(self.OVERFLOW_TAG, f'{line + 1}.{column}', 'end')
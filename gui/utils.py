@@ -5,87 +5,85 @@ GUI ユーティリティ関数
 JSON読み書き、文字列処理など共通機能
 """
 
-import json
-import os
 import re
+import sqlite3
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Any, List, Mapping
 
+from .config_store import get_config_store
+from .order_manifest import order_names
+from .queue_index import get_queue_index, is_queue_file
+from .workflow_optimizer import cron_to_jst_times
 
-def load_config(config_path: str = None) -> Dict[str, Any]:
+
+def load_config(config_path: str = None) -> Mapping[str, Any]:
     """
     設定ファイル(sns.json)を読み込み
-    
+
+    ファイルの更新時刻が変わっていなければキャッシュ済みの内容を返す（config_store）。
+
     Args:
         config_path: 設定ファイルのパス（Noneの場合はデフォルト）
-    
+
     Returns:
-        設定辞書
-        
+        読み取り専用の設定（編集する場合は config_store.thaw で dict に戻す）
+
     Raises:
         FileNotFoundError: 設定ファイルが見つからない場合
         json.JSONDecodeError: JSONの解析に失敗した場合
     """
-    if config_path is None:
-        config_path = Path.cwd() / 'configs' / 'sns.json'
-    else:
-        config_path = Path(config_path)
-    
-    if not config_path.exists():
-        raise FileNotFoundError(f"設定ファイルが見つかりません: {config_path}")
-    
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return get_config_store(config_path).snapshot()
 
 
-def save_config(config: Dict[str, Any], config_path: str = None) -> None:
+def save_config(config: Mapping[str, Any], config_path: str = None, wait: bool = False) -> None:
     """
     設定ファイル(sns.json)を保存
-    
+
+    一時ファイル経由でアトミックに置き換える。短時間に続いた保存はまとめて1回書き込む。
+
     Args:
         config: 設定辞書
         config_path: 設定ファイルのパス（Noneの場合はデフォルト）
-        
+        wait: Trueの場合は書き込み終わるまで待つ
+
     Raises:
-        OSError: ファイル書き込みに失敗した場合
+        OSError: ファイル書き込みに失敗した場合（wait=True の場合のみ）
     """
-    if config_path is None:
-        config_path = Path.cwd() / 'configs' / 'sns.json'
-    else:
-        config_path = Path(config_path)
-    
-    # ディレクトリが存在しない場合は作成
-    config_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # UTF-8で整形して保存
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
+    store = get_config_store(config_path)
+    store.save(config)
+    if wait:
+        store.flush()
 
 
 def get_sns_files() -> List[str]:
     """
     sns/ディレクトリから投稿待ちファイルを取得
 
+    インデックス（queue_index）を同期し、変更のあったファイルのみ読み直す。
+    順序マニフェスト（sns.order.json）がある場合はその順序に従う。
+
     Returns:
-        ファイル名のリスト（昇順ソート済み）
+        ファイル名のリスト（投稿順）
     """
     sns_dir = Path.cwd() / 'sns'
 
     if not sns_dir.exists():
         return []
 
+    try:
+        index = get_queue_index(sns_dir)
+        index.sync()
+        return order_names(sns_dir, index.pending_files())
+    except sqlite3.Error:
+        # インデックスが使えない場合はディレクトリを直接走査
+        pass
+
     # *.txt パターンのファイルを検索（CLI と同じ形式）
-    files = []
-    for file_path in sns_dir.glob('*.txt'):
-        # README.txt は除外
-        if file_path.name == 'README.txt':
-            continue
-        # postedディレクトリ内は除外
-        if 'posted' not in str(file_path):
-            files.append(file_path.name)
+    # README.txt・投稿済みファイルは除外
+    files = [file_path.name for file_path in sns_dir.glob('*.txt') if is_queue_file(file_path.name)]
 
-    # ファイル名でソート（投稿順序と一致）
-    return sorted(files)
+    # マニフェスト順、なければファイル名順（投稿順序と一致）
+    return order_names(sns_dir, files)
 
 
 def parse_post_time(input_str: str) -> str:
@@ -158,8 +156,10 @@ def read_workflow_times() -> str:
     """
     GitHub Actionsワークフローファイルから現在の投稿時刻を読み取り
 
+    schedule の cron 行をすべて読み、範囲・間隔の指定も展開する。
+
     Returns:
-        JST時刻のカンマ区切り文字列 ("10:00,11:00,12:00,13:00,16:00,18:00,19:00")
+        JST時刻のカンマ区切り文字列 ("10:00,10:30,11:00,12:00")
         読み取りに失敗した場合は空文字列
     """
     try:
@@ -170,60 +170,14 @@ def read_workflow_times() -> str:
         with open(workflow_path, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        # cron式を抽出 (例: "0 1,2,3,4,7,9,10 * * *")
-        cron_match = re.search(r'cron:\s*[\'"]([^\'\"]+)[\'"]', content)
-        if not cron_match:
+        # cron式を抽出 (例: "0 1,2,3,4,7,9,10 * * *"、"30 0-12/3 * * *")
+        expressions = [expr.strip() for expr in re.findall(r'cron:\s*[\'"]([^\'\"]+)[\'"]', content)]
+        if not expressions:
             return ""
 
-        cron_expr = cron_match.group(1).strip()
-
-        # cron式をパース (分 時 日 月 曜日)
-        parts = cron_expr.split()
-        if len(parts) < 2:
-            return ""
-
-        minutes_str = parts[0]  # 例: "0" または "15,45"
-        hours_str = parts[1]    # 例: "1,2,3,4,7,9,10"
-
-        # 分を解析
-        if minutes_str == '*':
-            minutes = [0]  # デフォルトは毎時0分
-        else:
-            try:
-                minutes = [int(m.strip()) for m in minutes_str.split(',') if m.strip()]
-                # 分の範囲チェック
-                for m in minutes:
-                    if not (0 <= m <= 59):
-                        return ""
-            except ValueError:
-                return ""
-
-        # 時を解析
-        if hours_str == '*':
-            return ""  # 毎時実行は想定外
-
-        try:
-            utc_hours = [int(h.strip()) for h in hours_str.split(',') if h.strip()]
-            # 時の範囲チェック
-            for h in utc_hours:
-                if not (0 <= h <= 23):
-                    return ""
-        except ValueError:
-            return ""
-
-        # UTC→JST変換して時刻リストを生成
-        jst_times = []
-        for utc_hour in utc_hours:
-            for minute in minutes:
-                # UTC→JST (+9時間)
-                jst_hour = (utc_hour + 9) % 24
-                jst_times.append(f"{jst_hour:02d}:{minute:02d}")
-
-        # 時刻順にソート
-        jst_times.sort()
-
-        return ','.join(jst_times)
+        # UTC→JST変換して時刻順に並べる（毎時実行・解釈できない式は未設定扱い）
+        return ','.join(cron_to_jst_times(expressions))
 
     except Exception:
         # エラーが発生した場合は空文字列を返す
-        return ""
\ No newline at end of file
+        return ""
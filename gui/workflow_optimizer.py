@@ -5,51 +5,223 @@ GitHub Actions ワークフロー最適化機能
 固定時刻設定に基づいてGitHub Actionsの実行頻度を最適化
 """
 
-import json
+import os
 import re
 from pathlib import Path
-from typing import List
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
 
 
-def optimize_cron_for_times(times: List[str]) -> str:
+# 時刻指定がない場合のcron式（毎時実行）
+DEFAULT_CRON = '0 * * * *'
+
+# JST と UTC の時差（時間）
+JST_OFFSET_HOURS = 9
+
+# cron のフィールドの範囲（両端を含む）
+MINUTE_RANGE = (0, 59)
+HOUR_RANGE = (0, 23)
+
+# ワークフローの cron 行（- cron: '...'、行末のコメントを含む）
+_CRON_LINE = re.compile(
+    r"^(?P<indent>[ \t]*)-[ \t]*cron:[ \t]*(?P<quote>['\"])(?P<expr>.*?)(?P=quote)[^\n]*(?:\n|$)",
+    re.MULTILINE
+)
+
+# cron 行の間にあってよい行（空行・コメント行）
+_BLANK_OR_COMMENT = re.compile(r'(?:[ \t]*(?:#[^\n]*)?\n)*')
+
+# schedule の上のコメント（投稿時刻の一覧を書き換える）
+_SCHEDULE_COMMENT = re.compile(r'(#[ \t]*設定時刻に投稿実行（JST:[ \t]*)[^）\n]*(）)')
+
+
+def _to_utc_times(times: List[str]) -> List[Tuple[int, int]]:
+    """JSTの "HH:MM" のリストをUTCの (時, 分) に変換（不正な時刻は除く、重複なし・昇順）"""
+    utc_times = set()
+    for time_str in times:
+        try:
+            hour_str, minute_str = time_str.strip().split(':')
+            hour, minute = int(hour_str), int(minute_str)
+        except (ValueError, AttributeError):
+            continue
+        if 0 <= hour <= 23 and 0 <= minute <= 59:
+            # JST → UTC 変換（JST - 9時間、毎日実行のため日付のずれは考えなくてよい）
+            utc_times.add(((hour - JST_OFFSET_HOURS) % 24, minute))
+    return sorted(utc_times)
+
+
+def format_cron_field(values: Iterable[int], low: int, high: int) -> str:
     """
-    投稿時刻リストから最適化されたcron式を生成（JST→UTC変換）
+    値の集合を cron のフィールドに変換（範囲・間隔で短くまとめる）
 
     Args:
-        times: JST投稿時刻のリスト ["09:00", "12:00", "18:00"]
+        values: フィールドの値
+        low: フィールドの最小値
+        high: フィールドの最大値
 
     Returns:
-        UTC基準のcron式 "0 0,3,9 * * *"
+        "*"・"9-17"・"*/15"・"1-21/4"・"0,5,30" などの文字列
     """
-    if not times:
-        # デフォルトは毎時実行
-        return '0 * * * *'
+    values = sorted(set(values))
+    if values == list(range(low, high + 1)):
+        return '*'
 
-    # JST時刻をUTC時刻に変換
-    utc_hours = []
-    for time_str in times:
-        try:
-            jst_hour = int(time_str.split(':')[0])
-            # JST → UTC 変換（JST - 9時間）
-            utc_hour = (jst_hour - 9) % 24
-            utc_hours.append(utc_hour)
-        except (ValueError, IndexError):
-            continue
+    parts = []
+    i = 0
+    while i < len(values):
+        # 等間隔に並ぶ最長の並びを探す（3個以上の場合だけ範囲にまとめる）
+        j = i + 1
+        if j < len(values):
+            step = values[j] - values[i]
+            while j + 1 < len(values) and values[j + 1] - values[j] == step:
+                j += 1
+        if j - i + 1 >= 3:
+            first, last = values[i], values[j]
+            if step == 1:
+                parts.append(f'{first}-{last}')
+            elif first == low and last + step > high:
+                parts.append(f'*/{step}')
+            else:
+                parts.append(f'{first}-{last}/{step}')
+            i = j + 1
+        else:
+            parts.append(str(values[i]))
+            i += 1
+    return ','.join(parts)
+
+
+def parse_cron_field(field: str, low: int, high: int) -> List[int]:
+    """
+    cron のフィールドを値のリストに展開
+
+    Args:
+        field: "*"・"9-17"・"*/15"・"1-21/4"・"5/10"・"0,30" など
+        low: フィールドの最小値
+        high: フィールドの最大値
+
+    Returns:
+        値のリスト（重複なし・昇順）
+
+    Raises:
+        ValueError: 解釈できない・範囲外の値がある場合
+    """
+    values = set()
+    for part in field.split(','):
+        part, _, step_str = part.partition('/')
+        step = int(step_str) if step_str else 1
+        if step <= 0:
+            raise ValueError(f"cronの間隔が不正です: {field}")
+
+        if part == '*':
+            first, last = low, high
+        elif '-' in part:
+            first_str, last_str = part.split('-', 1)
+            first, last = int(first_str), int(last_str)
+        else:
+            first = int(part)
+            # "5/10" は 5 から最大値まで
+            last = high if step_str else first
+
+        if not (low <= first <= last <= high):
+            raise ValueError(f"cronの値が範囲外です: {field}")
+        values.update(range(first, last + 1, step))
+    return sorted(values)
+
+
+def compile_cron(times: List[str]) -> List[str]:
+    """
+    投稿時刻リストから、その時刻ちょうどにだけ実行するcron式を生成（JST→UTC変換）
 
-    if not utc_hours:
-        return '0 * * * *'
+    cron 1行は「分の集合 × 時の集合」の組み合わせで実行されるため、
+    同じ時の集合を持つ分（または同じ分の集合を持つ時）を1行にまとめ、行数の少ない方を採用する。
+    どちらでも投稿時刻以外には実行しない。
 
-    # 重複を除去してソート
-    unique_hours = sorted(set(utc_hours))
+    Args:
+        times: JST投稿時刻のリスト ["09:00", "09:30", "18:00"]
+
+    Returns:
+        UTC基準のcron式のリスト ["0 0,9 * * *", "30 0 * * *"]（時刻がない場合は毎時実行）
+    """
+    utc_times = _to_utc_times(times)
+    if not utc_times:
+        return [DEFAULT_CRON]
+
+    # 分ごとに時の集合をまとめ、同じ時の集合を持つ分を1行に
+    hours_by_minute: Dict[int, Set[int]] = {}
+    minutes_by_hour: Dict[int, Set[int]] = {}
+    for hour, minute in utc_times:
+        hours_by_minute.setdefault(minute, set()).add(hour)
+        minutes_by_hour.setdefault(hour, set()).add(minute)
+
+    by_hours: Dict[FrozenSet[int], List[int]] = {}
+    for minute, hours in hours_by_minute.items():
+        by_hours.setdefault(frozenset(hours), []).append(minute)
+    by_minutes: Dict[FrozenSet[int], List[int]] = {}
+    for hour, minutes in minutes_by_hour.items():
+        by_minutes.setdefault(frozenset(minutes), []).append(hour)
+
+    if len(by_minutes) < len(by_hours):
+        groups = [(minutes, hours) for minutes, hours in by_minutes.items()]
+    else:
+        groups = [(minutes, hours) for hours, minutes in by_hours.items()]
+
+    # 最初の実行時刻（UTC）の早い順に並べる
+    groups.sort(key=lambda group: (min(group[1]), min(group[0])))
+    return [
+        f'{format_cron_field(minutes, *MINUTE_RANGE)} {format_cron_field(hours, *HOUR_RANGE)} * * *'
+        for minutes, hours in groups
+    ]
+
+
+def cron_to_jst_times(expressions: List[str]) -> List[str]:
+    """
+    cron式のリストからJSTの投稿時刻リストを取得（compile_cron の逆変換）
+
+    日・月・曜日のフィールドは無視する。分が "*" の場合は毎時0分とみなす。
+
+    Args:
+        expressions: UTC基準のcron式のリスト
+
+    Returns:
+        JST時刻のリスト（"HH:MM"、重複なし・時刻順）
+
+    Raises:
+        ValueError: 解釈できないcron式、または時が "*"（毎時実行）の場合
+    """
+    jst_times = set()
+    for expression in expressions:
+        parts = expression.split()
+        if len(parts) < 2:
+            raise ValueError(f"cron式が不正です: {expression}")
+        minutes_str, hours_str = parts[0], parts[1]
+        if hours_str == '*':
+            raise ValueError("毎時実行のcron式です")
 
-    # cron式を生成
-    hours_str = ','.join(map(str, unique_hours))
-    return f'0 {hours_str} * * *'
+        minutes = [0] if minutes_str == '*' else parse_cron_field(minutes_str, *MINUTE_RANGE)
+        for utc_hour in parse_cron_field(hours_str, *HOUR_RANGE):
+            for minute in minutes:
+                # UTC→JST (+9時間)
+                jst_times.add(f"{(utc_hour + JST_OFFSET_HOURS) % 24:02d}:{minute:02d}")
+    return sorted(jst_times)
+
+
+def optimize_cron_for_times(times: List[str]) -> str:
+    """
+    投稿時刻リストから最適化されたcron式を生成（JST→UTC変換）
+
+    Args:
+        times: JST投稿時刻のリスト ["09:00", "12:00", "18:00"]
+
+    Returns:
+        UTC基準のcron式 "0 0,3,9 * * *"（複数行が必要な場合は改行区切り、compile_cron を参照）
+    """
+    return '\n'.join(compile_cron(times))
 
 
 def update_workflow_cron(times: List[str], workflow_path: str = None) -> bool:
     """
     GitHub Actionsワークフローファイルのcron設定を更新
+
+    schedule の cron 行（複数行でもよい）を compile_cron の結果で置き換える。
     
     Args:
         times: 投稿時刻のリスト
@@ -68,30 +240,46 @@ def update_workflow_cron(times: List[str], workflow_path: str = None) -> bool:
             raise FileNotFoundError(f"ワークフローファイルが見つかりません: {workflow_path}")
         
         # 最適化されたcron式を生成
-        new_cron = optimize_cron_for_times(times)
+        new_crons = compile_cron(times)
         
         # ファイルを読み込み
         with open(workflow_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # cron設定を置き換え
+        # 最初の cron 行から、空行・コメント行を挟んで続く cron 行までを1つの schedule とみなす
         # パターン: - cron: '0 * * * *' または - cron: '0 9,12,18 * * *'
-        cron_pattern = r"(\s*-\s*cron:\s*['\"])(.*?)(['\"])"
-        
-        def replace_cron(match):
-            prefix = match.group(1)
-            suffix = match.group(3)
-            return f"{prefix}{new_cron}{suffix}"
-        
-        new_content = re.sub(cron_pattern, replace_cron, content)
+        first = _CRON_LINE.search(content)
+        if not first:
+            raise ValueError("ワークフローにcron設定が見つかりません")
+        end = first.end()
+        while True:
+            gap = _BLANK_OR_COMMENT.match(content, end)
+            following = _CRON_LINE.match(content, gap.end())
+            if not following or following.end() == gap.end():
+                break
+            end = following.end()
+
+        indent, quote = first.group('indent'), first.group('quote')
+        newline = '\n' if content[end - 1:end] == '\n' else ''
+        block = '\n'.join(f"{indent}- cron: {quote}{cron}{quote}" for cron in new_crons) + newline
+        new_content = content[:first.start()] + block + content[end:]
+
+        # schedule の上の投稿時刻のコメントも合わせる
+        valid_times = sorted({f"{(h + JST_OFFSET_HOURS) % 24:02d}:{m:02d}" for h, m in _to_utc_times(times)})
+        if valid_times:
+            new_content = _SCHEDULE_COMMENT.sub(
+                lambda match: f"{match.group(1)}{','.join(valid_times)}{match.group(2)}", new_content
+            )
         
         if new_content == content:
             # 変更がない場合
             return True
         
-        # ファイルに書き戻し
-        with open(workflow_path, 'w', encoding='utf-8') as f:
+        # 一時ファイルに書いてから置き換え（Actions の実行中に読まれても壊れた内容にならない）
+        temp_path = workflow_path.with_name(workflow_path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
             f.write(new_content)
+        os.replace(temp_path, workflow_path)
         
         return True
         
@@ -110,21 +298,23 @@ def get_execution_frequency_info(times: List[str]) -> dict:
     Returns:
         実行頻度情報の辞書
     """
-    if not times:
+    executions = len(_to_utc_times(times))
+    if not executions:
         return {
             'executions_per_day': 24,
-            'cron_expression': '0 * * * *',
+            'cron_expression': DEFAULT_CRON,
+            'cron_lines': [DEFAULT_CRON],
             'description': '毎時実行'
         }
     
-    unique_hours = len(set(int(time.split(':')[0]) for time in times))
-    cron_expr = optimize_cron_for_times(times)
+    cron_lines = compile_cron(times)
     
     return {
-        'executions_per_day': unique_hours,
-        'cron_expression': cron_expr,
-        'description': f'1日{unique_hours}回実行',
-        'savings_percent': round((24 - unique_hours) / 24 * 100, 1)
+        'executions_per_day': executions,
+        'cron_expression': '\n'.join(cron_lines),
+        'cron_lines': cron_lines,
+        'description': f'1日{executions}回実行' + (f'（cron {len(cron_lines)}行）' if len(cron_lines) > 1 else ''),
+        'savings_percent': round(max(0, 24 - executions) / 24 * 100, 1)
     }
 
 
@@ -7,12 +7,33 @@ txtファイルの一覧表示、プレビュー、編集、削除、移動機
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import bisect
 import os
-import shutil
-import json
-from datetime import datetime
+import sqlite3
+import sys
+import threading
 from pathlib import Path
 
+# プロジェクトルートをパスに追加（gui パッケージの共通機能を利用）
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from gui.file_watcher import FileWatcher, CREATED, DELETED, MODIFIED
+from gui.content_cache import FileRecord, get_content_cache
+from gui.batch_move import BatchMover, DEFAULT_JOURNAL_PATH
+from gui.sequence import SequenceAllocator, DEFAULT_WIDTH, format_number
+from gui.order_manifest import OrderManifest
+from gui.tweet_length import MAX_WEIGHTED_LENGTH, TextLengthTracker, weighted_length
+from gui.queue_index import DEFAULT_DB_PATH, is_posted_file, is_queue_file
+from gui.dedup import find_near_duplicates
+from gui.search_index import SearchIndex, default_sources
+
+
+# 類似検出を始めるまでの待ち時間（ミリ秒、連続した取り込みは1回にまとめる）
+DEDUP_DELAY_MS = 500
+
+# 類似する投稿がある行の背景色
+DUPLICATE_ROW_COLOR = '#fff4cc'
+
 
 class DraftManager:
     def __init__(self, root):
@@ -24,23 +45,52 @@ class DraftManager:
         self.project_root = Path(__file__).parent.parent.parent
         self.draft_folder = self.project_root / "sns" / "draft"
         self.sns_folder = self.project_root / "sns"
+        self.posted_folder = self.project_root / "sns" / "posted"
         self.last_number_file = self.project_root / "last_number.json"
+        self.sequence = SequenceAllocator(self.last_number_file)
 
         # draft フォルダが存在しない場合は作成
         self.draft_folder.mkdir(parents=True, exist_ok=True)
 
+        # 前回中断した一括移動があれば元に戻す
+        self.batch_mover = BatchMover(self.project_root / DEFAULT_JOURNAL_PATH)
+        try:
+            if self.batch_mover.recover() == 'rolled_back':
+                print("前回中断したSNSへの移動を元に戻しました")
+        except OSError as e:
+            print(f"移動ジャーナルの復旧エラー: {e}")
+
         # ファイルデータを保存するリスト（Listbox用）
-        self.file_list = []  # [{'path': Path, 'name': str, 'content': str}, ...]
+        # 本文は保持せず、先頭部分のプレビューのみ（本文は必要時にキャッシュ経由で読み込み）
+        self.file_list = []  # [FileRecord, ...]
+        self._records = {}  # {パス: FileRecord}（フォルダ監視のイベントから走査せずに引く）
 
-        # 元の並び順を保存（リセット用）
+        # 元の並び順を保存（リセット用、ファイル名順）
         self.original_file_order = []
+        self._original_paths = []  # original_file_order と同じ順のパス（二分探索用）
 
         # プレビュー設定
         self.preview_length = 80  # プレビュー表示文字数
 
+        # 類似検出の結果 {ファイル名: [NearDuplicate, ...]}（sns/・sns/posted/・他の下書きとの比較）
+        self.near_duplicates = {}
+        self._dedup_after = None
+        self._dedup_running = False
+        self._dedup_pending = False
+
+        # 全文検索（検索語がない場合 _search_names はNone、ある場合は表示する下書きのファイル名の集合）
+        self.search_index = self._create_search_index()
+        self._search_names = None
+        self._search_updating = False
+        self._search_update_pending = False
+
         self.setup_ui()
         self.refresh_file_list()
 
+        # フォルダ監視を開始（変更分だけListboxに反映）
+        self.watcher = FileWatcher([self.draft_folder], self._on_file_events)
+        self.watcher.start()
+
     def setup_ui(self):
         """UIのセットアップ"""
         # メインフレーム
@@ -56,6 +106,16 @@ class DraftManager:
         ttk.Label(folder_frame, textvariable=self.folder_var, relief="sunken", padding="5").grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(10, 5))
         ttk.Button(folder_frame, text="参照...", command=self.select_folder).grid(row=0, column=2, padx=(5, 0))
 
+        # 検索ボックス（入力のたびに一覧を絞り込む）
+        ttk.Label(folder_frame, text="検索:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        search_frame = ttk.Frame(folder_frame)
+        search_frame.grid(row=1, column=1, columnspan=2, sticky=(tk.W, tk.E), padx=(10, 0), pady=(5, 0))
+        self.search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_var, width=40).grid(row=0, column=0, sticky=tk.W)
+        self.search_result_var = tk.StringVar()
+        ttk.Label(search_frame, textvariable=self.search_result_var, foreground="gray").grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        self.search_var.trace_add('write', self._on_search_changed)
+
         folder_frame.columnconfigure(1, weight=1)
 
         # === Draft一覧とプレビュー ===
@@ -124,8 +184,15 @@ class DraftManager:
         if folder:
             self.draft_folder = Path(folder)
             self.folder_var.set(str(self.draft_folder))
+            self.search_index = self._create_search_index()
+            self._apply_search()
             self.refresh_file_list()
 
+            # 監視対象も切り替え
+            self.watcher.stop()
+            self.watcher = FileWatcher([self.draft_folder], self._on_file_events)
+            self.watcher.start()
+
     def refresh_file_list(self):
         """ファイル一覧を更新"""
         # Listboxをクリア
@@ -133,42 +200,237 @@ class DraftManager:
 
         # ファイルリストをクリア
         self.file_list.clear()
+        self._records = {}
+        self.original_file_order = []
+        self._original_paths = []
 
         if not self.draft_folder.exists():
             return
 
-        # txtファイルを取得してソート
-        txt_files = sorted([f for f in self.draft_folder.glob("*.txt")])
+        # txtファイルを取得して並べる（順序マニフェストがあればその順、なければファイル名順）
+        txt_names = OrderManifest(self.draft_folder).apply(f.name for f in self.draft_folder.glob("*.txt"))
 
-        for file_path in txt_files:
-            try:
-                # ファイル内容を読み込み
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-
-                # ファイル情報をリストに追加
-                file_info = {
-                    'path': file_path,
-                    'name': file_path.name,
-                    'content': content
-                }
-                self.file_list.append(file_info)
+        for name in txt_names:
+            self.file_list.append(FileRecord(self.draft_folder / name, self.preview_length))
 
-            except Exception as e:
-                print(f"Error processing {file_path}: {e}")
-                # エラーファイルも表示
-                file_info = {
-                    'path': file_path,
-                    'name': file_path.name,
-                    'content': f"[読み込みエラー: {str(e)}]"
-                }
-                self.file_list.append(file_info)
-
-        # 元の順序を保存（リセット用）
-        self.original_file_order = self.file_list.copy()
+        self._records = {record.path: record for record in self.file_list}
+
+        # ファイル名順を保存（リセット用）
+        self.original_file_order = sorted(self.file_list, key=lambda r: r.path)
+        self._original_paths = [record.path for record in self.original_file_order]
 
         # Listboxをプレビュー付きで更新
         self.update_listbox_display()
+        self._schedule_dedup()
+        self._schedule_search_update()
+
+    def _on_file_events(self, events):
+        """フォルダ監視イベント受信（監視スレッドから呼ばれる）"""
+        self.root.after(0, lambda: self._apply_file_events(events))
+
+    def _apply_file_events(self, events):
+        """変更のあったファイルだけをListboxに反映"""
+        # 検索中はListboxの位置が file_list と一致しないため最後に作り直す
+        filtering = self._search_names is not None
+        for kind, folder, name in events:
+            if folder != self.draft_folder:
+                continue
+
+            file_path = folder / name
+            old_record = self._records.get(file_path)
+
+            if kind == CREATED and old_record is None:
+                # 新規ファイルは末尾に追加（リセット用の順序には名前順の位置に挿入）
+                record = FileRecord(file_path, self.preview_length)
+                self.file_list.append(record)
+                self._records[file_path] = record
+                position = bisect.bisect_left(self._original_paths, file_path)
+                self._original_paths.insert(position, file_path)
+                self.original_file_order.insert(position, record)
+                if not filtering:
+                    self.draft_listbox.insert(tk.END, self._format_display_text(record))
+            elif kind == DELETED and old_record is not None:
+                # file_list は並べ替えられるため位置はレコードの同一性で探す
+                index = self.file_list.index(old_record)
+                del self.file_list[index]
+                del self._records[file_path]
+                position = bisect.bisect_left(self._original_paths, file_path)
+                del self._original_paths[position]
+                del self.original_file_order[position]
+                if not filtering:
+                    self.draft_listbox.delete(index)
+                get_content_cache().invalidate(file_path)
+            elif kind == MODIFIED and old_record is not None:
+                record = FileRecord(file_path, self.preview_length)
+                index = self.file_list.index(old_record)
+                self.file_list[index] = record
+                self._records[file_path] = record
+                self.original_file_order[bisect.bisect_left(self._original_paths, file_path)] = record
+                if filtering:
+                    continue
+                selected = self.draft_listbox.selection_includes(index)
+                self.draft_listbox.delete(index)
+                self.draft_listbox.insert(index, self._format_display_text(record))
+                if selected:
+                    self.draft_listbox.selection_set(index)
+
+        if filtering:
+            self._rerender_keeping_selection()
+
+        # 取り込み・編集された下書きを既存の投稿と比較
+        if any(kind != DELETED and folder == self.draft_folder for kind, folder, _name in events):
+            self._schedule_dedup()
+        self._schedule_search_update()
+
+    def _create_search_index(self):
+        """検索索引を作成（表示中の下書きフォルダ・SNSキュー・投稿済み・記事が対象）"""
+        default_draft = self.project_root / "sns" / "draft"
+        sources = [(self.draft_folder, is_queue_file)] + [
+            source for source in default_sources(self.project_root) if source[0] != default_draft
+        ]
+        return SearchIndex(sources, self.project_root / DEFAULT_DB_PATH)
+
+    def _shown_records(self):
+        """Listboxに表示するレコード（検索中は該当するもののみ、file_list の順）"""
+        if self._search_names is None:
+            return self.file_list
+        return [record for record in self.file_list if record.name in self._search_names]
+
+    def _rerender_keeping_selection(self):
+        """Listboxを作り直し、表示され続けるファイルの選択を引き継ぐ"""
+        selected_paths = set(self.get_selected_files())
+        self.update_listbox_display()
+        for index, record in enumerate(self._shown_records()):
+            if record.path in selected_paths:
+                self.draft_listbox.selection_set(index)
+
+    def _on_search_changed(self, *args):
+        """検索語の変更（入力のたびにメモリ上の索引で絞り込む）"""
+        self._apply_search()
+        self._rerender_keeping_selection()
+
+    def _apply_search(self):
+        """現在の検索語で _search_names と件数表示を更新"""
+        query = self.search_var.get().strip()
+        if not query:
+            self._search_names = None
+            self.search_result_var.set("")
+            return
+
+        results = self.search_index.search(query)
+        self._search_names = results.get(self.draft_folder, set())
+        if self._search_updating and not len(self.search_index):
+            self.search_result_var.set("索引を作成中...")
+        else:
+            self.search_result_var.set(self.search_index.summary(results))
+
+    def _schedule_search_update(self):
+        """検索索引の更新をワーカースレッドで開始（内容ハッシュが変わったファイルだけ読み直す）"""
+        if self._search_updating:
+            # 実行中の更新が終わってから最新の状態で更新し直す
+            self._search_update_pending = True
+            return
+        self._search_updating = True
+        search_index = self.search_index
+
+        def run_update():
+            try:
+                changed = search_index.update()
+            except Exception as e:
+                changed = False
+                print(f"検索索引の更新エラー: {e}")
+            try:
+                self.root.after(0, lambda: self._on_search_updated(search_index, changed))
+            except (tk.TclError, RuntimeError):
+                pass  # 更新中にウィンドウが閉じられた
+
+        threading.Thread(target=run_update, daemon=True).start()
+
+    def _on_search_updated(self, search_index, changed):
+        """索引の更新後、検索中であれば結果を更新"""
+        self._search_updating = False
+        if search_index is not self.search_index:
+            # 更新中にフォルダが切り替わった
+            changed = True
+            self._search_update_pending = True
+        if changed and self.search_var.get().strip():
+            self._on_search_changed()
+        if self._search_update_pending:
+            self._search_update_pending = False
+            self._schedule_search_update()
+
+    def _dedup_corpus(self):
+        """類似検出で比較する投稿フォルダ（SNSキューと投稿済み）とファイル名の判定"""
+        return [
+            (folder, match)
+            for folder, match in ((self.sns_folder, is_queue_file), (self.posted_folder, is_posted_file))
+            if folder.exists()
+        ]
+
+    def _schedule_dedup(self):
+        """類似検出を予約（短時間の連続した変更は1回にまとめる）"""
+        if self._dedup_after is not None:
+            self.root.after_cancel(self._dedup_after)
+        self._dedup_after = self.root.after(DEDUP_DELAY_MS, self._start_dedup)
+
+    def _start_dedup(self):
+        """下書き全体の類似検出をワーカースレッドで開始（署名は変更のないファイルはキャッシュを使う）"""
+        self._dedup_after = None
+        if self._dedup_running:
+            # 実行中の検出が終わってから最新の状態で検出し直す
+            self._dedup_pending = True
+            return
+        self._dedup_running = True
+        draft_folder = self.draft_folder
+        corpus = self._dedup_corpus()
+
+        def run_dedup():
+            try:
+                results = find_near_duplicates(draft_folder, corpus_folders=corpus,
+                                               db_path=self.project_root / DEFAULT_DB_PATH)
+            except Exception as e:
+                results = None
+                print(f"類似検出エラー: {e}")
+            try:
+                self.root.after(0, lambda: self._apply_dedup_results(draft_folder, results))
+            except (tk.TclError, RuntimeError):
+                pass  # 検出中にウィンドウが閉じられた
+
+        threading.Thread(target=run_dedup, daemon=True).start()
+
+    def _apply_dedup_results(self, draft_folder, results):
+        """類似検出の結果を行の表示に反映（変わった行だけ書き換える）"""
+        self._dedup_running = False
+        if results is not None and draft_folder == self.draft_folder:
+            previous = self.near_duplicates
+            self.near_duplicates = results
+            for index, record in enumerate(self._shown_records()):
+                if bool(previous.get(record.name)) == bool(results.get(record.name)):
+                    continue
+                selected = self.draft_listbox.selection_includes(index)
+                self.draft_listbox.delete(index)
+                self.draft_listbox.insert(index, self._format_display_text(record))
+                if selected:
+                    self.draft_listbox.selection_set(index)
+            self._update_duplicate_colors()
+
+        if self._dedup_pending:
+            self._dedup_pending = False
+            self._start_dedup()
+
+    def _update_duplicate_colors(self):
+        """類似する投稿がある行の背景色を更新"""
+        for index, record in enumerate(self._shown_records()):
+            color = DUPLICATE_ROW_COLOR if self.near_duplicates.get(record.name) else ''
+            self.draft_listbox.itemconfig(index, background=color)
+
+    def _format_duplicate(self, match):
+        """類似する投稿の表示用テキスト（プロジェクトルートからの相対パスと類似度）"""
+        try:
+            location = (match.folder / match.name).relative_to(self.project_root)
+        except ValueError:
+            location = match.folder / match.name
+        return f"{location.as_posix()} ({match.similarity:.0%})"
 
 
     def select_all(self):
@@ -181,10 +443,11 @@ class DraftManager:
 
     def get_selected_files(self):
         """選択されたファイルのパスリストを取得"""
+        records = self._shown_records()
         selected_files = []
         for index in self.draft_listbox.curselection():
-            if index < len(self.file_list):
-                selected_files.append(self.file_list[index]['path'])
+            if index < len(records):
+                selected_files.append(records[index].path)
         return selected_files
 
     def delete_files(self):
@@ -217,8 +480,9 @@ class DraftManager:
         if index <= 0:
             return  # 既に一番上
 
-        # file_list内で順序を入れ替え
-        self.file_list[index], self.file_list[index - 1] = self.file_list[index - 1], self.file_list[index]
+        # file_list内で順序を入れ替え（検索中は表示中の1つ上のファイルと入れ替え）
+        self._swap_records(index, index - 1)
+        self._save_order()
 
         # Listboxを更新
         self.update_listbox_display()
@@ -235,11 +499,12 @@ class DraftManager:
 
         # 最初の選択アイテムのみ処理
         index = selection[0]
-        if index >= len(self.file_list) - 1:
+        if index >= len(self._shown_records()) - 1:
             return  # 既に一番下
 
-        # file_list内で順序を入れ替え
-        self.file_list[index], self.file_list[index + 1] = self.file_list[index + 1], self.file_list[index]
+        # file_list内で順序を入れ替え（検索中は表示中の1つ下のファイルと入れ替え）
+        self._swap_records(index, index + 1)
+        self._save_order()
 
         # Listboxを更新
         self.update_listbox_display()
@@ -248,38 +513,57 @@ class DraftManager:
         self.draft_listbox.selection_set(index + 1)
         self.draft_listbox.see(index + 1)
 
+    def _swap_records(self, index, other):
+        """Listbox上の2つの位置にあるレコードを file_list 内で入れ替え"""
+        records = self._shown_records()
+        i = self.file_list.index(records[index])
+        j = self.file_list.index(records[other])
+        self.file_list[i], self.file_list[j] = self.file_list[j], self.file_list[i]
+
     def reset_order(self):
         """ファイル順序を元に戻す（ファイル名昇順）"""
         if not self.original_file_order:
             return
 
-        # 元の順序を復元
+        # 元の順序を復元（順序マニフェストも削除）
         self.file_list = self.original_file_order.copy()
+        OrderManifest(self.draft_folder).delete()
 
         # Listboxを更新
         self.update_listbox_display()
 
         messagebox.showinfo("完了", "ファイル順序をリセットしました。")
 
+    def _save_order(self):
+        """現在の並び順を順序マニフェストに保存（ファイル名は変更しない）"""
+        try:
+            OrderManifest(self.draft_folder).save(record.name for record in self.file_list)
+        except OSError as e:
+            print(f"順序マニフェスト保存エラー: {e}")
+
     def update_listbox_display(self):
         """現在のfile_list順序でListboxを更新（プレビュー付き）"""
         self.draft_listbox.delete(0, tk.END)
-        for file_info in self.file_list:
-            # プレビューテキストを生成
-            content = file_info['content']
-            if content.startswith('[読み込みエラー:'):
-                # エラーファイルの場合
-                display_text = f"{file_info['name']}: {content}"
-            else:
-                # 通常ファイルの場合
-                preview = content[:self.preview_length]
-                if len(content) > self.preview_length:
-                    preview += "..."
-                # 改行をスペースに変換
-                preview = preview.replace('\n', ' ').replace('\r', ' ')
-                display_text = f"{file_info['name']}: {preview}"
-
-            self.draft_listbox.insert(tk.END, display_text)
+        records = self._shown_records()
+        if records:
+            self.draft_listbox.insert(tk.END, *[self._format_display_text(record) for record in records])
+            self._update_duplicate_colors()
+
+    def _format_display_text(self, record):
+        """Listbox表示用テキストを生成（プレビュー付き）"""
+        if record.error:
+            # エラーファイルの場合
+            return f"{record.name}: {record.error}"
+
+        # 通常ファイルの場合（先頭部分のみ読み込み済み）
+        preview = record.preview
+        if record.truncated:
+            preview += "..."
+        # 改行をスペースに変換
+        preview = preview.replace('\n', ' ').replace('\r', ' ')
+        if self.near_duplicates.get(record.name):
+            return f"[類似] {record.name}: {preview}"
+        return f"{record.name}: {preview}"
 
     def edit_file(self):
         """選択されたファイルを編集"""
@@ -295,54 +579,16 @@ class DraftManager:
         file_path = selected_files[0]
         EditWindow(self.root, file_path, self.refresh_file_list)
 
-    def load_last_number(self):
-        """last_number.jsonを読み込み"""
-        try:
-            if self.last_number_file.exists():
-                with open(self.last_number_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get('date', ''), data.get('last_number', 0)
-            else:
-                return '', 0
-        except Exception as e:
-            print(f"last_number.json読み込みエラー: {e}")
-            return '', 0
-
-    def save_last_number(self, date, last_number):
-        """last_number.jsonを保存"""
-        try:
-            data = {
-                'date': date,
-                'last_number': last_number
-            }
-            with open(self.last_number_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"last_number.json保存エラー: {e}")
-
     def get_next_numbers(self, count):
-        """必要な連番リストを取得"""
-        today = datetime.now().strftime('%Y%m%d')
-        saved_date, last_number = self.load_last_number()
-
-        # 日付が変わった場合は001から開始
-        if saved_date != today:
-            start_number = 1
-        else:
-            start_number = last_number + 1
+        """必要な連番リストを確認（予約はしない）"""
+        return self.sequence.peek(count)
 
-        # 999を超えるかチェック
-        if start_number + count - 1 > 999:
-            raise ValueError(f"連番が999を超えます。開始番号: {start_number}, 必要数: {count}")
-
-        return today, list(range(start_number, start_number + count))
-
-    def generate_new_filename(self, original_name, date, number):
+    def generate_new_filename(self, original_name, date, number, width=DEFAULT_WIDTH):
         """新しいファイル名を生成"""
         # 拡張子を除去
         base_name = original_name.replace('.txt', '')
-        # YYYYMMDDNNN_元ファイル名.txt の形式
-        return f"{date}{number:03d}_{base_name}.txt"
+        # YYYYMMDDNNN_元ファイル名.txt の形式（桁数は連番設定に従い、上限を超えた番号は印を付けて広げる）
+        return f"{date}{format_number(number, width)}_{base_name}.txt"
 
     def move_to_sns(self):
         """選択されたファイルを表示順序でSNSフォルダへ移動"""
@@ -352,20 +598,18 @@ class DraftManager:
             return
 
         # 選択されたファイルを現在の表示順序で整理
-        selected_files_ordered = []
-        for file_info in self.file_list:
-            if file_info['path'] in selected_files:
-                selected_files_ordered.append(file_info)
+        selected_paths = set(selected_files)
+        selected_files_ordered = [record for record in self.file_list if record.path in selected_paths]
 
         try:
-            # 連番を取得
-            date, numbers = self.get_next_numbers(len(selected_files_ordered))
+            # 連番を確認（確定は移動直前に予約）
+            date, numbers, width = self.get_next_numbers(len(selected_files_ordered))
 
             # リネーム後のファイル名プレビューを作成
             rename_preview = []
-            for i, file_info in enumerate(selected_files_ordered):
-                new_filename = self.generate_new_filename(file_info['name'], date, numbers[i])
-                rename_preview.append(f"{file_info['name']} → {new_filename}")
+            for i, record in enumerate(selected_files_ordered):
+                new_filename = self.generate_new_filename(record.name, date, numbers[i], width)
+                rename_preview.append(f"{record.name} → {new_filename}")
 
             # 確認ダイアログにプレビューを表示
             preview_text = "\n".join(rename_preview[:10])  # 最初の10個まで表示
@@ -374,6 +618,28 @@ class DraftManager:
 
             confirmation_msg = f"選択されたファイルを以下の順序でSNSフォルダに移動しますか？\n\n{preview_text}"
 
+            # 移動前にSNSキュー・投稿済み・他の下書きと最新の状態で比較
+            try:
+                duplicates = find_near_duplicates(
+                    self.draft_folder,
+                    [record.name for record in selected_files_ordered],
+                    corpus_folders=self._dedup_corpus(),
+                    db_path=self.project_root / DEFAULT_DB_PATH
+                )
+            except (OSError, sqlite3.Error) as e:
+                print(f"類似検出エラー: {e}")
+                duplicates = {}
+            if duplicates:
+                duplicate_lines = [
+                    f"{name} ≈ {self._format_duplicate(matches[0])}"
+                    + (f" 他{len(matches) - 1}件" if len(matches) > 1 else "")
+                    for name, matches in duplicates.items()
+                ]
+                duplicate_text = "\n".join(duplicate_lines[:10])
+                if len(duplicate_lines) > 10:
+                    duplicate_text += f"\n... 他{len(duplicate_lines) - 10}個"
+                confirmation_msg += f"\n\n※ 以下のファイルは既存の投稿と類似しています:\n{duplicate_text}"
+
             if not messagebox.askyesno("確認", confirmation_msg):
                 return
 
@@ -384,54 +650,35 @@ class DraftManager:
             messagebox.showerror("エラー", f"連番生成エラー: {str(e)}")
             return
 
-        # ファイル移動処理
+        # ファイル移動処理（ジャーナルに記録してから1ファイル1回のリネームで移動）
         try:
-            moved_count = 0
-            temp_files = []  # 一時ファイル名を記録
-
-            # Step 1: 一時ファイル名でリネーム（衝突防止）
-            for i, file_info in enumerate(selected_files_ordered):
-                file_path = file_info['path']
-                temp_filename = f"temp_{i}_{file_path.name}"
-                temp_path = self.sns_folder / temp_filename
-
-                # 一時ファイル名でSNSフォルダに移動
-                shutil.move(str(file_path), str(temp_path))
-                temp_files.append((temp_path, self.generate_new_filename(file_path.name, date, numbers[i])))
-
-            # Step 2: 最終ファイル名にリネーム
-            for temp_path, final_filename in temp_files:
-                final_path = self.sns_folder / final_filename
+            # 連番をロックを取って予約（他プロセスが先に使った場合はプレビューと番号が変わる）
+            date, numbers, width = self.sequence.reserve(len(selected_files_ordered))
 
-                # 最終名にリネーム
-                shutil.move(str(temp_path), str(final_path))
-                moved_count += 1
+            moves = [
+                (record.path, self.sns_folder / self.generate_new_filename(record.name, date, numbers[i], width))
+                for i, record in enumerate(selected_files_ordered)
+            ]
+            moved_count = self.batch_mover.execute(moves)
 
-            # last_number.jsonを更新
-            final_number = numbers[-1]  # 最後の番号
-            self.save_last_number(date, final_number)
+            # SNSフォルダに順序マニフェストがある場合は末尾に追加
+            try:
+                OrderManifest(self.sns_folder).append(dst.name for _, dst in moves)
+            except OSError as e:
+                print(f"順序マニフェスト保存エラー: {e}")
 
             # UI更新と完了メッセージ
             self.refresh_file_list()
 
             if len(numbers) == 1:
-                range_text = f"{date}{numbers[0]:03d}"
+                range_text = f"{date}{format_number(numbers[0], width)}"
             else:
-                range_text = f"{date}{numbers[0]:03d}～{numbers[-1]:03d}"
+                range_text = f"{date}{format_number(numbers[0], width)}～{format_number(numbers[-1], width)}"
 
             messagebox.showinfo("完了", f"{moved_count}件を {range_text} の番号でSNSフォルダに移動しました。")
 
         except Exception as e:
-            # エラー時のクリーンアップ（一時ファイルが残っている場合）
-            for i, (temp_path, _) in enumerate(temp_files):
-                try:
-                    if temp_path.exists():
-                        # 元のdraftフォルダに戻す
-                        original_name = temp_path.name.replace(f"temp_{i}_", "")
-                        shutil.move(str(temp_path), str(self.draft_folder / original_name))
-                except:
-                    pass  # クリーンアップ失敗は無視
-
+            # 移動済みのファイルは BatchMover が元に戻している
             messagebox.showerror("エラー", f"ファイル移動中にエラーが発生しました:\n{str(e)}")
             self.refresh_file_list()
 
@@ -473,9 +720,8 @@ class EditWindow:
         self.char_count_var = tk.StringVar()
         ttk.Label(button_frame, textvariable=self.char_count_var).grid(row=0, column=2, padx=(20, 0))
 
-        # テキスト変更時のイベント
-        self.text_area.bind("<KeyRelease>", self.update_char_count)
-        self.text_area.bind("<Button-1>", self.update_char_count)
+        # テキスト変更時のイベント（編集された行だけ数え直し、超過部分を強調表示）
+        self.length_tracker = TextLengthTracker(self.text_area, self.update_char_count)
 
         # グリッド設定
         main_frame.columnconfigure(0, weight=1)
@@ -489,28 +735,26 @@ class EditWindow:
             with open(self.file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             self.text_area.insert("1.0", content)
-            self.update_char_count()
+            self.length_tracker.refresh(full=True)
         except Exception as e:
             messagebox.showerror("エラー", f"ファイル読み込みエラー:\n{str(e)}")
             self.window.destroy()
 
-    def update_char_count(self, event=None):
-        """文字数を更新"""
-        content = self.text_area.get("1.0", "end-1c")
-        char_count = len(content)
-        self.char_count_var.set(f"文字数: {char_count}/280")
+    def update_char_count(self, length, over):
+        """文字数を更新（X の重み付き文字数）"""
+        self.char_count_var.set(f"文字数: {length}/{MAX_WEIGHTED_LENGTH}")
 
-        # 280文字を超えた場合は赤色で表示
-        if char_count > 280:
-            self.char_count_var.set(f"文字数: {char_count}/280 (超過)")
+        # 上限を超えた場合
+        if over:
+            self.char_count_var.set(f"文字数: {length}/{MAX_WEIGHTED_LENGTH} (超過)")
 
     def save_file(self):
         """ファイルを保存"""
         content = self.text_area.get("1.0", "end-1c")
 
-        # 280文字制限チェック
-        if len(content) > 280:
-            if not messagebox.askyesno("確認", "280文字を超えています。保存しますか？"):
+        # 文字数制限チェック
+        if weighted_length(content) > MAX_WEIGHTED_LENGTH:
+            if not messagebox.askyesno("確認", f"{MAX_WEIGHTED_LENGTH}文字を超えています。保存しますか？"):
                 return
 
         try:
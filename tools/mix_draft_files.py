@@ -6,49 +6,50 @@ Draft File Mixer - draftフォルダのファイルをブログ投稿分散配
 """
 
 import os
-import shutil
-import re
+import sys
+import argparse
 from pathlib import Path
 
-def analyze_file_content(file_path):
-    """ファイル内容を分析してブログ投稿かどうか判定"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+# プロジェクトルートをパスに追加（gui パッケージの共通機能を利用）
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from gui.classifier import BLOG_URL, ClassificationRule, classify_file, classify_folder
+from gui.mix_sequencer import MixCategory, interleave
+from gui.queue_index import DEFAULT_DB_PATH
+from gui.batch_move import DEFAULT_JOURNAL_PATH
+from gui.reorder import execute_renames
+from gui.order_manifest import OrderManifest
 
-        # ブログリンクを含む投稿かチェック
-        if 'www.coommu.com' in content:
-            return 'blog'
+# 分類ルール（上から順に評価し、最初に一致したカテゴリを採用）
+DRAFT_RULES = [
+    ClassificationRule('blog', content=(BLOG_URL,), name_suffixes=('-sns.txt',)),
+    ClassificationRule('expert', name_suffixes=('-sns.txt',)),
+    ClassificationRule('short_tips', name_pattern=r'-0[0-9]\.txt$'),
+]
 
-        return 'regular'
-    except:
-        return 'regular'
+# 配置比率（ブログ投稿 : 通常投稿）
+BLOG_WEIGHT = 1
+REGULAR_WEIGHT = 9
+
+def analyze_file_content(file_path):
+    """ファイル内容を分析してブログ投稿かどうか判定"""
+    return classify_file(file_path, [ClassificationRule('blog', content=(BLOG_URL,))], 'regular')
 
 def categorize_files(draft_dir):
-    """ファイルをカテゴリ別に分類"""
+    """ファイルをカテゴリ別に分類（新規・変更ファイルのみ内容を判定）"""
     files = [f for f in os.listdir(draft_dir) if f.startswith('mix_') and f.endswith('.txt')]
+    # 順序マニフェストがあればその順、なければファイル名順
+    files = OrderManifest(draft_dir).apply(files)
 
-    blog_posts = []
-    short_tips = []
-    expert_posts = []
-    regular_posts = []
+    categories = {'blog': [], 'short_tips': [], 'expert': [], 'regular': []}
+    verdicts = classify_folder(draft_dir, DRAFT_RULES, 'regular', names=files,
+                               db_path=PROJECT_ROOT / DEFAULT_DB_PATH)
 
     for file in files:
-        file_path = os.path.join(draft_dir, file)
-
-        # ファイル名パターンでの分類
-        if file.endswith('-sns.txt'):
-            # さらに内容チェック
-            if analyze_file_content(file_path) == 'blog':
-                blog_posts.append(file)
-            else:
-                expert_posts.append(file)
-        elif re.search(r'-0[0-9]\.txt$', file):
-            short_tips.append(file)
-        else:
-            regular_posts.append(file)
-
-    return blog_posts, short_tips, expert_posts, regular_posts
+        categories[verdicts[file]].append(file)
+
+    return categories['blog'], categories['short_tips'], categories['expert'], categories['regular']
 
 def create_optimal_mix(blog_posts, short_tips, expert_posts, regular_posts):
     """10回に1回ブログ投稿の最適ミックス作成"""
@@ -56,64 +57,35 @@ def create_optimal_mix(blog_posts, short_tips, expert_posts, regular_posts):
     # 通常投稿を結合
     regular_content = short_tips + expert_posts + regular_posts
 
-    total_files = len(blog_posts) + len(regular_content)
-    mixed_list = [''] * total_files
-
-    # ブログ投稿を10, 20, 30... の位置に配置
-    blog_positions = []
-    for i in range(10, total_files + 1, 10):
-        if i <= total_files:
-            blog_positions.append(i - 1)  # 0-indexed
-
-    # ブログ投稿を配置
-    blog_index = 0
-    for pos in blog_positions:
-        if blog_index < len(blog_posts) and pos < total_files:
-            mixed_list[pos] = blog_posts[blog_index]
-            blog_index += 1
-
-    # 残りのブログ投稿を末尾に追加
-    while blog_index < len(blog_posts):
-        for i in range(total_files):
-            if mixed_list[i] == '':
-                mixed_list[i] = blog_posts[blog_index]
-                blog_index += 1
-                break
-
-    # 通常投稿を空いている位置に配置
-    regular_index = 0
-    for i in range(total_files):
-        if mixed_list[i] == '' and regular_index < len(regular_content):
-            mixed_list[i] = regular_content[regular_index]
-            regular_index += 1
-
-    return [f for f in mixed_list if f != '']
+    # ブログ1 : 通常9 の比率で配置（ブログは10, 20, 30... 番目）
+    mixed_order = interleave([
+        MixCategory('blog', blog_posts, weight=BLOG_WEIGHT),
+        MixCategory('regular', regular_content, weight=REGULAR_WEIGHT),
+    ])
 
-def backup_and_rename_files(draft_dir, mixed_list):
-    """バックアップ作成後にファイルをリネーム"""
+    return [filename for _, filename in mixed_order]
 
-    # 既存のmix_ファイルを一時的にリネーム
-    temp_files = []
-    print("Step 1完了: {}のファイルを一時リネーム".format(len(mixed_list)))
+def backup_and_rename_files(draft_dir, mixed_list):
+    """ファイルをdraft_mix_XXX_形式にリネーム（ジャーナル付きで各ファイル1回）"""
 
+    # 件数が1000件以上でも名前順が崩れないよう桁数を揃える
+    width = max(3, len(str(len(mixed_list))))
+    renames = {}
     for i, filename in enumerate(mixed_list, 1):
-        old_path = os.path.join(draft_dir, filename)
-        temp_name = f"temp_{i:03d}_{filename}"
-        temp_path = os.path.join(draft_dir, temp_name)
+        if os.path.exists(os.path.join(draft_dir, filename)):
+            renames[filename] = f"draft_mix_{i:0{width}d}_{filename.replace('mix_', '').replace('temp_', '')}"
 
-        if os.path.exists(old_path):
-            shutil.move(old_path, temp_path)
-            temp_files.append((temp_path, f"draft_mix_{i:03d}_{filename.replace('mix_', '').replace('temp_', '')}"))
+    renamed_count = execute_renames(draft_dir, renames, PROJECT_ROOT / DEFAULT_JOURNAL_PATH)
+    print("リネーム完了: {}のファイルをdraft_mix_XXX_形式にリネーム".format(renamed_count))
 
-    # 最終的なリネーム
-    print("Step 2完了: 全ファイルをdraft_mix_XXX_形式にリネーム完了")
-    for temp_path, final_name in temp_files:
-        final_path = os.path.join(draft_dir, final_name)
-        shutil.move(temp_path, final_path)
-
-    return len(temp_files)
+    return len(renames)
 
 def main():
+    parser = argparse.ArgumentParser(description='draftフォルダのファイルをブログ投稿10回に1回の割合でミックス')
+    parser.add_argument('--manifest', action='store_true',
+                        help='ファイル名を変えずに順序マニフェスト (draft.order.json) に書き込む（既にある場合は常に使用）')
+    args = parser.parse_args()
+
     draft_dir = r"C:\Users\PHARMY\Desktop\TEST\auto_X\sns\draft"
 
     if not os.path.exists(draft_dir):
@@ -142,18 +114,22 @@ def main():
     print(f"ミックス順序を作成しました({len(mixed_list)}件)")
     print()
 
-    # ファイルリネーム
-    print("ファイルをdraft_mix_XXX_形式でリネーム中...")
-    processed_count = backup_and_rename_files(draft_dir, mixed_list)
+    manifest = OrderManifest(draft_dir)
+    if args.manifest or manifest.exists():
+        # 順序マニフェストに書き込み（ファイル名は変更しない）
+        manifest.save(mixed_list)
+        print(f"順序マニフェストを保存しました: {manifest.path}")
+    else:
+        # ファイルリネーム
+        print("ファイルをdraft_mix_XXX_形式でリネーム中...")
+        processed_count = backup_and_rename_files(draft_dir, mixed_list)
 
-    print(f"開始: {total}件のdraftファイルをブログ最適分散でリネーム")
-    print(f"処理済み: {processed_count}件")
+        print(f"開始: {total}件のdraftファイルをブログ最適分散でリネーム")
+        print(f"処理済み: {processed_count}件")
 
     # ブログ投稿配置位置表示
-    blog_positions = []
-    for i, filename in enumerate(mixed_list, 1):
-        if any(blog in filename for blog in blog_posts):
-            blog_positions.append(i)
+    blog_set = set(blog_posts)
+    blog_positions = [i for i, filename in enumerate(mixed_list, 1) if filename in blog_set]
 
     print(f"ブログ投稿配置位置: {blog_positions[:10]}...")
     print()
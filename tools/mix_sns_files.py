@@ -6,12 +6,77 @@ SNS File Mixer - SNS投稿ファイルをブログ紹介リンク付きでバラ
 """
 
 import os
+import re
+import sys
+import argparse
+import bisect
 import random
 from pathlib import Path
-import shutil
+
+# プロジェクトルートをパスに追加（gui パッケージの共通機能を利用）
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from gui.classifier import BLOG_URL, ClassificationRule, classify_folder
+from gui.mix_sequencer import MixCategory, interleave
+from gui.queue_index import DEFAULT_DB_PATH
+from gui.batch_move import DEFAULT_JOURNAL_PATH
+from gui.reorder import execute_renames
+from gui.order_manifest import OrderManifest
+
+# 分類ルール（上から順に評価し、最初に一致したカテゴリを採用）
+SNS_RULES = [
+    ClassificationRule('blog', content=(BLOG_URL,)),  # ブログ紹介投稿 (www.coommu.com リンク含有)
+    ClassificationRule('short_tips', name_suffixes=('-05.txt', '-06.txt', '-07.txt', '-02.txt')),  # 短文Tips
+]
+
+# 配置比率（ブログ紹介投稿 : 通常投稿）
+BLOG_WEIGHT = 1
+REGULAR_WEIGHT = 9
+
+# 前回のミックスで付けた番号
+MIX_PREFIX_PATTERN = re.compile(r'^sns_mix_(\d+)_')
+
+# ミックス番号の桁数（固定、件数が増えても既存のファイル名を変えない）
+MIX_NUMBER_WIDTH = 6
+
+# 新しく番号を付けるときの間隔（後から間に入るファイルのために空けておく）
+MIX_NUMBER_STEP = 10
+
+def split_for_mix(files):
+    """前回ミックス済みのファイル（現在の順序）と新しいファイル（ランダム順）に分ける"""
+    if not files:
+        return [], []
+
+    # 順序マニフェストがあればその位置、なければファイル名のミックス番号を現在の順序とする
+    manifest = OrderManifest(files[0].parent)
+    positions = {name: i for i, name in enumerate(manifest.load())} if manifest.exists() else {}
+
+    mixed = []
+    new_files = []
+    for file in files:
+        if manifest.exists():
+            position = positions.get(file.name)
+        else:
+            match = MIX_PREFIX_PATTERN.match(file.name)
+            position = int(match.group(1)) if match else None
+
+        if position is None:
+            new_files.append(file)
+        else:
+            mixed.append((position, file.name, file))
+
+    mixed.sort(key=lambda entry: entry[:2])
+    random.shuffle(new_files)
+    return [file for _, _, file in mixed], new_files
+
+def order_for_mix(files):
+    """前回ミックス済みのファイルは現在の順序を保ち、新しいファイルだけランダムに並べて後ろに追加"""
+    mixed, new_files = split_for_mix(files)
+    return mixed + new_files
 
 def categorize_sns_files(sns_folder):
-    """SNSファイルをカテゴリ別に分類"""
+    """SNSファイルをカテゴリ別に分類（新規・変更ファイルのみ内容を判定）"""
     files = list(Path(sns_folder).glob("*.txt"))
 
     categories = {
@@ -20,41 +85,28 @@ def categorize_sns_files(sns_folder):
         'professional': [] # 専門投稿 (その他)
     }
 
+    # 読み込みエラーのファイルは専門投稿として分類
+    verdicts = classify_folder(sns_folder, SNS_RULES, 'professional',
+                               names=[file.name for file in files],
+                               db_path=PROJECT_ROOT / DEFAULT_DB_PATH)
+
     for file in files:
-        try:
-            # ファイル内容を読み込んでリンクチェック
-            with open(file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            if 'www.coommu.com' in content:
-                categories['blog'].append(file)
-            elif file.name.endswith(('-05.txt', '-06.txt', '-07.txt', '-02.txt')):
-                categories['short_tips'].append(file)
-            else:
-                categories['professional'].append(file)
-
-        except Exception as e:
-            print(f"ファイル読み込みエラー: {file.name} - {e}")
-            # エラーファイルは専門投稿として分類
-            categories['professional'].append(file)
-
-    # 各カテゴリ内でランダム化
-    for category in categories.values():
-        random.shuffle(category)
+        categories[verdicts[file.name]].append(file)
+
+    # 各カテゴリ内でランダム化（ミックス済みのファイルは順序を維持）
+    for name, category in categories.items():
+        categories[name] = order_for_mix(category)
 
     return categories
 
 def create_blog_optimized_mix(categories):
     """ブログ紹介投稿を10回に1回配置する最適ミックス順序を作成"""
-    mixed_order = []
-
     blog_posts = categories['blog']
     short_tips = categories['short_tips']
     professional = categories['professional']
 
     # 通常投稿（短文Tips + 専門投稿）をミックス
-    regular_posts = short_tips + professional
-    random.shuffle(regular_posts)
+    regular_posts = order_for_mix(short_tips + professional)
 
     print(f"ファイル分類結果:")
     print(f"  ブログ紹介投稿: {len(blog_posts)}件")
@@ -62,84 +114,141 @@ def create_blog_optimized_mix(categories):
     print(f"  専門投稿: {len(professional)}件")
     print(f"  通常投稿合計: {len(regular_posts)}件")
 
-    # 10回に1回の割合でブログ投稿を配置
-    blog_index = 0
-    regular_index = 0
-
-    position = 1
-    while regular_index < len(regular_posts) or blog_index < len(blog_posts):
-        # 10の倍数位置にブログ投稿を配置
-        if position % 10 == 0 and blog_index < len(blog_posts):
-            mixed_order.append(blog_posts[blog_index])
-            blog_index += 1
+    # 前回ミックス済みのファイルは順序を変えず（先頭の投稿が済んでも番号を付け直さない）、
+    # 新しいファイルだけを ブログ1 : 通常9 の比率で配置して後ろに追加（ブログは10, 20, 30... 番目）
+    already_mixed, _ = split_for_mix(blog_posts + regular_posts)
+    mixed_names = {file_path.name for file_path in already_mixed}
+    mixed_order = interleave([
+        MixCategory('blog', [f for f in blog_posts if f.name not in mixed_names], weight=BLOG_WEIGHT),
+        MixCategory('regular', [f for f in regular_posts if f.name not in mixed_names], weight=REGULAR_WEIGHT),
+    ])
+
+    return already_mixed + [file_path for _, file_path in mixed_order]
+
+def _current_mix_number(name):
+    """固定桁数のミックス番号（ない・桁数が違う場合None）"""
+    match = MIX_PREFIX_PATTERN.match(name)
+    if match and len(match.group(1)) == MIX_NUMBER_WIDTH:
+        return int(match.group(1))
+    return None
+
+def _increasing_subsequence(numbers):
+    """番号が昇順に並ぶ最長の部分列の位置（Noneは除く）"""
+    tails = []      # 長さ k+1 の部分列の末尾の番号
+    tail_index = [] # その位置
+    previous = {}
+    for i, number in enumerate(numbers):
+        if number is None:
+            continue
+        k = bisect.bisect_left(tails, number)
+        if k == len(tails):
+            tails.append(number)
+            tail_index.append(i)
         else:
-            # 通常投稿を配置
-            if regular_index < len(regular_posts):
-                mixed_order.append(regular_posts[regular_index])
-                regular_index += 1
-
-        position += 1
-
-    # 残ったブログ投稿があれば最後に追加
-    while blog_index < len(blog_posts):
-        mixed_order.append(blog_posts[blog_index])
-        blog_index += 1
+            tails[k] = number
+            tail_index[k] = i
+        previous[i] = tail_index[k - 1] if k else None
+
+    kept = set()
+    i = tail_index[-1] if tail_index else None
+    while i is not None:
+        kept.add(i)
+        i = previous[i]
+    return kept
+
+def assign_mix_numbers(names):
+    """
+    ミックス順のファイル名にミックス番号を割り当て（番号を変えるファイルを最小にする）
+
+    順序どおりに並んでいる既存の番号はそのまま使い、新しいファイルや順序が変わったファイルには
+    前後の番号の間、または最大の番号の後ろの番号を割り当てる。
+
+    Args:
+        names: ミックス順のファイル名のリスト
+
+    Returns:
+        ファイル名と同じ順のミックス番号のリスト（昇順）
+    """
+    numbers = [_current_mix_number(name) for name in names]
+    kept = _increasing_subsequence(numbers)
+    limit = 10 ** MIX_NUMBER_WIDTH
+
+    assigned = []
+    i = 0
+    while i < len(names):
+        if i in kept:
+            assigned.append(numbers[i])
+            i += 1
+            continue
+
+        # 番号を付け直すファイルの連続（間に収まらなければ次の既存の番号も付け直す）
+        low = assigned[-1] if assigned else 0
+        end = i
+        while end < len(names) and end not in kept:
+            end += 1
+        while end < len(names) and numbers[end] - low - 1 < end - i:
+            kept.discard(end)
+            while end < len(names) and end not in kept:
+                end += 1
+
+        count = end - i
+        if end < len(names):
+            high = numbers[end]
+            assigned.extend(low + (high - low) * k // (count + 1) for k in range(1, count + 1))
+        else:
+            assigned.extend(low + MIX_NUMBER_STEP * k for k in range(1, count + 1))
+        i = end
 
-    return mixed_order
+    if assigned and assigned[-1] >= limit:
+        # 番号が桁数に収まらない場合は全体を振り直す
+        assigned = [MIX_NUMBER_STEP * k for k in range(1, len(names) + 1)]
+        if assigned[-1] >= limit:
+            assigned = list(range(1, len(names) + 1))
+    return assigned
 
 def rename_sns_files_with_mix_prefix(mixed_order, sns_folder):
-    """SNSファイルをsns_mix_XXX_形式でリネーム"""
-    temp_files = []  # 一時ファイル名を記録
-
+    """SNSファイルをsns_mix_XXXXXX_形式でリネーム（番号が変わるファイルのみ）"""
     print(f"開始: {len(mixed_order)}個のSNSファイルをブログ最適化順序でリネーム")
 
-    try:
-        # Step 1: 一時ファイル名にリネーム（衝突防止）
-        for i, file_path in enumerate(mixed_order, 1):
-            temp_name = f"sns_temp_{i:03d}_{file_path.name}"
-            temp_path = sns_folder / temp_name
-
-            # 一時ファイル名にリネーム
-            shutil.move(str(file_path), str(temp_path))
-            temp_files.append((temp_path, f"sns_mix_{i:03d}_{file_path.name}"))
-
-        print(f"Step 1完了: {len(temp_files)}個のファイルを一時リネーム")
+    numbers = assign_mix_numbers([file_path.name for file_path in mixed_order])
+    renames = {}
+    for number, file_path in zip(numbers, mixed_order):
+        base_name = MIX_PREFIX_PATTERN.sub('', file_path.name)
+        renames[file_path.name] = f"sns_mix_{number:0{MIX_NUMBER_WIDTH}d}_{base_name}"
 
-        # Step 2: 最終ファイル名にリネーム
-        blog_positions = []
-        for i, (temp_path, final_name) in enumerate(temp_files, 1):
-            final_path = sns_folder / final_name
-            shutil.move(str(temp_path), str(final_path))
+    try:
+        renamed_count = execute_renames(sns_folder, renames, PROJECT_ROOT / DEFAULT_JOURNAL_PATH)
+    except (OSError, ValueError) as e:
+        print(f"エラー発生: {e}")
+        print("リネーム済みのファイルは元に戻しました。")
+        return False
 
-            # ブログ投稿の位置を記録
-            temp_content_check = final_name
-            if i % 10 == 0:  # 10の倍数位置をチェック
-                blog_positions.append(i)
+    print(f"リネーム完了: {renamed_count}個のファイル（{len(mixed_order) - renamed_count}個は変更なし）")
 
-        print(f"Step 2完了: 全ファイルをsns_mix_XXX_形式にリネーム完了")
-        print(f"ブログ投稿配置位置: {blog_positions[:10]}..." if len(blog_positions) > 10 else f"ブログ投稿配置位置: {blog_positions}")
+    blog_positions = list(range(10, len(mixed_order) + 1, 10))
+    print(f"ブログ投稿配置位置: {blog_positions[:10]}..." if len(blog_positions) > 10 else f"ブログ投稿配置位置: {blog_positions}")
 
-        return True
+    return True
 
-    except Exception as e:
+def write_mix_manifest(mixed_order, sns_folder):
+    """ミックス順序を順序マニフェストに書き込み（ファイル名は変更しない）"""
+    manifest = OrderManifest(sns_folder)
+    try:
+        manifest.save(file_path.name for file_path in mixed_order)
+    except OSError as e:
         print(f"エラー発生: {e}")
-
-        # エラー時のクリーンアップ
-        print("エラー時のクリーンアップを実行中...")
-        for i, (temp_path, _) in enumerate(temp_files):
-            try:
-                if temp_path.exists():
-                    # 元のファイル名に戻す
-                    original_name = temp_path.name.replace(f"sns_temp_{i+1:03d}_", "")
-                    original_path = sns_folder / original_name
-                    shutil.move(str(temp_path), str(original_path))
-            except:
-                pass  # クリーンアップ失敗は無視
-
         return False
 
+    print(f"順序マニフェストを保存しました: {manifest.path}")
+    return True
+
 def main():
     """メイン処理"""
+    parser = argparse.ArgumentParser(description='SNS投稿ファイルをブログ紹介投稿10回に1回の割合でミックス')
+    parser.add_argument('--manifest', action='store_true',
+                        help='ファイル名を変えずに順序マニフェスト (sns.order.json) に書き込む（既にある場合は常に使用）')
+    args = parser.parse_args()
+
     # sns フォルダのパス
     script_dir = Path(__file__).parent
     sns_folder = script_dir.parent / "sns"
@@ -167,11 +276,16 @@ def main():
 
     print(f"ミックス順序を作成しました（{len(mixed_order)}件）")
 
-    # 自動実行
-    print("\nファイルをsns_mix_XXX_形式でリネームします...")
+    if args.manifest or OrderManifest(sns_folder).exists():
+        # 順序マニフェストに書き込み（1ファイルの書き込みのみ）
+        print("\n順序マニフェストに書き込みます...")
+        success = write_mix_manifest(mixed_order, sns_folder)
+    else:
+        # 自動実行
+        print("\nファイルをsns_mix_XXXXXX_形式でリネームします...")
 
-    # ファイルをリネーム
-    success = rename_sns_files_with_mix_prefix(mixed_order, sns_folder)
+        # ファイルをリネーム
+        success = rename_sns_files_with_mix_prefix(mixed_order, sns_folder)
 
     if success:
         print("\n✅ SNSファイルミックス完了！")